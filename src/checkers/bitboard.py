@@ -0,0 +1,703 @@
+"""Bitboard Checkers State."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Bitboard Checkers State"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+__version__ = "0.0.0"
+
+from dataclasses import dataclass, field
+from functools import cache
+from typing import TYPE_CHECKING, NamedTuple
+
+from checkers.state import (
+    DEFAULT_RULES,
+    DRAW,
+    Action,
+    ActionSet,
+    Pos,
+    Rules,
+    State,
+    get_geometry,
+    get_zobrist_keys,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+    from typing_extensions import Self
+
+    from checkers.state import ActionRecord
+
+# Squares are packed into bits in a "ghost square" layout. Playable
+# tiles of each row get consecutive bits, and one unused bit is inserted
+# after every second row. With that padding, moving one tile diagonally
+# is always the same shift no matter which row a piece is on, and moves
+# that would wrap around the edge of the board land on a ghost bit that
+# is masked out.
+#
+# 8x8 board (k = 4), ghost bits are 8, 17 and 26:
+#  .  0  .  1  .  2  .  3
+#  4  .  5  .  6  .  7  .
+#  .  9  . 10  . 11  . 12
+# 13  . 14  . 15  . 16  .
+#  ...
+
+# Piece types allowed to move in each of the four directions of
+# checkers.state.DIRECTIONS (up left, up right, down left, down right)
+PAWN_DIRECTIONS: tuple[tuple[int, ...], tuple[int, ...]] = (
+    (0, 1),  # Red pawns move up
+    (2, 3),  # Black pawns move down
+)
+ALL_DIRECTIONS = (0, 1, 2, 3)
+
+
+@dataclass(frozen=True, slots=True)
+class BitboardLayout:
+    """Bit layout of the playable tiles of a board of a given size."""
+
+    size: tuple[int, int]
+    # Shift amount for each direction of checkers.state.DIRECTIONS
+    shifts: tuple[int, int, int, int]
+    # Mask of all bits that are playable tiles
+    playable: int
+    # Masks of tiles where red and black pawns get kinged
+    king_rows: tuple[int, int]
+    bits: dict[Pos, int]
+    positions: dict[int, Pos]
+
+    def shift(self, mask: int, direction: int) -> int:
+        """Return mask moved one tile in direction, dropping pieces that leave the board."""
+        amount = self.shifts[direction]
+        if amount < 0:
+            return (mask >> -amount) & self.playable
+        return (mask << amount) & self.playable
+
+    def unshift(self, mask: int, direction: int) -> int:
+        """Return mask moved one tile against direction."""
+        return self.shift(mask, 3 - direction)
+
+    def iter_bits(self, mask: int) -> Generator[int, None, None]:
+        """Yield single bit masks of each set bit in mask, lowest first."""
+        while mask:
+            lowest = mask & -mask
+            yield lowest
+            mask ^= lowest
+
+
+@cache
+def get_layout(size: tuple[int, int]) -> BitboardLayout:
+    """Return bit layout for a board of given size.
+
+    Raises ValueError if board width is not even, the ghost square layout
+    only lines up when every row has the same number of playable tiles.
+    """
+    width, height = size
+    if width <= 0 or height <= 0 or width % 2:
+        raise ValueError(
+            f"Bitboard requires a positive even board width, got {size!r}",
+        )
+    row_step = width // 2
+
+    bits: dict[Pos, int] = {}
+    positions: dict[int, Pos] = {}
+    playable = 0
+    red_king_row = 0
+    black_king_row = 0
+    for y in range(height):
+        for x in range(width):
+            if not (x + y) & 1:
+                continue
+            index = y * row_step + x // 2 + y // 2
+            bit = 1 << index
+            bits[x, y] = bit
+            positions[bit] = (x, y)
+            playable |= bit
+            if y == 0:
+                red_king_row |= bit
+            if y == height - 1:
+                black_king_row |= bit
+    return BitboardLayout(
+        size=size,
+        shifts=(-(row_step + 1), -row_step, row_step, row_step + 1),
+        playable=playable,
+        king_rows=(red_king_row, black_king_row),
+        bits=bits,
+        positions=positions,
+    )
+
+
+class BitboardUndoRecord(NamedTuple):
+    """Information needed to undo an action performed in place."""
+
+    action: Action
+    # Piece masks, Zobrist key and history from before the action
+    masks: tuple[int, int, int, int]
+    zobrist_key: int
+    history: tuple[int, ...]
+
+
+@dataclass(slots=True)
+class BitboardState:
+    """Checkers game state with pieces stored as integer bit masks.
+
+    masks holds one mask for each piece type, indexed by piece type
+    (red pawn, black pawn, red king, black king). Has the same interface
+    as checkers.state.State. Flying kings are not supported.
+    """
+
+    size: tuple[int, int]
+    masks: tuple[int, int, int, int]
+    turn: bool = True  # Black moves first
+    rules: Rules = DEFAULT_RULES
+    # Hashes of earlier positions since the last capture or pawn move,
+    # see State.history
+    history: tuple[int, ...] = field(default=(), repr=False, compare=False)
+    # Zobrist hash of position, calculated from masks if not given.
+    # Same keys as State, so both hash a position the same.
+    zobrist_key: int | None = field(default=None, repr=False, compare=False)
+    # Undo records of actions performed in place with push
+    _undo_stack: list[BitboardUndoRecord] | None = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Make sure rules are supported and calculate Zobrist key."""
+        if self.rules.flying_kings:
+            raise ValueError("BitboardState does not support flying kings")
+        if self.zobrist_key is None:
+            self.zobrist_key = self.calculate_zobrist_key()
+
+    def calculate_zobrist_key(self) -> int:
+        """Return Zobrist key of this position calculated from scratch."""
+        keys = get_zobrist_keys(self.size)
+        key = keys.turn if self.turn else 0
+        for position, piece_type in self.pieces.items():
+            key ^= keys.pieces[position][piece_type]
+        return key
+
+    @classmethod
+    def from_pieces(
+        cls,
+        size: tuple[int, int],
+        pieces: dict[Pos, int],
+        turn: bool = True,
+        rules: Rules = DEFAULT_RULES,
+        history: tuple[int, ...] = (),
+    ) -> Self:
+        """Return new bitboard state from pieces dictionary."""
+        layout = get_layout(size)
+        masks = [0, 0, 0, 0]
+        for position, piece_type in pieces.items():
+            if position not in layout.bits:
+                raise ValueError(
+                    f"Piece at {position!r} is not on a playable tile",
+                )
+            masks[piece_type] |= layout.bits[position]
+        return cls(
+            size,
+            (masks[0], masks[1], masks[2], masks[3]),
+            turn,
+            rules,
+            history,
+        )
+
+    @classmethod
+    def from_state(cls, state: State) -> Self:
+        """Return new bitboard state from dictionary based state."""
+        return cls.from_pieces(
+            state.size,
+            state.pieces,
+            state.turn,
+            state.rules,
+            state.history,
+        )
+
+    def to_state(self) -> State:
+        """Return dictionary based state of this state."""
+        return State(
+            self.size,
+            self.pieces,
+            self.turn,
+            self.rules,
+            zobrist_key=self.zobrist_key,
+            history=self.history,
+        )
+
+    @property
+    def layout(self) -> BitboardLayout:
+        """Bit layout for this board size."""
+        return get_layout(self.size)
+
+    @property
+    def pieces(self) -> dict[Pos, int]:
+        """Pieces dictionary mapping positions to piece types."""
+        positions = self.layout.positions
+        pieces: dict[Pos, int] = {}
+        for piece_type, mask in enumerate(self.masks):
+            while mask:
+                bit = mask & -mask
+                pieces[positions[bit]] = piece_type
+                mask ^= bit
+        return pieces
+
+    def __hash__(self) -> int:
+        """Return Zobrist key of this position."""
+        assert self.zobrist_key is not None
+        return self.zobrist_key
+
+    def __str__(self) -> str:
+        """Return text representation of game board state."""
+        return str(self.to_state())
+
+    def get_piece_type(self, bit: int) -> int | None:
+        """Return type of piece on tile bit or None if tile is empty."""
+        for piece_type, mask in enumerate(self.masks):
+            if mask & bit:
+                return piece_type
+        return None
+
+    def get_player_mask(self, player: int) -> int:
+        """Return mask of all pieces belonging to player."""
+        player %= 2
+        return self.masks[player] | self.masks[player + 2]
+
+    def get_occupied(self) -> int:
+        """Return mask of all tiles with a piece on them."""
+        red, black, red_king, black_king = self.masks
+        return red | black | red_king | black_king
+
+    def get_bit(self, position: Pos) -> int:
+        """Return bit of tile at position. Raise KeyError if not playable."""
+        return self.layout.bits[position]
+
+    def calculate_actions(self, position: Pos) -> ActionSet:
+        """Return actions the piece at given position can make."""
+        mandatory_capture = self.rules.mandatory_capture
+        if mandatory_capture:
+            player = self.pieces[position] % 2
+            bit = self.get_bit(position)
+            jumpers = self.get_jumpers(player)
+            if jumpers and not jumpers & bit:
+                return ActionSet({}, (), set())
+            if not jumpers and not self.get_movers(player) & bit:
+                return ActionSet({}, (), set())
+        jumps = self.get_jumps(position)
+        moves: tuple[Pos, ...]
+        moves = () if mandatory_capture and jumps else self.get_moves(position)
+        ends = set(jumps)
+        ends.update(moves)
+        return ActionSet(jumps, moves, ends)
+
+    def piece_kinged(self, piece_pos: Pos, new_type: int) -> None:
+        """Piece kinged."""
+
+    def piece_moved(self, start_pos: Pos, end_pos: Pos) -> None:
+        """Piece moved from start_pos to end_pos."""
+
+    def piece_jumped(self, jumped_piece_pos: Pos) -> None:
+        """Piece has been jumped."""
+
+    def get_action_result(
+        self,
+        action: Action,
+        notify: bool,
+    ) -> tuple[tuple[int, int, int, int], int, tuple[int, ...]]:
+        """Return masks, Zobrist key and history after performing action.
+
+        Calls the piece_* event methods if notify is True.
+        """
+        from_pos, to_pos = action
+        layout = self.layout
+        keys = get_zobrist_keys(self.size)
+        piece_keys = keys.pieces
+        assert self.zobrist_key is not None
+        zobrist_key = self.zobrist_key ^ keys.turn
+
+        from_bit = layout.bits[from_pos]
+        piece_type = self.get_piece_type(from_bit)
+        if piece_type is None:
+            raise KeyError(from_pos)
+        masks = list(self.masks)
+        masks[piece_type] ^= from_bit
+        zobrist_key ^= piece_keys[from_pos][piece_type]
+
+        jump = to_pos not in self.get_moves(from_pos)
+        history = self.get_next_history(piece_type, jump)
+        if jump:
+            cur_x, cur_y = from_pos
+            for jumped_pos in self.get_jumps(from_pos)[to_pos]:
+                from_pos = (cur_x, cur_y)
+
+                jumped_bit = layout.bits[jumped_pos]
+                for jumped_type in range(4):
+                    if masks[jumped_type] & jumped_bit:
+                        masks[jumped_type] ^= jumped_bit
+                        zobrist_key ^= piece_keys[jumped_pos][jumped_type]
+                if notify:
+                    self.piece_jumped(jumped_pos)
+                jumped_x, jumped_y = jumped_pos
+                cur_x += (jumped_x - cur_x) << 1
+                cur_y += (jumped_y - cur_y) << 1
+
+                if notify:
+                    self.piece_moved(from_pos, (cur_x, cur_y))
+
+                if self.does_piece_king(piece_type, (cur_x, cur_y)):
+                    piece_type += 2
+                    if notify:
+                        self.piece_kinged((cur_x, cur_y), piece_type)
+        elif notify:
+            self.piece_moved(from_pos, to_pos)
+
+        if self.does_piece_king(piece_type, to_pos):
+            piece_type += 2
+            if notify:
+                self.piece_kinged(to_pos, piece_type)
+
+        masks[piece_type] |= layout.bits[to_pos]
+        zobrist_key ^= piece_keys[to_pos][piece_type]
+
+        return (masks[0], masks[1], masks[2], masks[3]), zobrist_key, history
+
+    def perform_action(self, action: Action) -> Self:
+        """Return new state after performing action on self."""
+        masks, zobrist_key, history = self.get_action_result(action, True)
+        return self.__class__(
+            self.size,
+            masks,
+            not self.turn,
+            self.rules,
+            history,
+            zobrist_key,
+        )
+
+    def push(self, action: Action) -> None:
+        """Perform action on self in place, undo with pop.
+
+        Unlike perform_action, does not call the piece_* event methods.
+        """
+        masks, zobrist_key, history = self.get_action_result(action, False)
+        assert self.zobrist_key is not None
+        if self._undo_stack is None:
+            self._undo_stack = []
+        self._undo_stack.append(
+            BitboardUndoRecord(
+                action,
+                self.masks,
+                self.zobrist_key,
+                self.history,
+            ),
+        )
+        self.masks = masks
+        self.zobrist_key = zobrist_key
+        self.history = history
+        self.turn = not self.turn
+
+    def pop(self) -> Action:
+        """Undo last action performed with push and return it.
+
+        Raises IndexError if there is nothing to undo.
+        """
+        if not self._undo_stack:
+            raise IndexError("pop from empty undo stack")
+        record = self._undo_stack.pop()
+        self.masks = record.masks
+        self.zobrist_key = record.zobrist_key
+        self.history = record.history
+        self.turn = not self.turn
+        return record.action
+
+    def get_tile_name(self, x: int, y: int) -> str:
+        """Return name of a given tile."""
+        return chr(65 + x) + str(self.size[1] - y)
+
+    def get_turn(self) -> int:
+        """Return whose turn it is. 0 = red, 1 = black."""
+        return int(self.turn)
+
+    def valid_location(self, position: Pos) -> bool:
+        """Return if position is valid."""
+        x, y = position
+        w, h = self.size
+        return x >= 0 and y >= 0 and x < w and y < h
+
+    def does_piece_king(self, piece_type: int, position: Pos) -> bool:
+        """Return if piece needs to be kinged given it's type and position."""
+        _, y = position
+        _, h = self.size
+        return (piece_type == 0 and y == 0) or (piece_type == 1 and y == h - 1)
+
+    @staticmethod
+    def get_enemy(self_type: int) -> int:
+        """Return enemy pawn piece type."""
+        return (self_type + 1) % 2
+
+    @staticmethod
+    def get_piece_types(self_type: int) -> tuple[int, int]:
+        """Return piece types of given piece type."""
+        self_type %= 2
+        return (self_type, self_type + 2)
+
+    def get_jump_directions(self, piece_type: int) -> tuple[int, ...]:
+        """Return directions piece of given type is allowed to jump in."""
+        if self.rules.pawn_jump_forward_only and piece_type < 2:
+            return PAWN_DIRECTIONS[piece_type]
+        return ALL_DIRECTIONS
+
+    def get_movers(self, player: int) -> int:
+        """Return mask of pieces of player that can make a non-jump move."""
+        layout = self.layout
+        player %= 2
+        pawns = self.masks[player]
+        kings = self.masks[player + 2]
+        empty = layout.playable & ~self.get_occupied()
+        movers = 0
+        for direction in ALL_DIRECTIONS:
+            pieces = kings
+            if direction in PAWN_DIRECTIONS[player]:
+                pieces |= pawns
+            if not pieces:
+                continue
+            movers |= layout.unshift(empty, direction) & pieces
+        return movers
+
+    def get_jumpers(self, player: int) -> int:
+        """Return mask of pieces of player that can start a jump."""
+        layout = self.layout
+        player %= 2
+        pawns = self.masks[player]
+        kings = self.masks[player + 2]
+        enemy = self.get_player_mask(self.get_enemy(player))
+        empty = layout.playable & ~self.get_occupied()
+        jumpers = 0
+        for direction in ALL_DIRECTIONS:
+            pieces = kings
+            if direction in self.get_jump_directions(player):
+                pieces |= pawns
+            if not pieces:
+                continue
+            # Enemies that have an empty tile behind them
+            targets = layout.unshift(empty, direction) & enemy
+            jumpers |= layout.unshift(targets, direction) & pieces
+        return jumpers
+
+    def get_jumps(
+        self,
+        position: Pos,
+    ) -> dict[Pos, list[Pos]]:
+        """Return valid jumps a piece can make.
+
+        position is a xy coordinate tuple pointing to a board position
+            that may or may not have a piece on it.
+
+        Returns dictionary that maps end positions to jumped pieces to
+        get there
+        """
+        layout = self.layout
+        start = layout.bits[position]
+        piece_type = self.get_piece_type(start)
+        if piece_type is None:
+            raise KeyError(position)
+        valid: dict[Pos, list[Pos]] = {}
+        self.explore_jumps(
+            start,
+            piece_type,
+            self.get_player_mask(self.get_enemy(piece_type)),
+            self.get_occupied(),
+            0,
+            [],
+            valid,
+        )
+        return valid
+
+    def explore_jumps(
+        self,
+        current: int,
+        piece_type: int,
+        enemy: int,
+        occupied: int,
+        jumped: int,
+        path: list[Pos],
+        valid: dict[Pos, list[Pos]],
+    ) -> None:
+        """Add every jump continuing path from tile bit current to valid.
+
+        Same backtracking search as MoveGenerator.explore_jumps, jumped
+        is the mask of pieces captured so far.
+        """
+        layout = self.layout
+        positions = layout.positions
+        for direction in self.get_jump_directions(piece_type):
+            side = layout.shift(current, direction) & enemy & ~jumped
+            if not side:
+                continue
+            side_side = layout.shift(side, direction)
+            if not side_side or side_side & occupied & ~jumped:
+                continue
+
+            new_type = piece_type
+            if new_type < 2 and side_side & layout.king_rows[new_type]:
+                new_type += 2
+
+            path.append(positions[side])
+            end = positions[side_side]
+            best = valid.get(end)
+            if best is None or len(path) > len(best):
+                valid[end] = path.copy()
+
+            self.explore_jumps(
+                side_side,
+                new_type,
+                enemy,
+                occupied,
+                jumped | side,
+                path,
+                valid,
+            )
+            path.pop()
+
+    def get_moves(self, position: Pos) -> tuple[Pos, ...]:
+        """Return valid moves piece at position can make, not including jumps."""
+        layout = self.layout
+        bit = layout.bits[position]
+        piece_type = self.get_piece_type(bit)
+        if piece_type is None:
+            raise KeyError(position)
+        empty = layout.playable & ~self.get_occupied()
+        directions = (
+            PAWN_DIRECTIONS[piece_type] if piece_type < 2 else ALL_DIRECTIONS
+        )
+        moves: list[Pos] = []
+        for direction in directions:
+            target = layout.shift(bit, direction) & empty
+            if target:
+                moves.append(layout.positions[target])
+        return tuple(moves)
+
+    def get_all_actions(self, player: int) -> Generator[Action, None, None]:
+        """Yield all actions for given player."""
+        layout = self.layout
+        positions = layout.positions
+        jumpers = self.get_jumpers(player)
+
+        for bit in layout.iter_bits(jumpers):
+            position = positions[bit]
+            for end in self.get_jumps(position):
+                yield Action(position, end)
+
+        if self.rules.mandatory_capture and jumpers:
+            return
+
+        for bit in layout.iter_bits(self.get_movers(player)):
+            position = positions[bit]
+            for end in self.get_moves(position):
+                yield Action(position, end)
+
+    def generate_action_list(
+        self,
+        player: int | None = None,
+    ) -> list[ActionRecord]:
+        """Return every action as (from, to, capture mask) records.
+
+        Player defaults to the player whose turn it is. Capture masks
+        use the same bits as State.generate_action_list, see
+        checkers.state.BoardGeometry.bits.
+        """
+        if player is None:
+            player = self.get_turn()
+        layout = self.layout
+        positions = layout.positions
+        tile_bits = get_geometry(self.size).bits
+        jumpers = self.get_jumpers(player)
+        records: list[ActionRecord] = []
+
+        for bit in layout.iter_bits(jumpers):
+            position = positions[bit]
+            for end, path in self.get_jumps(position).items():
+                mask = 0
+                for jumped in path:
+                    mask |= tile_bits[jumped]
+                records.append((position, end, mask))
+
+        if self.rules.mandatory_capture and jumpers:
+            return records
+
+        for bit in layout.iter_bits(self.get_movers(player)):
+            position = positions[bit]
+            for end in self.get_moves(position):
+                records.append((position, end, 0))
+        return records
+
+    def has_action(self, player: int) -> bool:
+        """Return if player can make any action."""
+        return bool(self.get_movers(player) or self.get_jumpers(player))
+
+    def has_jump(self, player: int) -> bool:
+        """Return if player can jump any piece."""
+        return bool(self.get_jumpers(player))
+
+    def get_next_history(self, piece_type: int, jump: bool) -> tuple[int, ...]:
+        """Return history after piece of piece_type moves or jumps."""
+        if jump or piece_type < 2:
+            # Captures and pawn moves can not be undone
+            return ()
+        assert self.zobrist_key is not None
+        return (*self.history, self.zobrist_key)
+
+    def is_repetition(self) -> bool:
+        """Return if this position occurred before in history."""
+        return self.zobrist_key in self.history
+
+    def is_draw(self) -> bool:
+        """Return if game is drawn by no progress or repetition rules."""
+        no_progress_limit = self.rules.no_progress_limit
+        if no_progress_limit and len(self.history) >= no_progress_limit:
+            return True
+        repetition_limit = self.rules.repetition_limit
+        return bool(repetition_limit) and (
+            self.history[-2::-2].count(self.zobrist_key) + 1
+            >= repetition_limit
+        )
+
+    def check_for_win(self) -> int | None:
+        """Return player number if they won, DRAW for a draw, else None."""
+        player = int(self.turn)
+        if not self.has_action(player):
+            # Player to move is stuck, so their opponent wins
+            return self.get_enemy(player)
+        if self.is_draw():
+            return DRAW
+        return None
+
+    def can_player_select_piece(self, player: int, tile_pos: Pos) -> bool:
+        """Return True if player can select piece on given tile position."""
+        bit = self.layout.bits.get(tile_pos)
+        if bit is None:
+            return False
+        return bool(self.get_player_mask(player) & bit)
+
+    def get_pieces(self) -> tuple[tuple[Pos, int], ...]:
+        """Return all pieces."""
+        return tuple(self.pieces.items())
@@ -42,6 +42,7 @@ from checkers.network_shared import (
     Pos,
     ServerBoundEvents,
     read_position,
+    read_rules,
     write_position,
 )
 
@@ -477,9 +478,10 @@ class GameClient(ClientNetworkEventComponent):
 
         board_size = read_position(buffer)
         current_turn: u8 = buffer.read_value(StructFormat.UBYTE)
+        rules = read_rules(buffer)
 
         await self.raise_event(
-            Event("game_initial_config", (board_size, current_turn)),
+            Event("game_initial_config", (board_size, current_turn, rules)),
         )
 
     async def read_playing_as(self, event: Event[bytearray]) -> None:
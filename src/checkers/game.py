@@ -58,6 +58,7 @@ from checkers.network_shared import DEFAULT_PORT, Pos
 from checkers.objects import Button, OutlinedText
 from checkers.server import GameServer
 from checkers.sound import SoundData, play_sound as base_play_sound
+from checkers.state import DRAW
 from checkers.statemachine import AsyncState
 from checkers.vector import Vector2
 
@@ -72,6 +73,8 @@ if TYPE_CHECKING:
 
     from pygame.surface import Surface
 
+    from checkers.state import Rules
+
 if sys.version_info < (3, 11):
     from exceptiongroup import ExceptionGroup
 
@@ -460,10 +463,10 @@ class GameBoard(sprite.Sprite):
 
     async def handle_initial_config_event(
         self,
-        event: Event[tuple[Pos, int]],
+        event: Event[tuple[Pos, int, Rules]],
     ) -> None:
         """Start up game."""
-        self.board_size, _current_turn = event.data
+        self.board_size, _current_turn, _rules = event.data
 
         # Generate tile data
         self.image = self.generate_board_image()
@@ -1507,7 +1510,10 @@ class PlayState(GameState):
     async def handle_game_over(self, event: Event[int]) -> None:
         """Handle game over event."""
         winner = event.data
-        self.exit_data = (0, f"{PLAYERS[winner]} Won", False)
+        if winner == DRAW:
+            self.exit_data = (0, "Draw", False)
+        else:
+            self.exit_data = (0, f"{PLAYERS[winner]} Won", False)
 
         await self.machine.raise_event_internal(Event("network_stop", None))
 
@@ -30,6 +30,8 @@ from typing import TYPE_CHECKING, Final, NamedTuple, TypeAlias
 from libcomponent.base_io import StructFormat
 from mypy_extensions import u8
 
+from checkers.state import Rules
+
 if TYPE_CHECKING:
     from libcomponent.buffer import Buffer
 
@@ -63,6 +65,36 @@ def write_position(buffer: Buffer, pos: Pos) -> None:
     buffer.write_value(StructFormat.UBYTE, pos_y)
 
 
+def read_rules(buffer: Buffer) -> Rules:
+    """Read a rules object from buffer."""
+    flags: u8 = buffer.read_value(StructFormat.UBYTE)
+    board_size = read_position(buffer)
+    no_progress_limit: int = buffer.read_value(StructFormat.USHORT)
+    repetition_limit: u8 = buffer.read_value(StructFormat.UBYTE)
+
+    return Rules(
+        mandatory_capture=bool(flags & 1),
+        pawn_jump_forward_only=bool(flags & 2),
+        flying_kings=bool(flags & 4),
+        board_size=board_size,
+        no_progress_limit=no_progress_limit,
+        repetition_limit=repetition_limit,
+    )
+
+
+def write_rules(buffer: Buffer, rules: Rules) -> None:
+    """Write a rules object to buffer."""
+    flags = (
+        rules.mandatory_capture
+        | rules.pawn_jump_forward_only << 1
+        | rules.flying_kings << 2
+    )
+    buffer.write_value(StructFormat.UBYTE, flags)
+    write_position(buffer, rules.board_size)
+    buffer.write_value(StructFormat.USHORT, rules.no_progress_limit)
+    buffer.write_value(StructFormat.UBYTE, rules.repetition_limit)
+
+
 class ClientBoundEvents(IntEnum):
     """Client bound event IDs."""
 
@@ -0,0 +1,143 @@
+"""Perft - Count leaf nodes of the move generation tree."""
+
+# Programmed by CoolCat467
+
+from __future__ import annotations
+
+# Copyright (C) 2025  CoolCat467
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+__title__ = "Perft"
+__author__ = "CoolCat467"
+__license__ = "GNU General Public License Version 3"
+__version__ = "0.0.0"
+
+import argparse
+import time
+from typing import TYPE_CHECKING, Final
+
+from checkers.state import (
+    CANADIAN_RULES,
+    DEFAULT_RULES,
+    INTERNATIONAL_RULES,
+    State,
+    generate_pieces,
+)
+
+if TYPE_CHECKING:
+    from checkers.state import Action, Rules
+
+RULE_SETS: Final = {
+    "english": DEFAULT_RULES,
+    "international": INTERNATIONAL_RULES,
+    "canadian": CANADIAN_RULES,
+}
+
+
+def perft(state: State, depth: int) -> int:
+    """Return number of leaf nodes depth actions deep from state.
+
+    Walks every action with push and pop, so state is changed while
+    counting but is back to how it started when this returns.
+    """
+    actions = list(state.get_all_actions(state.get_turn()))
+    if depth <= 1:
+        # Bulk counting, no need to perform the last actions
+        return len(actions) if depth == 1 else 1
+    nodes = 0
+    for action in actions:
+        state.push(action)
+        try:
+            nodes += perft(state, depth - 1)
+        finally:
+            state.pop()
+    return nodes
+
+
+def perft_divide(state: State, depth: int) -> dict[Action, int]:
+    """Return perft node count below each action of state.
+
+    Useful for finding which action a move generation bug is under.
+    """
+    divide: dict[Action, int] = {}
+    for action in list(state.get_all_actions(state.get_turn())):
+        state.push(action)
+        try:
+            divide[action] = perft(state, depth - 1)
+        finally:
+            state.pop()
+    return divide
+
+
+def get_start_state(rules: Rules) -> State:
+    """Return state of start of game for rule set."""
+    size = rules.board_size
+    return State(size, generate_pieces(*size), rules=rules)
+
+
+def run_perft(state: State, depth: int, divide: bool = False) -> None:
+    """Print perft node count and speed for each depth up to depth."""
+    if divide:
+        total = 0
+        for action, nodes in sorted(perft_divide(state, depth).items()):
+            print(f"{action.from_pos} -> {action.to_pos}: {nodes}")
+            total += nodes
+        print(f"Total: {total}")
+        return
+    for current in range(1, depth + 1):
+        start = time.perf_counter()
+        nodes = perft(state, current)
+        elapsed = time.perf_counter() - start
+        speed = nodes / elapsed if elapsed else 0
+        print(
+            f"Depth {current:2}: {nodes:12} nodes "
+            f"{elapsed:9.3f} seconds {speed:12.0f} nodes/sec",
+        )
+
+
+def cli_run() -> None:
+    """Run perft from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Count move generation tree leaf nodes from the start "
+        "of a game and report nodes per second.",
+    )
+    parser.add_argument(
+        "depth",
+        type=int,
+        nargs="?",
+        default=6,
+        help="Number of actions deep to count (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rules",
+        choices=tuple(RULE_SETS),
+        default="english",
+        help="Rule set and board size to use (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--divide",
+        action="store_true",
+        help="Print node count below each first action instead",
+    )
+    args = parser.parse_args()
+    run_perft(
+        get_start_state(RULE_SETS[args.rules]),
+        args.depth,
+        args.divide,
+    )
+
+
+if __name__ == "__main__":
+    cli_run()
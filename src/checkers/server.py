@@ -55,8 +55,15 @@ from checkers.network_shared import (
     ServerBoundEvents,
     read_position,
     write_position,
+    write_rules,
+)
+from checkers.state import (
+    DEFAULT_RULES,
+    Action,
+    Rules,
+    State,
+    generate_pieces,
 )
-from checkers.state import Action, State, generate_pieces
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable, Iterable
@@ -277,15 +284,16 @@ class ServerClient(ServerClientNetworkEventComponent):
 
     async def handle_initial_config(
         self,
-        event: Event[tuple[Pos, int]],
+        event: Event[tuple[Pos, int, Rules]],
     ) -> None:
         """Read initial config event and reraise as server[write]->initial_config."""
-        board_size, player_turn = event.data
+        board_size, player_turn, rules = event.data
 
         buffer = Buffer()
 
         write_position(buffer, board_size)
         buffer.write_value(StructFormat.UBYTE, player_turn)
+        write_rules(buffer, rules)
 
         await self.write_event(Event("server[write]->initial_config", buffer))
 
@@ -324,14 +332,9 @@ class CheckersState(State):
 
     __slots__ = ("action_queue",)
 
-    def __init__(
-        self,
-        size: Pos,
-        pieces: dict[Pos, int],
-        turn: bool = True,
-    ) -> None:
+    def __post_init__(self) -> None:
         """Initialize Checkers State."""
-        super().__init__(size, pieces, turn)
+        super().__post_init__()
         self.action_queue: deque[tuple[str, Iterable[Pos | int]]] = deque()
 
     def piece_kinged(self, piece_pos: Pos, new_type: int) -> None:
@@ -377,19 +380,28 @@ class GameServer(network.Server):
         "internal_singleplayer_mode",
         "player_selections",
         "players_can_interact",
+        "rules",
         "running",
         "state",
     )
 
-    board_size = (8, 8)
     max_clients = 4
 
-    def __init__(self, internal_singleplayer_mode: bool = False) -> None:
+    def __init__(
+        self,
+        internal_singleplayer_mode: bool = False,
+        rules: Rules = DEFAULT_RULES,
+    ) -> None:
         """Initialize server."""
         super().__init__("GameServer")
 
         self.client_count: int
-        self.state: CheckersState = CheckersState(self.board_size, {})
+        self.rules = rules
+        self.state: CheckersState = CheckersState(
+            self.board_size,
+            {},
+            rules=rules,
+        )
 
         self.client_players: dict[int, int] = {}
         self.player_selections: dict[int, Pos] = {}
@@ -399,6 +411,11 @@ class GameServer(network.Server):
         self.advertisement_scope: trio.CancelScope | None = None
         self.running = False
 
+    @property
+    def board_size(self) -> tuple[int, int]:
+        """Size of game board."""
+        return self.rules.board_size
+
     def bind_handlers(self) -> None:
         """Register start_server and stop_server."""
         self.register_handlers(
@@ -518,7 +535,7 @@ class GameServer(network.Server):
         self.player_selections.clear()
 
         pieces = generate_pieces(*self.board_size)
-        self.state = CheckersState(self.board_size, pieces)
+        self.state = CheckersState(self.board_size, pieces, rules=self.rules)
 
         # Why keep track of another object just to know client ID numbers
         # if we already have that with the components? No need!
@@ -579,11 +596,12 @@ class GameServer(network.Server):
         # Using non-cryptographically secure random because it doesn't matter
         self.new_game_init()
 
-        # Raise initial config event with board size and initial turn.
+        # Raise initial config event with board size, initial turn
+        # and rules.
         await self.raise_event(
             Event(
                 "initial_config->network",
-                (self.board_size, self.state.turn),
+                (self.board_size, self.state.turn, self.rules),
             ),
         )
 
@@ -671,11 +689,12 @@ class GameServer(network.Server):
         )
         with self.temporary_component(private_events_pocket):
             with private_events_pocket.temporary_component(client):
-                # Raise initial config event with board size and initial turn.
+                # Raise initial config event with board size, initial turn
+                # and rules.
                 await client.raise_event(
                     Event(
                         "initial_config->network",
-                        (self.state.size, self.state.turn),
+                        (self.state.size, self.state.turn, self.state.rules),
                     ),
                 )
 
@@ -699,8 +718,7 @@ class GameServer(network.Server):
         """Accept clients. Called by network.Server.serve."""
         if self.client_count == 0 and self.game_active():
             # Old game was running but everyone left, restart
-            self.state.pieces.clear()
-            # self.state = CheckersState(self.board_size, {})
+            self.state = CheckersState(self.board_size, {}, rules=self.rules)
         new_client_id = self.client_count
         print(
             f"{self.__class__.__name__}: client connected [client_id {new_client_id}]",
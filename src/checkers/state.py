@@ -25,7 +25,9 @@ __license__ = "GNU General Public License Version 3"
 __version__ = "0.0.0"
 
 import math
-from dataclasses import dataclass
+import random
+from dataclasses import dataclass, field
+from functools import cache
 from typing import (
     TYPE_CHECKING,
     Final,
@@ -41,9 +43,6 @@ if TYPE_CHECKING:
 
     from typing_extensions import Self
 
-MANDATORY_CAPTURE = True  # If a jump is available, do you have to or not?
-PAWN_JUMP_FORWARD_ONLY = True  # Pawns not allowed to go backwards in jumps?
-
 # Note: Tile Ids are chess board tile titles, A1 to H8
 # A8 ... H8
 # .........
@@ -56,6 +55,10 @@ PAWN_JUMP_FORWARD_ONLY = True  # Pawns not allowed to go backwards in jumps?
 T = TypeVar("T")
 
 Pos: TypeAlias = tuple[u8, u8]
+# check_for_win result when nobody won
+DRAW: Final = 2
+# (from position, to position, mask of jumped tiles)
+ActionRecord: TypeAlias = tuple[Pos, Pos, int]
 
 
 DIRECTIONS: Final = (
@@ -66,6 +69,40 @@ DIRECTIONS: Final = (
 )
 
 
+@dataclass(frozen=True, slots=True)
+class Rules:
+    """Rule variant a game is played with."""
+
+    # If a jump is available, do you have to or not?
+    mandatory_capture: bool = True
+    # Pawns not allowed to go backwards in jumps?
+    pawn_jump_forward_only: bool = True
+    # Kings move and jump any distance along diagonals?
+    flying_kings: bool = False
+    # Size of board new games are played on
+    board_size: tuple[int, int] = (8, 8)
+    # Plies in a row without a capture or pawn move that draw the game,
+    # 0 for no limit
+    no_progress_limit: int = 80
+    # Times the same position has to occur to draw the game, 0 for never
+    repetition_limit: int = 3
+
+
+DEFAULT_RULES: Final = Rules()
+# International and Canadian draughts style boards, without the rule that
+# the action capturing the most pieces must be taken
+INTERNATIONAL_RULES: Final = Rules(
+    pawn_jump_forward_only=False,
+    flying_kings=True,
+    board_size=(10, 10),
+)
+CANADIAN_RULES: Final = Rules(
+    pawn_jump_forward_only=False,
+    flying_kings=True,
+    board_size=(12, 12),
+)
+
+
 class Action(NamedTuple):
     """Represents an action."""
 
@@ -81,6 +118,24 @@ class ActionSet(NamedTuple):
     ends: set[Pos]
 
 
+class UndoRecord(NamedTuple):
+    """Information needed to undo an action performed in place."""
+
+    action: Action
+    # Type of moved piece before the action
+    piece_type: int
+    # Positions and types of pieces that were jumped
+    captured: tuple[tuple[Pos, int], ...]
+    # If moved piece was kinged
+    kinged: bool
+    # Value XOR-ed into Zobrist key by the action
+    zobrist_delta: int
+    # check_for_win cache from before the action
+    win_cache: tuple[int | None] | None
+    # Position history from before the action
+    history: tuple[int, ...]
+
+
 def get_sides(xy: Pos) -> tuple[Pos, Pos, Pos, Pos]:
     """Return the tile xy coordinates on the top left, top right, bottom left, and bottom right sides of given xy coordinates."""
     cx, cy = xy
@@ -129,6 +184,473 @@ def get_sides_pawn(xy: Pos, piece_type: u8) -> tuple[Pos, Pos]:
     return tuple_sides
 
 
+@dataclass(frozen=True, slots=True)
+class BoardGeometry:
+    """Precomputed neighbour and jump tables for a board size.
+
+    Tables are indexed by piece type, then by tile position.
+    """
+
+    size: tuple[int, int]
+    # Tiles a piece can move to, not including jumps
+    moves: tuple[dict[Pos, tuple[Pos, ...]], ...]
+    # (jumped tile, landing tile) pairs, pawns only jump forward
+    forward_jumps: tuple[dict[Pos, tuple[tuple[Pos, Pos], ...]], ...]
+    # (jumped tile, landing tile) pairs, every piece jumps any direction
+    all_jumps: tuple[dict[Pos, tuple[tuple[Pos, Pos], ...]], ...]
+    # Tiles along each diagonal in DIRECTIONS order, nearest first
+    rays: dict[Pos, tuple[tuple[Pos, ...], ...]]
+    # Bit of each tile in tile masks
+    bits: dict[Pos, int]
+    # Tile of each bit index in tile masks
+    positions: tuple[Pos, ...]
+    # Playable tiles, in reading order
+    tiles: tuple[Pos, ...]
+    # Index of each playable tile in tiles
+    tile_indices: dict[Pos, int]
+    # Tiles where red and black pawns get kinged
+    king_tiles: tuple[frozenset[Pos], frozenset[Pos]]
+
+    def get_mask_positions(self, mask: int) -> list[Pos]:
+        """Return positions of tiles in tile mask."""
+        positions = self.positions
+        tiles: list[Pos] = []
+        while mask:
+            lowest = mask & -mask
+            tiles.append(positions[lowest.bit_length() - 1])
+            mask ^= lowest
+        return tiles
+
+
+@cache
+def get_geometry(size: tuple[int, int]) -> BoardGeometry:
+    """Return neighbour and jump tables for a board of given size.
+
+    Tables are built once per board size and shared.
+    """
+    w, h = size
+
+    def valid(position: Pos) -> bool:
+        x, y = position
+        return x >= 0 and y >= 0 and x < w and y < h
+
+    moves: list[dict[Pos, tuple[Pos, ...]]] = [{}, {}, {}, {}]
+    forward_jumps: list[dict[Pos, tuple[tuple[Pos, Pos], ...]]] = [
+        {},
+        {},
+        {},
+        {},
+    ]
+    all_jumps: dict[Pos, tuple[tuple[Pos, Pos], ...]] = {}
+    rays: dict[Pos, tuple[tuple[Pos, ...], ...]] = {}
+    for y in range(h):
+        for x in range(w):
+            position = (x, y)
+            position_rays = []
+            for dx, dy in DIRECTIONS:
+                ray = []
+                tile = (x + dx, y + dy)
+                while valid(tile):
+                    ray.append(tile)
+                    tile = (tile[0] + dx, tile[1] + dy)
+                position_rays.append(tuple(ray))
+            rays[position] = tuple(position_rays)
+            sides = get_sides(position)
+            jumps = tuple(
+                (side, (side[0] + dx, side[1] + dy))
+                for side, (dx, dy) in zip(sides, DIRECTIONS, strict=True)
+            )
+            valid_jumps = tuple(
+                (side, side_side)
+                for side, side_side in jumps
+                if valid(side) and valid(side_side)
+            )
+            all_jumps[position] = valid_jumps
+            for piece_type in range(4):
+                moves[piece_type][position] = tuple(
+                    filter(valid, pawn_modify(sides, piece_type)),
+                )
+                forward_jumps[piece_type][position] = tuple(
+                    (side, side_side)
+                    for side, side_side in pawn_modify(jumps, piece_type)
+                    if valid(side) and valid(side_side)
+                )
+    tiles = tuple((x, y) for y in range(h) for x in range(w) if (x + y) % 2)
+    return BoardGeometry(
+        size=size,
+        moves=tuple(moves),
+        forward_jumps=tuple(forward_jumps),
+        all_jumps=(all_jumps,) * 4,
+        rays=rays,
+        bits={(x, y): 1 << (y * w + x) for y in range(h) for x in range(w)},
+        positions=tuple((x, y) for y in range(h) for x in range(w)),
+        tiles=tiles,
+        tile_indices={tile: index for index, tile in enumerate(tiles)},
+        king_tiles=(
+            frozenset((x, 0) for x in range(w)),
+            frozenset((x, h - 1) for x in range(w)),
+        ),
+    )
+
+
+class MoveGenerator:
+    """Move generation specialised for a board size and rule set.
+
+    Which functions generate moves and jumps for each piece type is
+    decided once when the generator is built, so generating actions
+    never has to check which rules are in use.
+    """
+
+    __slots__ = (
+        "geometry",
+        "jump_steps",
+        "jump_table",
+        "mandatory_capture",
+        "move_steps",
+        "rules",
+    )
+
+    def __init__(self, size: tuple[int, int], rules: Rules) -> None:
+        """Initialize move generator."""
+        self.geometry = get_geometry(size)
+        self.rules = rules
+        self.mandatory_capture = rules.mandatory_capture
+
+        if rules.pawn_jump_forward_only:
+            self.jump_table = self.geometry.forward_jumps
+        else:
+            self.jump_table = self.geometry.all_jumps
+
+        pawn_moves = self.get_neighbour_moves
+        pawn_jumps = self.get_short_jump_steps
+        if rules.flying_kings:
+            king_moves = self.get_flying_moves
+            king_jumps = self.get_flying_jump_steps
+        else:
+            king_moves = pawn_moves
+            king_jumps = pawn_jumps
+        self.move_steps = (pawn_moves, pawn_moves, king_moves, king_moves)
+        self.jump_steps = (pawn_jumps, pawn_jumps, king_jumps, king_jumps)
+
+    def get_neighbour_moves(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+        piece_type: int,
+    ) -> tuple[Pos, ...]:
+        """Return empty neighbouring tiles piece can move to."""
+        return tuple(
+            m
+            for m in self.geometry.moves[piece_type][position]
+            if m not in pieces
+        )
+
+    def get_flying_moves(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+        piece_type: int,
+    ) -> tuple[Pos, ...]:
+        """Return empty tiles along every diagonal until blocked."""
+        moves: list[Pos] = []
+        for ray in self.geometry.rays[position]:
+            for tile in ray:
+                if tile in pieces:
+                    break
+                moves.append(tile)
+        return tuple(moves)
+
+    def get_short_jump_steps(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+        piece_type: int,
+        enemy_pieces: tuple[int, int],
+        captured: int,
+    ) -> Generator[tuple[Pos, Pos], None, None]:
+        """Yield (jumped tile, landing tile) of single jumps over neighbours.
+
+        captured is a tile mask of pieces already jumped this action,
+        they are still in pieces but count as removed.
+        """
+        bits = self.geometry.bits
+        for side, side_side in self.jump_table[piece_type][position]:
+            # Side piece must be an enemy piece not already captured
+            if pieces.get(side) not in enemy_pieces or captured & bits[side]:
+                continue
+            # and beyond tile empty
+            if side_side in pieces and not captured & bits[side_side]:
+                continue
+            yield side, side_side
+
+    def get_flying_jump_steps(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+        piece_type: int,
+        enemy_pieces: tuple[int, int],
+        captured: int,
+    ) -> Generator[tuple[Pos, Pos], None, None]:
+        """Yield (jumped tile, landing tile) of single long range jumps.
+
+        Pieces already captured during this action (tile mask captured)
+        block the way.
+        """
+        for ray in self.geometry.rays[position]:
+            for index, side in enumerate(ray):
+                side_piece = pieces.get(side)
+                if side_piece is None:
+                    continue
+                if (
+                    side_piece in enemy_pieces
+                    and not captured & (self.geometry.bits[side])
+                ):
+                    for side_side in ray[index + 1 :]:
+                        if side_side in pieces:
+                            break
+                        yield side, side_side
+                break
+
+    def get_moves(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+    ) -> tuple[Pos, ...]:
+        """Return valid moves piece at position can make, not including jumps."""
+        piece_type = pieces[position]
+        return self.move_steps[piece_type](pieces, position, piece_type)
+
+    def get_jumps(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+    ) -> dict[Pos, list[Pos]]:
+        """Return valid jumps piece at position can make.
+
+        Returns dictionary that maps end positions to jumped pieces to
+        get there
+        """
+        piece_type = pieces[position]
+        enemy = (piece_type + 1) % 2
+        valid: dict[Pos, list[Pos]] = {}
+        self.explore_jumps(
+            pieces,
+            position,
+            piece_type,
+            (enemy, enemy + 2),
+            0,
+            [],
+            valid,
+        )
+        return valid
+
+    def explore_jumps(
+        self,
+        pieces: dict[Pos, int],
+        position: Pos,
+        piece_type: int,
+        enemy_pieces: tuple[int, int],
+        captured: int,
+        path: list[Pos],
+        valid: dict[Pos, list[Pos]],
+    ) -> None:
+        """Add every jump continuing path from position to valid.
+
+        pieces is never copied or modified, pieces jumped so far are
+        tracked by tile mask captured and path is undone after each
+        jump is explored. Chains end once no uncaptured enemy piece is
+        left to jump. When several paths reach the same tile, the one
+        capturing the most pieces is kept.
+        """
+        bits = self.geometry.bits
+        king_tiles = self.geometry.king_tiles
+        for side, side_side in self.jump_steps[piece_type](
+            pieces,
+            position,
+            piece_type,
+            enemy_pieces,
+            captured,
+        ):
+            # Determine if piece becomes a king
+            new_piece_type = piece_type
+            if new_piece_type < 2 and side_side in king_tiles[new_piece_type]:
+                new_piece_type += 2
+
+            # Track the jump
+            path.append(side)
+            best = valid.get(side_side)
+            if best is None or len(path) > len(best):
+                valid[side_side] = path.copy()
+
+            self.explore_jumps(
+                pieces,
+                side_side,
+                new_piece_type,
+                enemy_pieces,
+                captured | bits[side],
+                path,
+                valid,
+            )
+            path.pop()
+
+    def generate_action_list(
+        self,
+        pieces: dict[Pos, int],
+        player: int,
+    ) -> list[ActionRecord]:
+        """Return every action of player as (from, to, capture mask) records.
+
+        Does one sweep over the pieces, jumps are listed before moves.
+        """
+        player_pieces = (player, player + 2)
+        bits = self.geometry.bits
+        jumps: list[ActionRecord] = []
+        moves: list[ActionRecord] = []
+        for position, piece_type in pieces.items():
+            if piece_type not in player_pieces:
+                continue
+            for end, path in self.get_jumps(pieces, position).items():
+                mask = 0
+                for jumped in path:
+                    mask |= bits[jumped]
+                jumps.append((position, end, mask))
+            if jumps and self.mandatory_capture:
+                continue
+            for end in self.move_steps[piece_type](
+                pieces,
+                position,
+                piece_type,
+            ):
+                moves.append((position, end, 0))
+        if jumps and self.mandatory_capture:
+            return jumps
+        jumps.extend(moves)
+        return jumps
+
+    def get_landings(
+        self,
+        start: Pos,
+        end: Pos,
+        jumped: list[Pos],
+    ) -> list[Pos]:
+        """Return tiles piece lands on after each jump of a jump path."""
+        rays = self.geometry.rays
+        landings: list[Pos] = []
+        current = start
+        last = len(jumped) - 1
+        for index, jumped_pos in enumerate(jumped):
+            if index == last:
+                landings.append(end)
+                break
+            jumped_x, jumped_y = jumped_pos
+            direction = DIRECTIONS.index(
+                (
+                    1 if jumped_x > current[0] else -1,
+                    1 if jumped_y > current[1] else -1,
+                ),
+            )
+            # Land on first tile the next jumped piece is diagonal from.
+            # Only differs from the tile right after the jumped piece
+            # with flying kings.
+            next_x, next_y = jumped[index + 1]
+            for current in rays[jumped_pos][direction]:
+                dx = next_x - current[0]
+                if dx in {next_y - current[1], current[1] - next_y}:
+                    break
+            landings.append(current)
+        return landings
+
+    def has_action(self, pieces: dict[Pos, int], player: int) -> bool:
+        """Return if player can make any action.
+
+        Stops at the first move or jump found instead of searching
+        every jump path.
+        """
+        player_pieces = (player, player + 2)
+        enemy = (player + 1) % 2
+        enemy_pieces = (enemy, enemy + 2)
+        moves = self.geometry.moves
+        jump_steps = self.jump_steps
+        for position, piece_type in pieces.items():
+            if piece_type not in player_pieces:
+                continue
+            for end in moves[piece_type][position]:
+                if end not in pieces:
+                    return True
+            for _jump in jump_steps[piece_type](
+                pieces,
+                position,
+                piece_type,
+                enemy_pieces,
+                0,
+            ):
+                return True
+        return False
+
+    def has_jump(self, pieces: dict[Pos, int], player: int) -> bool:
+        """Return if player can jump any piece.
+
+        Stops at the first jump found instead of searching every jump
+        path.
+        """
+        player_pieces = (player, player + 2)
+        enemy = (player + 1) % 2
+        enemy_pieces = (enemy, enemy + 2)
+        jump_steps = self.jump_steps
+        for position, piece_type in pieces.items():
+            if piece_type not in player_pieces:
+                continue
+            for _jump in jump_steps[piece_type](
+                pieces,
+                position,
+                piece_type,
+                enemy_pieces,
+                0,
+            ):
+                return True
+        return False
+
+
+@cache
+def get_move_generator(size: tuple[int, int], rules: Rules) -> MoveGenerator:
+    """Return move generator for board size and rule set.
+
+    Generators are built once per board size and rule set and shared.
+    """
+    return MoveGenerator(size, rules)
+
+
+@dataclass(frozen=True, slots=True)
+class ZobristKeys:
+    """Random keys for Zobrist hashing positions on a board size."""
+
+    # Key for each piece type on each tile
+    pieces: dict[Pos, tuple[int, int, int, int]]
+    # Key toggled when it is black's turn
+    turn: int
+
+
+@cache
+def get_zobrist_keys(size: tuple[int, int]) -> ZobristKeys:
+    """Return Zobrist keys for a board of given size.
+
+    Keys come from a fixed seed so they are the same in every process.
+    """
+    w, h = size
+    # No need for cryptographic secure random
+    rng = random.Random(f"checkers zobrist {w}x{h}")  # noqa: S311
+    pieces: dict[Pos, tuple[int, int, int, int]] = {}
+    for y in range(h):
+        for x in range(w):
+            pieces[x, y] = (
+                rng.getrandbits(64),
+                rng.getrandbits(64),
+                rng.getrandbits(64),
+                rng.getrandbits(64),
+            )
+    return ZobristKeys(pieces, rng.getrandbits(64))
+
+
 @dataclass(slots=True)
 class State:
     """Represents state of checkers game."""
@@ -136,6 +658,63 @@ class State:
     size: tuple[int, int]
     pieces: dict[Pos, int]
     turn: bool = True  # Black moves first
+    rules: Rules = DEFAULT_RULES
+    move_generator: MoveGenerator = field(
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    # Zobrist hash of position, calculated from pieces if not given
+    zobrist_key: int | None = field(default=None, repr=False, compare=False)
+    # Zobrist keys of earlier positions since the last capture or pawn
+    # move, oldest first. Those actions can not be undone, so earlier
+    # positions can never occur again.
+    history: tuple[int, ...] = field(default=(), repr=False, compare=False)
+    # Cached check_for_win result, wrapped in a tuple once calculated
+    _win_cache: tuple[int | None] | None = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    # Cached get_action_sets results for each player
+    _action_cache: dict[int, dict[Pos, ActionSet]] | None = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+    # Undo records of actions performed in place with push
+    _undo_stack: list[UndoRecord] | None = field(
+        default=None,
+        init=False,
+        repr=False,
+        compare=False,
+    )
+
+    def __post_init__(self) -> None:
+        """Look up shared move generator and calculate Zobrist key."""
+        self.move_generator = get_move_generator(self.size, self.rules)
+        if self.zobrist_key is None:
+            self.zobrist_key = self.calculate_zobrist_key()
+
+    @property
+    def geometry(self) -> BoardGeometry:
+        """Neighbour and jump tables for board size."""
+        return self.move_generator.geometry
+
+    def __hash__(self) -> int:
+        """Return Zobrist key of this position."""
+        assert self.zobrist_key is not None
+        return self.zobrist_key
+
+    def calculate_zobrist_key(self) -> int:
+        """Return Zobrist key of this position calculated from scratch."""
+        keys = get_zobrist_keys(self.size)
+        key = keys.turn if self.turn else 0
+        for position, piece_type in self.pieces.items():
+            key ^= keys.pieces[position][piece_type]
+        return key
 
     def __str__(self) -> str:
         """Return text representation of game board state."""
@@ -155,22 +734,54 @@ class State:
         # lines.append("--+-"*(w-1)+"-")
         return "\n".join(lines)
 
+    def get_action_sets(self, player: int) -> dict[Pos, ActionSet]:
+        """Return actions of every piece of player that can act, by position.
+
+        Result is cached, so pieces must not be modified afterwards and
+        returned action sets must not be modified.
+        """
+        player %= 2
+        if self._action_cache is None:
+            self._action_cache = {}
+        action_sets = self._action_cache.get(player)
+        if action_sets is not None:
+            return action_sets
+
+        player_pieces = self.get_piece_types(player)
+        player_positions = [
+            position
+            for position, piece_type in self.pieces.items()
+            if piece_type in player_pieces
+        ]
+        all_jumps = {
+            position: self.get_jumps(position) for position in player_positions
+        }
+        jumps_available = any(all_jumps.values())
+
+        action_sets = {}
+        for position in player_positions:
+            jumps = all_jumps[position]
+            moves: tuple[Pos, ...]
+            if self.move_generator.mandatory_capture and jumps_available:
+                moves = ()
+            else:
+                moves = self.get_moves(position)
+            if not jumps and not moves:
+                continue
+            ends = set(jumps)
+            ends.update(moves)
+            action_sets[position] = ActionSet(jumps, moves, ends)
+        self._action_cache[player] = action_sets
+        return action_sets
+
     def calculate_actions(self, position: Pos) -> ActionSet:
-        """Return actions the piece at given position can make."""
-        if MANDATORY_CAPTURE:
-            exists = False
-            for start, _end in self.get_all_actions(self.pieces[position]):
-                if start == position:
-                    exists = True
-                    break
-            if not exists:
-                return ActionSet({}, (), set())
-        jumps = self.get_jumps(position)
-        moves: tuple[Pos, ...]
-        moves = () if MANDATORY_CAPTURE and jumps else self.get_moves(position)
-        ends = set(jumps)
-        ends.update(moves)
-        return ActionSet(jumps, moves, ends)
+        """Return actions the piece at given position can make.
+
+        Looks up cached get_action_sets result, returned action set must
+        not be modified.
+        """
+        action_sets = self.get_action_sets(self.pieces[position])
+        return action_sets.get(position, ActionSet({}, (), set()))
 
     def piece_kinged(self, piece_pos: Pos, new_type: int) -> None:
         """Piece kinged."""
@@ -188,34 +799,42 @@ class State:
         from_pos, to_pos = action
 
         pieces_copy = dict(self.pieces.items())
+        keys = get_zobrist_keys(self.size)
+        piece_keys = keys.pieces
+        assert self.zobrist_key is not None
+        # Update hash incrementally, starting with swapping turn
+        zobrist_key = self.zobrist_key ^ keys.turn
 
         # Remove piece from it's start position
         piece_type = pieces_copy.pop(from_pos)
+        zobrist_key ^= piece_keys[from_pos][piece_type]
 
         # See if it's a jump
-        if to_pos not in self.get_moves(from_pos):
+        jump = to_pos not in self.get_moves(from_pos)
+        history = self.get_next_history(piece_type, jump)
+        if jump:
             # Jumps are more complex to calculate and we need
             # to know what pieces got jumped over
-            cur_x, cur_y = from_pos
-            for jumped_pos in self.get_jumps(from_pos)[to_pos]:
-                from_pos = (cur_x, cur_y)
-
+            jumped = self.get_jumps(from_pos)[to_pos]
+            landings = self.move_generator.get_landings(
+                from_pos,
+                to_pos,
+                jumped,
+            )
+            for jumped_pos, landing_pos in zip(jumped, landings, strict=True):
                 # Remove jumped position from pieces in play
                 if jumped_pos in pieces_copy:
-                    pieces_copy.pop(jumped_pos)
+                    jumped_type = pieces_copy.pop(jumped_pos)
+                    zobrist_key ^= piece_keys[jumped_pos][jumped_type]
                 self.piece_jumped(jumped_pos)
-                # See if piece kinged
-                jumped_x, jumped_y = jumped_pos
-                # Rightshift 1 is more efficient way to multiply by 2
-                cur_x += (jumped_x - cur_x) << 1
-                cur_y += (jumped_y - cur_y) << 1
 
-                self.piece_moved(from_pos, (cur_x, cur_y))
+                self.piece_moved(from_pos, landing_pos)
+                from_pos = landing_pos
 
                 # Now that we know the current position, see if kinged
-                if self.does_piece_king(piece_type, (cur_x, cur_y)):
+                if self.does_piece_king(piece_type, landing_pos):
                     piece_type += 2
-                    self.piece_kinged((cur_x, cur_y), piece_type)
+                    self.piece_kinged(landing_pos, piece_type)
         else:
             self.piece_moved(from_pos, to_pos)
 
@@ -226,14 +845,103 @@ class State:
 
         # Move piece to it's end position
         pieces_copy[to_pos] = piece_type
+        zobrist_key ^= piece_keys[to_pos][piece_type]
 
         # Swap turn
         return self.__class__(
             self.size,
             pieces_copy,
             not self.turn,
+            rules=self.rules,
+            zobrist_key=zobrist_key,
+            history=history,
         )
 
+    def push(self, action: Action) -> None:
+        """Perform action on self in place, undo with pop.
+
+        Unlike perform_action, does not call the piece_* event methods.
+        """
+        from_pos, to_pos = action
+        pieces = self.pieces
+        keys = get_zobrist_keys(self.size)
+        piece_keys = keys.pieces
+        king_tiles = self.geometry.king_tiles
+
+        jump = to_pos not in self.get_moves(from_pos)
+        if not jump:
+            jumped: list[Pos] = []
+            landings: list[Pos] = []
+        else:
+            jumped = self.get_jumps(from_pos)[to_pos]
+            landings = self.move_generator.get_landings(
+                from_pos,
+                to_pos,
+                jumped,
+            )
+
+        start_type = pieces.pop(from_pos)
+        piece_type = start_type
+        zobrist_delta = keys.turn ^ piece_keys[from_pos][piece_type]
+
+        captured: list[tuple[Pos, int]] = []
+        for jumped_pos, landing_pos in zip(jumped, landings, strict=True):
+            if jumped_pos in pieces:
+                jumped_type = pieces.pop(jumped_pos)
+                captured.append((jumped_pos, jumped_type))
+                zobrist_delta ^= piece_keys[jumped_pos][jumped_type]
+            if piece_type < 2 and landing_pos in king_tiles[piece_type]:
+                piece_type += 2
+        if piece_type < 2 and to_pos in king_tiles[piece_type]:
+            piece_type += 2
+
+        pieces[to_pos] = piece_type
+        zobrist_delta ^= piece_keys[to_pos][piece_type]
+
+        if self._undo_stack is None:
+            self._undo_stack = []
+        self._undo_stack.append(
+            UndoRecord(
+                action,
+                start_type,
+                tuple(captured),
+                piece_type != start_type,
+                zobrist_delta,
+                self._win_cache,
+                self.history,
+            ),
+        )
+        self.history = self.get_next_history(start_type, jump)
+        assert self.zobrist_key is not None
+        self.zobrist_key ^= zobrist_delta
+        self.turn = not self.turn
+        self._win_cache = None
+        self._action_cache = None
+
+    def pop(self) -> Action:
+        """Undo last action performed with push and return it.
+
+        Raises IndexError if there is nothing to undo.
+        """
+        if not self._undo_stack:
+            raise IndexError("pop from empty undo stack")
+        record = self._undo_stack.pop()
+        from_pos, to_pos = record.action
+        pieces = self.pieces
+
+        del pieces[to_pos]
+        pieces[from_pos] = record.piece_type
+        for jumped_pos, jumped_type in record.captured:
+            pieces[jumped_pos] = jumped_type
+
+        assert self.zobrist_key is not None
+        self.zobrist_key ^= record.zobrist_delta
+        self.turn = not self.turn
+        self._win_cache = record.win_cache
+        self._action_cache = None
+        self.history = record.history
+        return record.action
+
     def get_tile_name(self, x: int, y: int) -> str:
         """Return name of a given tile."""
         return chr(65 + x) + str(self.size[1] - y)
@@ -272,7 +980,7 @@ class State:
         self,
         position: Pos,
     ) -> dict[Pos, list[Pos]]:
-        """Return valid jumps a piece can make using an iterative approach.
+        """Return valid jumps a piece can make.
 
         position is a xy coordinate tuple pointing to a board position
             that may or may not have a piece on it.
@@ -280,95 +988,11 @@ class State:
         Returns dictionary that maps end positions to jumped pieces to
         get there
         """
-        # Initial setup
-        piece_type = self.pieces[position]
-        enemy_pieces = self.get_piece_types(self.get_enemy(piece_type))
-        w, h = self.size
-        max_recursion = math.ceil((w**2 + h**2) ** 0.25)
-
-        # Stack to manage jump exploration
-        stack: list[tuple[Pos, u8, dict[Pos, u8], list[Pos]]] = [
-            (position, piece_type, dict(self.pieces), []),
-        ]
-        valid: dict[Pos, list[Pos]] = {}
-
-        while stack:
-            current_pos, current_piece_type, current_pieces, current_path = (
-                stack.pop()
-            )
-
-            # Find possible jumps from current position
-            sides = get_sides(current_pos)
-
-            # Modify sides for pawns if needed
-            if PAWN_JUMP_FORWARD_ONLY:
-                valid_sides = pawn_modify(
-                    tuple(enumerate(sides)),
-                    current_piece_type,
-                )
-            else:
-                valid_sides = tuple(enumerate(sides))
-
-            # Explore each possible jump direction
-            for direction, side in valid_sides:
-                # Validate side tile
-                if not self.valid_location(side):
-                    continue
-
-                side_piece = current_pieces.get(side)
-                # Side piece must be an enemy piece
-                if side_piece not in enemy_pieces:
-                    continue
-
-                # Get the tile beyond the jumped piece
-                dx, dy = DIRECTIONS[direction]
-                side_side = (side[0] + dx, side[1] + dy)
-
-                # Validate beyond tile
-                if not self.valid_location(side_side):
-                    continue
-
-                side_side_piece = current_pieces.get(side_side)
-
-                # If beyond tile is empty, we can jump
-                if side_side_piece is None:
-                    # Create a copy of pieces to modify
-                    new_pieces = dict(current_pieces)
-                    # Remove jumped piece
-                    new_pieces.pop(side)
-
-                    # Determine if piece becomes a king
-                    new_piece_type = current_piece_type
-                    if self.does_piece_king(new_piece_type, side_side):
-                        new_piece_type += 2
-
-                    # Track the jump
-                    new_path = [*current_path, side]
-                    valid[side_side] = new_path
-
-                    # Add to stack for further exploration if not too deep
-                    if len(new_path) < max_recursion:
-                        stack.append(
-                            (side_side, new_piece_type, new_pieces, new_path),
-                        )
-
-        return valid
+        return self.move_generator.get_jumps(self.pieces, position)
 
     def get_moves(self, position: Pos) -> tuple[Pos, ...]:
         """Return valid moves piece at position can make, not including jumps."""
-        piece_type = self.pieces[position]
-        # Get the side xy choords of the tile's xy pos,
-        # then modify results for pawns
-        moves: tuple[Pos, ...]
-        if piece_type < 2:
-            moves = get_sides_pawn(position, piece_type)
-        else:
-            moves = get_sides(position)
-        return tuple(
-            m
-            for m in filter(self.valid_location, moves)
-            if m not in self.pieces
-        )
+        return self.move_generator.get_moves(self.pieces, position)
 
     @classmethod
     def wrap_actions(
@@ -390,7 +1014,7 @@ class State:
             if piece_type in player_pieces:
                 player_positions.append(position)
 
-        if not MANDATORY_CAPTURE:
+        if not self.move_generator.mandatory_capture:
             for position in player_positions:
                 yield from self.wrap_actions(position, self.get_jumps)
                 yield from self.wrap_actions(position, self.get_moves)
@@ -406,21 +1030,78 @@ class State:
             for position in player_positions:
                 yield from self.wrap_actions(position, self.get_moves)
 
+    def generate_action_list(
+        self,
+        player: int | None = None,
+    ) -> list[ActionRecord]:
+        """Return every action as (from, to, capture mask) records.
+
+        Player defaults to the player whose turn it is. Capture mask has
+        the bits of jumped tiles set, see BoardGeometry.bits.
+        """
+        if player is None:
+            player = self.get_turn()
+        return self.move_generator.generate_action_list(
+            self.pieces,
+            player % 2,
+        )
+
+    def has_action(self, player: int) -> bool:
+        """Return if player can make any action.
+
+        Stops at the first move or jump found instead of searching
+        every jump path like get_all_actions.
+        """
+        return self.move_generator.has_action(self.pieces, player % 2)
+
+    def has_jump(self, player: int) -> bool:
+        """Return if player can jump any piece.
+
+        Stops at the first jump found instead of searching every jump
+        path like get_jumps.
+        """
+        return self.move_generator.has_jump(self.pieces, player % 2)
+
+    def get_next_history(self, piece_type: int, jump: bool) -> tuple[int, ...]:
+        """Return history after piece of piece_type moves or jumps."""
+        if jump or piece_type < 2:
+            # Captures and pawn moves can not be undone
+            return ()
+        assert self.zobrist_key is not None
+        return (*self.history, self.zobrist_key)
+
+    def is_repetition(self) -> bool:
+        """Return if this position occurred before in history."""
+        return self.zobrist_key in self.history
+
+    def is_draw(self) -> bool:
+        """Return if game is drawn by no progress or repetition rules."""
+        no_progress_limit = self.rules.no_progress_limit
+        if no_progress_limit and len(self.history) >= no_progress_limit:
+            return True
+        repetition_limit = self.rules.repetition_limit
+        # Turn is part of the key, so only every other position can match
+        return bool(repetition_limit) and (
+            self.history[-2::-2].count(self.zobrist_key) + 1
+            >= repetition_limit
+        )
+
     def check_for_win(self) -> int | None:
-        """Return player number if they won else None."""
-        # For each of the two players,
-        for player in range(2):
-            # For each tile in the playable tiles,
-            has_move = False
-            for _ in self.get_all_actions(player):
-                has_move = True
-                # Player has at least one move, no need to continue
-                break
-            if not has_move and self.turn == bool(player):
-                # Continued without break, so player either has no moves
-                # or no possible moves, so their opponent wins
-                return self.get_enemy(player)
-        return None
+        """Return player number if they won, DRAW for a draw, else None.
+
+        Result is cached, so pieces must not be modified afterwards.
+        """
+        if self._win_cache is None:
+            player = self.get_turn()
+            winner = None
+            if not self.has_action(player):
+                # Player to move has no possible moves,
+                # so their opponent wins
+                winner = self.get_enemy(player)
+            elif self.is_draw():
+                winner = DRAW
+            self._win_cache = (winner,)
+        return self._win_cache[0]
 
     def can_player_select_piece(self, player: int, tile_pos: Pos) -> bool:
         """Return True if player can select piece on given tile position."""
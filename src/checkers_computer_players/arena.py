@@ -0,0 +1,297 @@
+"""Arena - Play computer players against each other without networking."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Arena"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import argparse
+import contextlib
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+import trio
+
+from checkers.state import DRAW, Action, State, generate_pieces
+from checkers_computer_players.example_ai import ComputerPlayer
+from checkers_computer_players.max_y_jumper_ai import MaxYJumperPlayer
+from checkers_computer_players.mcts_ai import MCTSPlayer
+from checkers_computer_players.minimax_ai import MinimaxPlayer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from checkers_computer_players.machine_client import RemoteState
+
+# Players that can be picked by name from the command line
+PLAYERS: Final[dict[str, type[RemoteState]]] = {
+    "minimax": MinimaxPlayer,
+    "mcts": MCTSPlayer,
+    "max_y_jumper": MaxYJumperPlayer,
+    "random": ComputerPlayer,
+}
+
+# Games still going after this many plies are draws, for rules without
+# a no progress limit
+DEFAULT_MAX_PLIES: Final = 200
+
+
+class GameResult(NamedTuple):
+    """Result of one arena game."""
+
+    # Winning player, 0 for red, 1 for black, None for a draw
+    winner: int | None
+    plies: int
+
+
+@dataclass(slots=True)
+class MatchStats:
+    """Win, loss and draw counts of a match, for the first player."""
+
+    wins: int = 0
+    losses: int = 0
+    draws: int = 0
+    # Plies of every game added up
+    plies: int = 0
+
+    @property
+    def games(self) -> int:
+        """Number of games played."""
+        return self.wins + self.losses + self.draws
+
+    @property
+    def score(self) -> float:
+        """Fraction of points won, draws are half a point."""
+        if not self.games:
+            return 0.0
+        return (self.wins + self.draws / 2) / self.games
+
+    def add(self, result: GameResult, playing_as: int) -> None:
+        """Count result of game where first player played as playing_as."""
+        self.plies += result.plies
+        if result.winner is None:
+            self.draws += 1
+        elif result.winner == playing_as:
+            self.wins += 1
+        else:
+            self.losses += 1
+
+    def report(self) -> str:
+        """Return one line summary of match."""
+        average = self.plies / self.games if self.games else 0.0
+        return (
+            f"{self.games} games, {self.wins} wins, {self.losses} losses, "
+            f"{self.draws} draws, score {self.score:.1%}, "
+            f"{average:.1f} plies per game"
+        )
+
+
+def get_start_state() -> State:
+    """Return state at the start of a game."""
+    return State((8, 8), generate_pieces(8, 8))
+
+
+def random_opening(seed: int, plies: int) -> tuple[Action, ...]:
+    """Return random legal actions from the start of a game."""
+    # No need for cryptographic secure random
+    rng = random.Random(seed)  # noqa: S311
+    state = get_start_state()
+    actions: list[Action] = []
+    for _ in range(plies):
+        if state.check_for_win() is not None:
+            break
+        action = rng.choice(sorted(state.get_all_actions(state.get_turn())))
+        actions.append(action)
+        state = state.perform_action(action)
+    return tuple(actions)
+
+
+class IllegalActionError(Exception):
+    """Raised when a player performs an action that is not legal."""
+
+    __slots__ = ()
+
+
+async def play_game(
+    black: type[RemoteState],
+    red: type[RemoteState],
+    opening: Iterable[Action] = (),
+    max_plies: int = DEFAULT_MAX_PLIES,
+    move_time_ns: int | None = None,
+) -> GameResult:
+    """Play one game between new players of given classes.
+
+    Players are asked for actions directly with perform_turn, no
+    events are raised. Opening actions are performed before players
+    get a turn. move_time_ns sets thinking time of players that have
+    one.
+    """
+    state = get_start_state()
+    for action in opening:
+        state = state.perform_action(action)
+    players = (red(), black())
+    for playing_as, player in enumerate(players):
+        player.playing_as = playing_as
+        player.has_initial = True
+        if move_time_ns is not None and isinstance(
+            player,
+            (MinimaxPlayer, MCTSPlayer),
+        ):
+            player.move_time_ns = move_time_ns
+
+    plies = 0
+    while (winner := state.check_for_win()) is None and plies < max_plies:
+        player = players[state.turn]
+        # Players may change the state they are given
+        player.state = State(
+            state.size,
+            dict(state.pieces),
+            state.turn,
+            rules=state.rules,
+            history=state.history,
+        )
+        action = await player.perform_turn()
+        if action not in set(state.get_all_actions(state.get_turn())):
+            raise IllegalActionError(
+                f"{type(player).__name__} performed illegal {action}",
+            )
+        state = state.perform_action(action)
+        plies += 1
+    if winner == DRAW:
+        winner = None
+    return GameResult(winner, plies)
+
+
+def play_game_sync(
+    black: type[RemoteState],
+    red: type[RemoteState],
+    opening: tuple[Action, ...] = (),
+    max_plies: int = DEFAULT_MAX_PLIES,
+    move_time_ns: int | None = None,
+) -> GameResult:
+    """Play one game, with output of players hidden.
+
+    Runs in a worker process, see play_game.
+    """
+    with (
+        open(os.devnull, "w", encoding="utf-8") as devnull,
+        contextlib.redirect_stdout(devnull),
+    ):
+        return trio.run(
+            play_game,
+            black,
+            red,
+            opening,
+            max_plies,
+            move_time_ns,
+        )
+
+
+def run_match(
+    first: type[RemoteState],
+    second: type[RemoteState],
+    games: int,
+    workers: int | None = None,
+    opening_plies: int = 4,
+    max_plies: int = DEFAULT_MAX_PLIES,
+    move_time_ns: int | None = None,
+    seed: int = 0,
+) -> MatchStats:
+    """Play games between two player classes in worker processes.
+
+    Games are played in pairs from the same random opening, with first
+    player playing black in one game and red in the other. Returns
+    counts for first player.
+    """
+    stats = MatchStats()
+    with ProcessPoolExecutor(workers) as executor:
+        futures = []
+        for game in range(games):
+            opening = random_opening(seed + game // 2, opening_plies)
+            playing_as = 1 - game % 2
+            black, red = (first, second) if playing_as else (second, first)
+            futures.append(
+                (
+                    playing_as,
+                    executor.submit(
+                        play_game_sync,
+                        black,
+                        red,
+                        opening,
+                        max_plies,
+                        move_time_ns,
+                    ),
+                ),
+            )
+        for playing_as, future in futures:
+            stats.add(future.result(), playing_as)
+    return stats
+
+
+def cli_run() -> None:
+    """Run arena match from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Play computer players against each other without "
+        "networking and report results of the first player.",
+    )
+    parser.add_argument("first", choices=tuple(PLAYERS))
+    parser.add_argument("second", choices=tuple(PLAYERS))
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=100,
+        help="Number of games to play (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--opening-plies",
+        type=int,
+        default=4,
+        help="Random actions at the start of each game pair "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-plies",
+        type=int,
+        default=DEFAULT_MAX_PLIES,
+        help="Games longer than this are draws (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--move-time",
+        type=float,
+        default=0.1,
+        help="Seconds minimax and MCTS players think per move "
+        "(default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    start = time.perf_counter_ns()
+    stats = run_match(
+        PLAYERS[args.first],
+        PLAYERS[args.second],
+        args.games,
+        args.workers,
+        args.opening_plies,
+        args.max_plies,
+        int(args.move_time * 1e9),
+        args.seed,
+    )
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    print(f"{args.first} vs {args.second}: {stats.report()}")
+    print(f"Played in {elapsed:.1f} seconds")
+
+
+if __name__ == "__main__":
+    cli_run()
@@ -0,0 +1,380 @@
+"""Evaluation - Static evaluation of checkers positions."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Evaluation"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import math
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
+
+from checkers.state import DRAW, get_geometry
+
+# NumPy is optional, install the numpy extra for batch evaluation
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    HAS_NUMPY = False
+else:
+    HAS_NUMPY = True
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from checkers.state import Pos, State
+
+# Piece type code of empty tiles in batch arrays
+EMPTY: Final = 4
+
+
+class EvaluationWeights(NamedTuple):
+    """Weight of each evaluation feature, in pawns."""
+
+    pawn: float = 1.0
+    king: float = 3.0
+    # Pawn on last row before kinging gets full weight
+    advancement: float = 0.3
+    # Pawn still guarding its own back row
+    back_rank: float = 0.2
+    # Piece on centre tile gets full weight
+    centre: float = 0.1
+    # Per tile a piece can move to
+    mobility: float = 0.05
+    # Pawn no enemy piece can stop from kinging
+    runaway: float = 0.5
+
+
+# Only count pieces, pawns plus 3 times kings
+MATERIAL_WEIGHTS: Final = EvaluationWeights(
+    advancement=0.0,
+    back_rank=0.0,
+    centre=0.0,
+    mobility=0.0,
+    runaway=0.0,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SquareTables:
+    """Unweighted feature values of each tile for a board size.
+
+    Per piece type tables are indexed by piece type, then by tile.
+    """
+
+    size: tuple[int, int]
+    advancement: tuple[dict[Pos, float], ...]
+    back_rank: tuple[dict[Pos, float], ...]
+    centre: dict[Pos, float]
+    # Tile mask of tiles ahead of a pawn that can reach its path to
+    # the king row in time, no enemy piece there means pawn is a runaway
+    runaway_cones: tuple[dict[Pos, int], ...]
+
+
+@cache
+def get_square_tables(size: tuple[int, int]) -> SquareTables:
+    """Return feature tables for a board of given size.
+
+    Tables are built once per board size and shared.
+    """
+    geometry = get_geometry(size)
+    w, h = size
+    last_row = max(1, h - 1)
+    centre_x = (w - 1) / 2
+    centre_y = (h - 1) / 2
+    max_distance = max(1.0, centre_x + centre_y)
+
+    advancement: list[dict[Pos, float]] = [{}, {}, {}, {}]
+    back_rank: list[dict[Pos, float]] = [{}, {}, {}, {}]
+    centre: dict[Pos, float] = {}
+    runaway_cones: list[dict[Pos, int]] = [{}, {}]
+    for position in geometry.positions:
+        x, y = map(int, position)
+        distance = abs(x - centre_x) + abs(y - centre_y)
+        centre[position] = 1 - distance / max_distance
+        # Red pawns move up to row 0, black pawns down to last row
+        for piece_type, forward, rows_left, home in (
+            (0, -1, y, h - 1),
+            (1, 1, h - 1 - y, 0),
+        ):
+            advancement[piece_type][position] = 1 - rows_left / last_row
+            back_rank[piece_type][position] = float(y == home)
+            cone = 0
+            for rows in range(1, rows_left + 1):
+                row = y + forward * rows
+                for column in range(x - rows, x + rows + 1):
+                    if 0 <= column < w:
+                        cone |= geometry.bits[column, row]
+            runaway_cones[piece_type][position] = cone
+        for piece_type in (2, 3):
+            advancement[piece_type][position] = 0.0
+            back_rank[piece_type][position] = 0.0
+    return SquareTables(
+        size=size,
+        advancement=tuple(advancement),
+        back_rank=tuple(back_rank),
+        centre=centre,
+        runaway_cones=tuple(runaway_cones),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class WeightedTables:
+    """Square tables of a board size combined with evaluation weights."""
+
+    # Weighted advancement, back rank and centre value, by piece type
+    positional: tuple[dict[Pos, float], ...]
+    # Tiles each piece type can move to, not including jumps
+    moves: tuple[dict[Pos, tuple[Pos, ...]], ...]
+    runaway_cones: tuple[dict[Pos, int], ...]
+    bits: dict[Pos, int]
+
+
+@dataclass(frozen=True, slots=True)
+class BatchTables:
+    """Weighted tables as arrays for scoring many positions at once.
+
+    Tiles are indexed by tile mask bit index, piece type EMPTY is an
+    empty tile.
+    """
+
+    # Tile index of each tile position
+    index: dict[Pos, int]
+    # Material of each piece type, shape (5,)
+    material: Any
+    # Signed positional value of each piece type on each tile, (5, tiles)
+    positional: Any
+    # +1 for black pieces, -1 for red pieces, 0 for empty, shape (5,)
+    signs: Any
+    # Tile indices red and black pawns can move to, padded with index
+    # of an always occupied extra tile, shape (2, tiles, 2). Kings
+    # move where either pawn can.
+    moves: Any
+    # Runaway cone of each pawn type on each tile as 0.0 or 1.0, so
+    # cones are checked with a float matrix product, (2, tiles, tiles)
+    runaway_cones: Any
+
+
+class Evaluator:
+    """Weighted feature static evaluation of checkers positions.
+
+    Every feature is scored in pawns, positive for black (MAX). Features
+    that only depend on a piece and its tile are combined into one
+    weighted table per board size, so scoring a piece is one lookup.
+    """
+
+    __slots__ = ("batch_tables", "tables", "weights")
+
+    def __init__(self, weights: EvaluationWeights | None = None) -> None:
+        """Initialize evaluator."""
+        self.weights = weights or EvaluationWeights()
+        self.tables: dict[tuple[int, int], WeightedTables] = {}
+        self.batch_tables: dict[tuple[int, int], BatchTables] = {}
+
+    def get_tables(self, size: tuple[int, int]) -> WeightedTables:
+        """Return weighted tables for board size."""
+        tables = self.tables.get(size)
+        if tables is None:
+            square = get_square_tables(size)
+            weights = self.weights
+            positional = tuple(
+                {
+                    position: weights.advancement
+                    * square.advancement[piece_type][position]
+                    + weights.back_rank
+                    * square.back_rank[piece_type][position]
+                    + weights.centre * centre
+                    for position, centre in square.centre.items()
+                }
+                for piece_type in range(4)
+            )
+            geometry = get_geometry(size)
+            tables = WeightedTables(
+                positional=positional,
+                moves=geometry.moves,
+                runaway_cones=square.runaway_cones,
+                bits=geometry.bits,
+            )
+            self.tables[size] = tables
+        return tables
+
+    def normalize(
+        self,
+        material: float,
+        total: float,
+        positional: float,
+    ) -> float:
+        """Return value in (-1, 1) from signed and total material and positional score.
+
+        Material counts more when there is less of it, so trading
+        pieces when ahead is good. Without positional score this is
+        material difference over total material plus one.
+        """
+        return (material + positional) / (total + abs(positional) + 1)
+
+    def evaluate(self, state: State) -> float:
+        """Return value of state from the point of view of MAX."""
+        win = state.check_for_win()
+        if win is not None:
+            return 0 if win == DRAW else win * 2 - 1
+        tables = self.get_tables(state.size)
+        weights = self.weights
+        pieces = state.pieces
+        bits = tables.bits
+
+        # Tile masks of red and black pieces
+        player_masks = [0, 0]
+        for position, piece_type in pieces.items():
+            player_masks[piece_type & 1] |= bits[position]
+
+        # Counts are integers and positional values summed with fsum,
+        # so value does not depend on order of pieces
+        counts = [0, 0, 0, 0]
+        positional_values: list[float] = []
+        mobility = runaways = 0
+        for position, piece_type in pieces.items():
+            sign = 1 if piece_type & 1 else -1
+            counts[piece_type] += 1
+            positional_values.append(
+                sign * tables.positional[piece_type][position],
+            )
+            for tile in tables.moves[piece_type][position]:
+                if tile not in pieces:
+                    mobility += sign
+            if (
+                piece_type < 2
+                and not tables.runaway_cones[piece_type][position]
+                & player_masks[piece_type ^ 1]
+            ):
+                runaways += sign
+        red_pawns, black_pawns, red_kings, black_kings = counts
+        material = weights.pawn * (black_pawns - red_pawns) + weights.king * (
+            black_kings - red_kings
+        )
+        total = weights.pawn * (black_pawns + red_pawns) + weights.king * (
+            black_kings + red_kings
+        )
+        positional = (
+            math.fsum(positional_values)
+            + weights.mobility * mobility
+            + weights.runaway * runaways
+        )
+        return self.normalize(material, total, positional)
+
+    def get_batch_tables(self, size: tuple[int, int]) -> BatchTables:
+        """Return weighted tables for board size as arrays.
+
+        Requires NumPy.
+        """
+        batch = self.batch_tables.get(size)
+        if batch is not None:
+            return batch
+        tables = self.get_tables(size)
+        positions = get_geometry(size).positions
+        tile_count = len(positions)
+        index = {position: tile for tile, position in enumerate(positions)}
+
+        weights = self.weights
+        signs = np.array([-1.0, 1.0, -1.0, 1.0, 0.0])
+        material = np.array(
+            [weights.pawn, weights.pawn, weights.king, weights.king, 0.0],
+        )
+        positional = np.zeros((EMPTY + 1, tile_count))
+        for piece_type in range(4):
+            for tile, position in enumerate(positions):
+                positional[piece_type, tile] = (
+                    signs[piece_type] * tables.positional[piece_type][position]
+                )
+        moves = np.full((2, tile_count, 2), tile_count, dtype=np.intp)
+        runaway_cones = np.zeros((2, tile_count, tile_count))
+        for piece_type in range(2):
+            for tile, position in enumerate(positions):
+                for slot, target in enumerate(
+                    tables.moves[piece_type][position],
+                ):
+                    moves[piece_type, tile, slot] = index[target]
+                cone = tables.runaway_cones[piece_type][position]
+                for bit in range(tile_count):
+                    runaway_cones[piece_type, tile, bit] = (cone >> bit) & 1
+        batch = BatchTables(
+            index=index,
+            material=material,
+            positional=positional,
+            signs=signs,
+            moves=moves,
+            runaway_cones=runaway_cones,
+        )
+        self.batch_tables[size] = batch
+        return batch
+
+    def evaluate_batch(self, states: Sequence[State]) -> list[float]:
+        """Return values of many states from the point of view of MAX.
+
+        Scores every position with array operations if NumPy is
+        installed, otherwise one at a time. States must all have the
+        same board size.
+        """
+        if not HAS_NUMPY or not states:
+            return [self.evaluate(state) for state in states]
+        size = states[0].size
+        if any(state.size != size for state in states):
+            raise ValueError("states must all have the same board size")
+        batch = self.get_batch_tables(size)
+        weights = self.weights
+        count = len(states)
+        tile_count = len(batch.index)
+
+        # Piece type on every tile of every position
+        rows: list[int] = []
+        tiles: list[int] = []
+        piece_types: list[int] = []
+        for row, state in enumerate(states):
+            rows.extend([row] * len(state.pieces))
+            tiles.extend(map(batch.index.__getitem__, state.pieces))
+            piece_types.extend(state.pieces.values())
+        codes = np.full((count, tile_count), EMPTY, dtype=np.intp)
+        codes[rows, tiles] = piece_types
+        signs = batch.signs[codes]
+        kings = codes // 2 == 1
+
+        material = (signs * batch.material[codes]).sum(axis=1)
+        total = batch.material[codes].sum(axis=1)
+        positional = batch.positional[codes, np.arange(tile_count)].sum(
+            axis=1,
+        )
+
+        # Extra always occupied tile is the padding of move tables
+        occupied = np.ones((count, tile_count + 1), dtype=bool)
+        occupied[:, :tile_count] = codes != EMPTY
+        mobility = np.zeros(count)
+        for piece_type in range(2):
+            free = (~occupied[:, batch.moves[piece_type]]).sum(axis=2)
+            movers = (codes == piece_type) | kings
+            mobility += (signs * free * movers).sum(axis=1)
+
+        runaways = np.zeros(count)
+        for piece_type in range(2):
+            enemies = (codes != EMPTY) & (codes % 2 != piece_type)
+            blocked = (
+                enemies.astype(np.float64) @ batch.runaway_cones[piece_type].T
+            )
+            runaways += batch.signs[piece_type] * (
+                (codes == piece_type) & (blocked == 0)
+            ).sum(axis=1)
+
+        positional += weights.mobility * mobility + weights.runaway * runaways
+        values = (material + positional) / (total + np.abs(positional) + 1)
+        results: list[float] = values.tolist()
+        for row, state in enumerate(states):
+            win = state.check_for_win()
+            if win is not None:
+                results[row] = 0 if win == DRAW else win * 2 - 1
+        return results
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -20,11 +20,13 @@ from libcomponent.component import (
 )
 
 from checkers.client import GameClient, read_advertisements
-from checkers.state import Action, Pos, State
+from checkers.state import DRAW, Action, Pos, State
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
 
+    from checkers.state import Rules
+
 if sys.version_info < (3, 11):
     from exceptiongroup import BaseExceptionGroup
 
@@ -88,7 +90,10 @@ class BaseRemoteState(Component, metaclass=ABCMeta):
         winner = self.state.check_for_win()
         if winner is not None:
             print("Terminal state, not performing turn")
-            value = ("Lost", "Won")[winner == self.playing_as]
+            if winner == DRAW:
+                value = "Draw"
+            else:
+                value = ("Lost", "Won")[winner == self.playing_as]
             print(f"{value} after {self.moves}")
             return
         await self.handle_perform_turn()
@@ -110,6 +115,13 @@ class BaseRemoteState(Component, metaclass=ABCMeta):
         assert self.has_initial
         pos, type_ = event.data
         self.pieces[pos] = type_
+        # States cache values computed from their pieces, so make a new one
+        self.state = State(
+            self.state.size,
+            dict(self.pieces),
+            self.state.turn,
+            rules=self.state.rules,
+        )
 
     async def handle_playing_as(self, event: Event[int]) -> None:
         """Handle playing as event."""
@@ -121,11 +133,11 @@ class BaseRemoteState(Component, metaclass=ABCMeta):
 
     async def handle_initial_config(
         self,
-        event: Event[tuple[Pos, int]],
+        event: Event[tuple[Pos, int, Rules]],
     ) -> None:
-        """Set up initial state and perform our turn if possible."""
-        board_size, turn = event.data
-        self.state = State(board_size, self.pieces, bool(turn))
+        """Set up initial state with server's rules."""
+        board_size, turn, rules = event.data
+        self.state = State(board_size, dict(self.pieces), bool(turn), rules)
         self.has_initial = True
 
     async def handle_game_over(self, event: Event[int]) -> None:
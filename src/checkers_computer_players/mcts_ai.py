@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+# AI that plays checkers.
+
+"""Monte Carlo Tree Search Checkers AI."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "MCTS AI"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import math
+import os
+import random
+import time
+import traceback
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, ClassVar, Final, TypeAlias
+
+import trio
+
+from checkers.state import DRAW, Action, Pos, Rules, State
+from checkers_computer_players.evaluation import Evaluator
+from checkers_computer_players.machine_client import (
+    RemoteState,
+    run_clients_in_local_servers_sync,
+)
+from checkers_computer_players.time_management import allocate_time
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from types import TracebackType
+
+    from libcomponent.component import Event
+    from typing_extensions import Self
+
+# UCT exploration constant, sqrt(2) suits rewards between 0 and 1
+EXPLORATION: Final = math.sqrt(2)
+# Random actions of each playout before the evaluator scores it
+ROLLOUT_PLIES: Final = 16
+# Playouts sent to a worker process in one task
+ROLLOUTS_PER_TASK: Final = 16
+# First child index of nodes that are not expanded
+NOT_EXPANDED: Final = -1
+# Tile indices of an action are packed into 16 bits each
+TILE_LIMIT: Final = 1 << 16
+
+# Position as plain data: pieces, turn and history
+Position: TypeAlias = tuple[dict[Pos, int], bool, tuple[int, ...]]
+
+
+def get_win_value(winner: int) -> float:
+    """Return value of game won by winner from the point of view of MAX."""
+    return 0.0 if winner == DRAW else winner * 2.0 - 1.0
+
+
+def play_random_actions(
+    state: State,
+    plies: int | None,
+    rng: random.Random,
+) -> int:
+    """Perform random actions on state in place with push.
+
+    Stops once the game ends or plies actions were performed, never
+    before the game ends if plies is None. Returns number of actions
+    performed.
+    """
+    played = 0
+    while state.check_for_win() is None and (plies is None or played < plies):
+        from_pos, to_pos, _captured = rng.choice(state.generate_action_list())
+        state.push(Action(from_pos, to_pos))
+        played += 1
+    return played
+
+
+def rollout(
+    state: State,
+    plies: int,
+    evaluator: Evaluator | None,
+    rng: random.Random,
+) -> float:
+    """Return value of playing random actions from state, for MAX.
+
+    Without an evaluator actions are played until the game ends,
+    otherwise for at most plies actions before evaluator scores the
+    position. State is restored before returning.
+    """
+    played = play_random_actions(
+        state,
+        None if evaluator is None else plies,
+        rng,
+    )
+    winner = state.check_for_win()
+    if winner is not None:
+        value = get_win_value(winner)
+    else:
+        assert evaluator is not None
+        value = evaluator.evaluate(state)
+    for _ in range(played):
+        state.pop()
+    return value
+
+
+def rollout_positions(
+    size: tuple[int, int],
+    rules: Rules,
+    positions: list[Position],
+    plies: int,
+    evaluator: Evaluator | None,
+    seed: int,
+) -> list[float]:
+    """Return rollout value of each position, run in worker processes.
+
+    Positions are all played out first, so evaluator can score them
+    together with Evaluator.evaluate_batch.
+    """
+    # No need for cryptographic secure random
+    rng = random.Random(seed)  # noqa: S311
+    states = [
+        State(size, pieces, turn, rules=rules, history=history)
+        for pieces, turn, history in positions
+    ]
+    for state in states:
+        play_random_actions(state, None if evaluator is None else plies, rng)
+    if evaluator is not None:
+        return evaluator.evaluate_batch(states)
+    values = []
+    for state in states:
+        winner = state.check_for_win()
+        assert winner is not None
+        values.append(get_win_value(winner))
+    return values
+
+
+def copy_state(state: State) -> State:
+    """Return copy of state that can be changed in place."""
+    return State(
+        state.size,
+        dict(state.pieces),
+        state.turn,
+        rules=state.rules,
+        history=state.history,
+    )
+
+
+class SearchTree:
+    """Monte Carlo search tree with nodes stored in flat arrays.
+
+    Node 0 is the root. Children of a node are added together when it
+    is expanded, so they are next to each other and a node only records
+    its first child and how many children it has. Each node stores the
+    action leading to it packed into one integer, its visit count and
+    the rewards of the player who performed that action. Actions are
+    packed as two 16 bit tile indices, so boards may have up to 65536
+    tiles.
+    """
+
+    __slots__ = (
+        "actions",
+        "child_counts",
+        "first_children",
+        "rewards",
+        "state",
+        "visits",
+    )
+
+    def __init__(self, state: State) -> None:
+        """Initialize tree with root state, which is copied.
+
+        Raises ValueError if board has too many tiles to pack actions.
+        """
+        width, height = state.size
+        if width * height > TILE_LIMIT:
+            raise ValueError(
+                f"Board with more than {TILE_LIMIT} tiles is not supported",
+            )
+        # Selection performs actions on this in place
+        self.state = copy_state(state)
+        self.actions = array("I", [0])
+        self.first_children = array("i", [NOT_EXPANDED])
+        self.child_counts = array("I", [0])
+        self.visits = array("I", [0])
+        self.rewards = array("d", [0.0])
+
+    def __len__(self) -> int:
+        """Return number of nodes."""
+        return len(self.visits)
+
+    def add_node(self, action_code: int, visits: int, rewards: float) -> int:
+        """Add node that is not expanded and return its index."""
+        self.actions.append(action_code)
+        self.first_children.append(NOT_EXPANDED)
+        self.child_counts.append(0)
+        self.visits.append(visits)
+        self.rewards.append(rewards)
+        return len(self.visits) - 1
+
+    def get_children(self, node: int) -> range:
+        """Return indices of children of node."""
+        first = self.first_children[node]
+        if first == NOT_EXPANDED:
+            return range(0)
+        return range(first, first + self.child_counts[node])
+
+    def get_action(self, node: int) -> Action:
+        """Return action leading to node."""
+        width = self.state.size[0]
+        from_tile, to_tile = divmod(self.actions[node], TILE_LIMIT)
+        return Action(
+            (from_tile % width, from_tile // width),
+            (to_tile % width, to_tile // width),
+        )
+
+    def expand(self, node: int) -> None:
+        """Add a child for every action of tree state, the state of node."""
+        width = self.state.size[0]
+        actions = self.state.generate_action_list()
+        self.first_children[node] = len(self)
+        self.child_counts[node] = len(actions)
+        for (from_x, from_y), (to_x, to_y), _captured in actions:
+            self.add_node(
+                (from_y * width + from_x) * TILE_LIMIT + to_y * width + to_x,
+                0,
+                0.0,
+            )
+
+    def select_child(self, node: int) -> int:
+        """Return child of node with highest upper confidence bound."""
+        visits = self.visits
+        rewards = self.rewards
+        log_visits = math.log(visits[node])
+        best = NOT_EXPANDED
+        best_score = -math.inf
+        for child in self.get_children(node):
+            child_visits = visits[child]
+            if not child_visits:
+                return child
+            score = rewards[child] / child_visits + EXPLORATION * math.sqrt(
+                log_visits / child_visits,
+            )
+            if score > best_score:
+                best = child
+                best_score = score
+        return best
+
+    def select(self) -> list[int]:
+        """Return path of nodes from root to a node to play out from.
+
+        Walks down children with the highest upper confidence bound,
+        expanding the leaf it reaches, until a node visited for the
+        first time or a terminal node. Actions are performed on tree
+        state, undo them with pop once it has been played out.
+
+        Visit counts are added on the way down, so until rewards are
+        added nodes count as lost. That makes selections made before
+        earlier ones are played out spread over the tree.
+        """
+        state = self.state
+        node = 0
+        path = [node]
+        self.visits[node] += 1
+        while state.check_for_win() is None:
+            if self.first_children[node] == NOT_EXPANDED:
+                self.expand(node)
+            node = self.select_child(node)
+            state.push(self.get_action(node))
+            path.append(node)
+            self.visits[node] += 1
+            if self.visits[node] == 1:
+                break
+        return path
+
+    def pop(self, path: list[int]) -> None:
+        """Undo actions performed on tree state by selecting path."""
+        for _ in range(len(path) - 1):
+            self.state.pop()
+
+    def backpropagate(self, path: list[int], value: float) -> None:
+        """Add playout value, from the point of view of MAX, along path."""
+        black_reward = (1 + value) / 2
+        # Player to move at root performed the first action
+        black_moved = self.state.turn
+        for node in path[1:]:
+            self.rewards[node] += (
+                black_reward if black_moved else 1 - black_reward
+            )
+            black_moved = not black_moved
+
+    def get_best_action(self) -> Action | None:
+        """Return most visited action of root, None if it has no children."""
+        children = self.get_children(0)
+        if not children:
+            return None
+        return self.get_action(max(children, key=self.visits.__getitem__))
+
+    def find(
+        self,
+        state: State,
+        max_plies: int = 2,
+        node: int = 0,
+    ) -> int | None:
+        """Return node of state within max_plies of node if it is in tree.
+
+        Compares Zobrist keys, performing actions on tree state.
+        """
+        if not max_plies:
+            return None
+        key = hash(state)
+        for child in self.get_children(node):
+            self.state.push(self.get_action(child))
+            try:
+                if hash(self.state) == key:
+                    return child
+                found = self.find(state, max_plies - 1, child)
+            finally:
+                self.state.pop()
+            if found is not None:
+                return found
+        return None
+
+    def get_subtree(self, node: int, state: State) -> SearchTree:
+        """Return new tree of node and its descendants, state of node as root.
+
+        Nodes are copied breadth first, so children stay together.
+        """
+        tree = SearchTree(state)
+        tree.visits[0] = self.visits[node]
+        queue = [(node, 0)]
+        for old, new in queue:
+            children = self.get_children(old)
+            if not children:
+                continue
+            tree.first_children[new] = len(tree)
+            tree.child_counts[new] = len(children)
+            for child in children:
+                queue.append(
+                    (
+                        child,
+                        tree.add_node(
+                            self.actions[child],
+                            self.visits[child],
+                            self.rewards[child],
+                        ),
+                    ),
+                )
+        return tree
+
+
+@dataclass(slots=True)
+class PlayoutStats:
+    """Counts of a Monte Carlo tree search."""
+
+    playouts: int = 0
+    # Nodes in tree after search
+    nodes: int = 0
+    # Nodes kept from search of previous move
+    reused: int = 0
+    elapsed_ns: int = 0
+
+    @property
+    def playouts_per_second(self) -> float:
+        """Playouts searched per second."""
+        if not self.elapsed_ns:
+            return 0.0
+        return self.playouts * 1e9 / self.elapsed_ns
+
+    def report(self) -> str:
+        """Return one line summary of search."""
+        return (
+            f"{self.playouts} playouts ({self.playouts_per_second:.0f}/s), "
+            f"{self.nodes} nodes, {self.reused} reused"
+        )
+
+
+class MonteCarloSearch:
+    """Monte Carlo tree search with upper confidence bounds (UCT).
+
+    Tree is kept between searches, so if the next position searched
+    is within two plies of the last root its subtree is reused. With
+    more than one worker, playouts are selected in batches and played
+    out in worker processes while the next batch is selected.
+    """
+
+    __slots__ = (
+        "evaluator",
+        "executor",
+        "rng",
+        "rollout_plies",
+        "tree",
+        "workers",
+    )
+
+    def __init__(
+        self,
+        workers: int = 1,
+        evaluator: Evaluator | None = None,
+        rollout_plies: int = ROLLOUT_PLIES,
+        seed: int | None = None,
+    ) -> None:
+        """Initialize search.
+
+        Playouts are scored by evaluator after rollout_plies random
+        actions. If evaluator is None, they are played to the end.
+        """
+        self.workers = workers
+        self.evaluator = evaluator
+        self.rollout_plies = rollout_plies
+        # No need for cryptographic secure random
+        self.rng = random.Random(seed)  # noqa: S311
+        self.tree: SearchTree | None = None
+        self.executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> Self:
+        """Return self."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Shut down worker processes."""
+        self.close()
+
+    def close(self) -> None:
+        """Shut down worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def set_root(self, state: State) -> int:
+        """Make state root of tree and return number of nodes reused."""
+        node = None if self.tree is None else self.tree.find(state)
+        if node is None:
+            self.tree = SearchTree(state)
+            return 0
+        assert self.tree is not None
+        self.tree = self.tree.get_subtree(node, state)
+        return len(self.tree)
+
+    def playout(self, tree: SearchTree) -> None:
+        """Select, expand, play out and backpropagate once."""
+        path = tree.select()
+        winner = tree.state.check_for_win()
+        if winner is None:
+            value = rollout(
+                tree.state,
+                self.rollout_plies,
+                self.evaluator,
+                self.rng,
+            )
+        else:
+            value = get_win_value(winner)
+        tree.pop(path)
+        tree.backpropagate(path, value)
+
+    def submit_batch(
+        self,
+        tree: SearchTree,
+    ) -> list[tuple[list[list[int]], Future[list[float]]]]:
+        """Select a batch of playouts and submit their rollouts to workers."""
+        assert self.executor is not None
+        state = tree.state
+        tasks = []
+        for _ in range(self.workers):
+            paths = []
+            positions: list[Position] = []
+            for _ in range(ROLLOUTS_PER_TASK):
+                path = tree.select()
+                winner = state.check_for_win()
+                if winner is None:
+                    paths.append(path)
+                    positions.append(
+                        (dict(state.pieces), state.turn, state.history),
+                    )
+                    tree.pop(path)
+                else:
+                    tree.pop(path)
+                    tree.backpropagate(path, get_win_value(winner))
+            if paths:
+                future = self.executor.submit(
+                    rollout_positions,
+                    state.size,
+                    state.rules,
+                    positions,
+                    self.rollout_plies,
+                    self.evaluator,
+                    self.rng.getrandbits(64),
+                )
+                tasks.append((paths, future))
+        return tasks
+
+    def search(
+        self,
+        state: State,
+        time_limit_ns: int,
+        stats: PlayoutStats | None = None,
+    ) -> Action | None:
+        """Return most visited action after searching until time limit.
+
+        At least one playout is made for every action of state, with
+        worker processes too, as selection tries every child of a node
+        before any child twice. Returns None if state has no actions.
+        """
+        start = time.perf_counter_ns()
+        deadline = start + time_limit_ns
+        if stats is None:
+            stats = PlayoutStats()
+        stats.reused = self.set_root(state)
+        tree = self.tree
+        assert tree is not None
+        playouts = tree.visits[0]
+
+        actions = len(tree.state.generate_action_list())
+        if actions > 1 and self.workers > 1:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(self.workers)
+            pending = self.submit_batch(tree)
+            while pending:
+                if (
+                    time.perf_counter_ns() < deadline
+                    # Unvisited children are selected first
+                    or tree.visits[0] - playouts < actions
+                ):
+                    # Select next batch while workers play out this one
+                    next_pending = self.submit_batch(tree)
+                else:
+                    next_pending = []
+                for paths, future in pending:
+                    for path, value in zip(
+                        paths,
+                        future.result(),
+                        strict=True,
+                    ):
+                        tree.backpropagate(path, value)
+                pending = next_pending
+        elif actions > 1:
+            while (
+                time.perf_counter_ns() < deadline
+                or tree.visits[0] - playouts < actions
+            ):
+                self.playout(tree)
+        elif actions and tree.first_children[0] == NOT_EXPANDED:
+            # Only one action, no need to search
+            tree.expand(0)
+
+        stats.playouts += tree.visits[0] - playouts
+        stats.nodes = len(tree)
+        stats.elapsed_ns += time.perf_counter_ns() - start
+        return tree.get_best_action()
+
+
+class MCTSPlayer(RemoteState):
+    """Monte Carlo Tree Search Player."""
+
+    __slots__ = ("clock_ns", "move_time_ns", "search")
+
+    # Worker processes playing out rollouts, 1 to play out in-process
+    WORKERS: ClassVar[int] = 1
+
+    def __init__(self) -> None:
+        """Initialize MCTS player."""
+        super().__init__()
+
+        self.search = MonteCarloSearch(self.WORKERS, Evaluator())
+        # Most thinking time for one move, used in middlegames
+        self.move_time_ns = int(5e9)
+        # Time left for rest of game, None if there is no game clock
+        self.clock_ns: int | None = None
+
+    async def perform_turn(self) -> Action:
+        """Perform turn."""
+        print("perform_turn")
+        stats = PlayoutStats()
+        budget = allocate_time(self.state, self.move_time_ns, self.clock_ns)
+        # Search in a thread so client keeps handling network events
+        action = await trio.to_thread.run_sync(
+            self.search.search,
+            self.state,
+            budget,
+            stats,
+        )
+        if self.clock_ns is not None:
+            self.clock_ns -= stats.elapsed_ns
+        if action is None:
+            raise ValueError("action is None")
+        print(stats.report())
+        return action
+
+    async def handle_game_over(self, event: Event[int]) -> None:
+        """Shut down worker processes and disconnect."""
+        self.search.close()
+        await super().handle_game_over(event)
+
+
+class ParallelMCTSPlayer(MCTSPlayer):
+    """MCTS Player that plays out rollouts with every CPU core."""
+
+    __slots__ = ()
+
+    WORKERS = os.cpu_count() or 1
+
+
+def run() -> None:
+    """Run ParallelMCTSPlayer clients in local server."""
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    try:
+        run_clients_in_local_servers_sync(ParallelMCTSPlayer)
+    except Exception:
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    run()
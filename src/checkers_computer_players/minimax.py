@@ -9,7 +9,6 @@ __author__ = "CoolCat467"
 __version__ = "0.0.0"
 
 import operator
-import random
 from abc import ABC, abstractmethod
 from enum import IntEnum, auto
 from math import inf as infinity
@@ -79,6 +78,20 @@ class Minimax(ABC, Generic[State, Action]):
     def result(cls, state: State, action: Action) -> State:
         """Return new game state after performing action on given state."""
 
+    @classmethod
+    def push(cls, state: State, action: Action) -> None:
+        """Perform action on given state in place.
+
+        Optional, used by searches that mutate one state instead of
+        creating a new state for every node.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def pop(cls, state: State) -> None:
+        """Undo last action performed on given state with push."""
+        raise NotImplementedError()
+
     @classmethod
     def probability(cls, action: Action) -> float:
         """Return probability that given chance node action will happen.
@@ -97,12 +110,7 @@ class Minimax(ABC, Generic[State, Action]):
         if cls.terminal(state):
             return MinimaxResult(cls.value(state), None)
         if depth is not None and depth <= 0:
-            # Choose a random action
-            # No need for cryptographic secure random
-            return MinimaxResult(
-                cls.value(state),
-                random.choice(tuple(cls.actions(state))),  # noqa: S311
-            )
+            return MinimaxResult(cls.value(state), None)
         next_down = None if depth is None else depth - 1
 
         current_player = cls.player(state)
@@ -147,12 +155,7 @@ class Minimax(ABC, Generic[State, Action]):
         if cls.terminal(state):
             return MinimaxResult(cls.value(state), None)
         if depth is not None and depth <= 0:
-            # Choose a random action
-            # No need for cryptographic secure random
-            return MinimaxResult(
-                cls.value(state),
-                random.choice(tuple(cls.actions(state))),  # noqa: S311
-            )
+            return MinimaxResult(cls.value(state), None)
         next_down = None if depth is None else depth - 1
 
         current_player = cls.player(state)
@@ -230,6 +233,59 @@ class Minimax(ABC, Generic[State, Action]):
             return MinimaxResult(value / successors, None)
         return MinimaxResult(value, best_action)
 
+    @classmethod
+    def alphabeta_in_place(
+        cls,
+        state: State,
+        depth: int | None = 5,
+        a: int | float = -infinity,
+        b: int | float = infinity,
+    ) -> MinimaxResult[Action]:
+        """Return alphabeta pruning result best action for given current state.
+
+        Walks the game tree by mutating state with push and pop instead
+        of creating a new state for every node. State is restored before
+        returning. Does not support chance nodes.
+        """
+        if cls.terminal(state):
+            return MinimaxResult(cls.value(state), None)
+        if depth is not None and depth <= 0:
+            return MinimaxResult(cls.value(state), None)
+        # Actions must be collected before state is mutated
+        actions = tuple(cls.actions(state))
+        next_down = None if depth is None else depth - 1
+
+        current_player = cls.player(state)
+        value: int | float
+        if current_player == Player.MAX:
+            value = -infinity
+        elif current_player == Player.MIN:
+            value = infinity
+        else:
+            raise ValueError(f"Unexpected player type {current_player!r}")
+
+        best_action: Action | None = None
+        for action in actions:
+            cls.push(state, action)
+            try:
+                result = cls.alphabeta_in_place(state, next_down, a, b)
+            finally:
+                cls.pop(state)
+
+            if current_player == Player.MAX:
+                if result.value > value:
+                    value = result.value
+                    best_action = action
+                a = max(a, value)
+            else:
+                if result.value < value:
+                    value = result.value
+                    best_action = action
+                b = min(b, value)
+            if a >= b:
+                break  # cutoff
+        return MinimaxResult(value, best_action)
+
 
 if __name__ == "__main__":
     print(f"{__title__}\nProgrammed by {__author__}.\n")
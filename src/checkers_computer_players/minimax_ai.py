@@ -12,15 +12,17 @@ __author__ = "CoolCat467"
 __version__ = "0.0.0"
 
 import math
-import random
+import threading
 import time
 import traceback
-from collections import Counter
-from enum import IntEnum, auto
+from dataclasses import dataclass, field
 from math import inf as infinity
-from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+from typing import TYPE_CHECKING, ClassVar, TypeVar
 
-from checkers.state import Action, State
+import trio
+
+from checkers.state import Action, Pos, State
+from checkers_computer_players.evaluation import Evaluator
 from checkers_computer_players.machine_client import (
     RemoteState,
     run_clients_in_local_servers_sync,
@@ -30,9 +32,27 @@ from checkers_computer_players.minimax import (
     MinimaxResult,
     Player,
 )
+from checkers_computer_players.move_ordering import MoveOrdering
+from checkers_computer_players.opening_book import DEFAULT_BOOK, OpeningBook
+from checkers_computer_players.tablebase import (
+    DEFAULT_DIRECTORY,
+    Outcome,
+    Tablebase,
+)
+from checkers_computer_players.time_management import (
+    SearchTimeoutError,
+    allocate_time,
+)
+from checkers_computer_players.transposition_table import (
+    TranspositionFlag,
+    TranspositionTable,
+)
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
+    from pathlib import Path
+
+    from libcomponent.component import Event
 
 
 T = TypeVar("T")
@@ -41,13 +61,71 @@ T = TypeVar("T")
 # 0 = False = Person  = MIN = 0, 2
 # 1 = True  = AI (Us) = MAX = 1, 3
 
+# Search checks the clock every DEADLINE_POLL_MASK + 1 nodes
+DEADLINE_POLL_MASK = 0x3FF
+
+
+@dataclass(slots=True)
+class SearchStats:
+    """Node counts of a search, for measuring pruning."""
+
+    # Nodes visited, including leaves and table hits
+    nodes: int = 0
+    # Nodes whose children were searched
+    expanded: int = 0
+    # Expanded nodes where a child caused a beta cutoff
+    cutoffs: int = 0
+    # Nodes settled by a transposition table entry
+    table_hits: int = 0
+    # Nodes visited by quiescence search, included in nodes
+    quiescence_nodes: int = 0
+    # Searches repeated with a wider window
+    researches: int = 0
+    # Nodes settled by an endgame tablebase, included in nodes
+    tablebase_hits: int = 0
+    # Nodes scored as draws for repeating a position, included in nodes
+    repetitions: int = 0
+    # Deepest iterative deepening depth that completed
+    depth: int = 0
+
+    @property
+    def cutoff_rate(self) -> float:
+        """Fraction of expanded nodes that were cut off."""
+        if not self.expanded:
+            return 0.0
+        return self.cutoffs / self.expanded
+
+    def report(self) -> str:
+        """Return one line summary of search."""
+        return (
+            f"depth {self.depth}, "
+            f"{self.nodes} nodes ({self.quiescence_nodes} quiescence), "
+            f"{self.expanded} expanded, "
+            f"{self.cutoffs} cutoffs ({self.cutoff_rate:.1%}), "
+            f"{self.table_hits} table hits, {self.researches} researches, "
+            f"{self.tablebase_hits} tablebase hits, "
+            f"{self.repetitions} repetitions"
+        )
 
-class TranspositionFlag(IntEnum):
-    """Flag enum for transposition table."""
 
-    LOWERBOUND = 0
-    EXACT = auto()
-    UPPERBOUND = auto()
+@dataclass(slots=True)
+class SearchContext:
+    """Everything a search carries from node to node."""
+
+    table: TranspositionTable[Action] = field(
+        default_factory=TranspositionTable,
+    )
+    stats: SearchStats = field(default_factory=SearchStats)
+    ordering: MoveOrdering[Action] = field(default_factory=MoveOrdering)
+    # perf_counter_ns time search must stop at, None for no limit
+    deadline_ns: int | None = None
+
+    def stop(self) -> None:
+        """Make search stop at its next deadline check.
+
+        Safe to call from another thread than the one searching.
+        """
+        self.deadline_ns = 0
 
 
 class MinimaxWithID(Minimax[State, Action]):
@@ -55,53 +133,74 @@ class MinimaxWithID(Minimax[State, Action]):
 
     __slots__ = ()
 
-    # Simple Transposition Table:
-    # key -> (stored_depth, value, action, flag)
-    # flag: TranspositionFlag: EXACT, LOWERBOUND, UPPERBOUND
-    TRANSPOSITION_TABLE: ClassVar[
-        dict[int, tuple[int, MinimaxResult[Any], TranspositionFlag]]
-    ] = {}
+    # Search captures past depth limit until position is quiet
+    USE_QUIESCENCE: ClassVar[bool] = True
+    # Principal variation search, search actions after the first with a
+    # null window and only search again if one turns out better
+    USE_PVS: ClassVar[bool] = False
+    # Width of null windows, smaller than any difference in value
+    NULL_WINDOW: ClassVar[float] = 1e-9
+    # Search each iterative deepening depth with a window around value
+    # of previous depth first, widening it if value falls outside
+    USE_ASPIRATION: ClassVar[bool] = False
+    # Distance from previous value to each side of first window
+    ASPIRATION_WINDOW: ClassVar[float] = 0.05
 
     @classmethod
     def _transposition_table_lookup(
         cls,
+        table: TranspositionTable[Action],
         state_hash: int,
         depth: int,
         alpha: float,
         beta: float,
-    ) -> MinimaxResult[Action] | None:
-        """Lookup in transposition_table.  Return (value, action) or None."""
-        entry = cls.TRANSPOSITION_TABLE.get(state_hash)
-        if entry is None:
-            return None
+    ) -> tuple[MinimaxResult[Action] | None, float, float, Action | None]:
+        """Lookup state in transposition table.
 
-        stored_depth, result, flag = entry
-        # only use if stored depth is deep enough
-        if stored_depth >= depth and (
-            (flag == TranspositionFlag.EXACT)
-            or (flag == TranspositionFlag.LOWERBOUND and result.value > alpha)
-            or (flag == TranspositionFlag.UPPERBOUND and result.value < beta)
-        ):
-            return result
-        return None
+        Return (result, alpha, beta, best action). result is not None if
+        stored entry settles the value of this node. Otherwise alpha
+        and beta are narrowed by stored bounds that are deep enough.
+        Best action is the stored best action to try first, if any.
+        """
+        entry = table.get(state_hash)
+        if entry is None:
+            return None, alpha, beta, None
+
+        stored_depth, value, action, flag = entry
+        # only use value if stored depth is deep enough
+        if stored_depth >= depth:
+            if flag == TranspositionFlag.EXACT:
+                return MinimaxResult(value, action), alpha, beta, action
+            if flag == TranspositionFlag.LOWERBOUND:
+                alpha = max(alpha, value)
+            else:
+                beta = min(beta, value)
+            if alpha >= beta:
+                return MinimaxResult(value, action), alpha, beta, action
+        return None, alpha, beta, action
 
     @classmethod
     def _transposition_table_store(
         cls,
+        table: TranspositionTable[Action],
         state_hash: int,
         depth: int,
         result: MinimaxResult[Action],
         alpha: float,
         beta: float,
     ) -> None:
-        """Store in transposition_table with proper flag."""
+        """Store in transposition_table with proper flag.
+
+        alpha and beta must be the window the node was searched with,
+        before it was narrowed by any children.
+        """
         if result.value <= alpha:
             flag = TranspositionFlag.UPPERBOUND
         elif result.value >= beta:
             flag = TranspositionFlag.LOWERBOUND
         else:
             flag = TranspositionFlag.EXACT
-        cls.TRANSPOSITION_TABLE[state_hash] = (depth, result, flag)
+        table.store(state_hash, depth, result.value, result.action, flag)
 
     @classmethod
     def hash_state(cls, state: State) -> int:
@@ -111,92 +210,309 @@ class MinimaxWithID(Minimax[State, Action]):
         return hash(state)
 
     @classmethod
-    def alphabeta_transposition_table(
+    def action_captures(cls, state: State) -> list[tuple[Action, int]]:
+        """Return actions of current player with number of pieces captured."""
+        return [
+            (Action(from_pos, to_pos), captured.bit_count())
+            for from_pos, to_pos, captured in state.generate_action_list()
+        ]
+
+    @classmethod
+    def has_capture(cls, state: State) -> bool:
+        """Return if current player can capture any piece."""
+        return state.has_jump(state.get_turn())
+
+    @classmethod
+    def is_repetition(cls, state: State) -> bool:
+        """Return if state repeats an earlier position and rules allow draws.
+
+        The player who repeated could have played the line that led
+        back here differently, so a repetition is scored as a draw
+        without waiting for the position to occur as often as the rules
+        require.
+        """
+        return bool(state.rules.repetition_limit) and state.is_repetition()
+
+    @classmethod
+    def probe(cls, state: State) -> int | float | None:
+        """Return exact value of state if known without searching.
+
+        Value is from the point of view of the player to move.
+        """
+        return None
+
+    @staticmethod
+    def _visit(context: SearchContext) -> None:
+        """Count a node and raise SearchTimeoutError if deadline passed."""
+        stats = context.stats
+        stats.nodes += 1
+        if (
+            context.deadline_ns is not None
+            and not stats.nodes & DEADLINE_POLL_MASK
+            and time.perf_counter_ns() >= context.deadline_ns
+        ):
+            raise SearchTimeoutError("search deadline passed")
+
+    @classmethod
+    def quiescence(
         cls,
         state: State,
-        depth: int = 5,
-        a: int | float = -infinity,
-        b: int | float = infinity,
+        a: int | float,
+        b: int | float,
+        context: SearchContext,
+        ply: int,
+    ) -> int | float:
+        """Return value of state once capture sequences are played out.
+
+        Only captures are searched, until the player to move can not
+        capture anything. The player to move may stand pat on the
+        static value unless every action they have is a capture.
+        Value is from the point of view of the player to move.
+        """
+        cls._visit(context)
+        context.stats.quiescence_nodes += 1
+        color = 1 if cls.player(state) == Player.MAX else -1
+        static = color * cls.value(state)
+        if cls.terminal(state) or not cls.has_capture(state):
+            return static
+
+        actions = cls.action_captures(state)
+        captures = [item for item in actions if item[1]]
+        value: int | float = -infinity
+        if len(captures) < len(actions):
+            # Capturing is optional, so can stand pat
+            value = static
+            if value >= b:
+                return value
+            a = max(a, value)
+
+        for action, _captures in context.ordering.order(captures, ply):
+            cls.push(state, action)
+            try:
+                score = -cls.quiescence(state, -b, -a, context, ply + 1)
+            finally:
+                cls.pop(state)
+            value = max(value, score)
+            a = max(a, value)
+            if a >= b:
+                break
+        return value
+
+    @classmethod
+    def negamax(
+        cls,
+        state: State,
+        depth: int,
+        a: int | float,
+        b: int | float,
+        context: SearchContext,
+        ply: int = 0,
     ) -> MinimaxResult[Action]:
-        """AlphaBeta with transposition table."""
-        if cls.terminal(state):
-            return MinimaxResult(cls.value(state), None)
+        """Return negamax alphabeta result with transposition table.
+
+        Values are from the point of view of the player to move. Walks
+        the game tree in place with push and pop, state is restored
+        before returning. ply is the distance from the search root.
+
+        Raises SearchTimeoutError if context deadline passes.
+        """
+        if ply:
+            if cls.is_repetition(state):
+                cls._visit(context)
+                context.stats.repetitions += 1
+                return MinimaxResult(0, None)
+            # Root is never probed, it needs an action
+            exact = cls.probe(state)
+            if exact is not None:
+                cls._visit(context)
+                context.stats.tablebase_hits += 1
+                return MinimaxResult(exact, None)
         if depth <= 0:
-            # Choose a random action
-            # No need for cryptographic secure random
-            return MinimaxResult(
-                cls.value(state),
-                random.choice(tuple(cls.actions(state))),  # noqa: S311
-            )
-        next_down = depth - 1
+            if cls.USE_QUIESCENCE:
+                return MinimaxResult(
+                    cls.quiescence(state, a, b, context, ply),
+                    None,
+                )
+            cls._visit(context)
+            color = 1 if cls.player(state) == Player.MAX else -1
+            return MinimaxResult(color * cls.value(state), None)
+        cls._visit(context)
+        stats = context.stats
+        color = 1 if cls.player(state) == Player.MAX else -1
+        if cls.terminal(state):
+            return MinimaxResult(color * cls.value(state), None)
 
         state_h = cls.hash_state(state)
-        # 1) Try transposition_table lookup
-        transposition_table_hit = cls._transposition_table_lookup(
+        # Bounds are classified against window before table narrows it
+        alpha_original = a
+        hit, a, b, table_action = cls._transposition_table_lookup(
+            context.table,
             state_h,
             depth,
             a,
             b,
         )
-        if transposition_table_hit is not None:
-            return transposition_table_hit
-        next_down = None if depth is None else depth - 1
-
-        current_player = cls.player(state)
-        value: int | float
+        if hit is not None:
+            stats.table_hits += 1
+            return hit
+
+        # Actions must be collected before state is mutated
+        actions = context.ordering.order(
+            cls.action_captures(state),
+            ply,
+            table_action,
+        )
 
+        stats.expanded += 1
+        value: int | float = -infinity
         best_action: Action | None = None
+        null_window = cls.USE_PVS and depth > 1
+        for index, (action, captures) in enumerate(actions):
+            cls.push(state, action)
+            try:
+                if null_window and index:
+                    # Prove action is no better than best so far
+                    score = -cls.negamax(
+                        state,
+                        depth - 1,
+                        -a - cls.NULL_WINDOW,
+                        -a,
+                        context,
+                        ply + 1,
+                    ).value
+                    if a < score < b:
+                        # It is better, find out by how much
+                        stats.researches += 1
+                        score = -cls.negamax(
+                            state,
+                            depth - 1,
+                            -b,
+                            -a,
+                            context,
+                            ply + 1,
+                        ).value
+                else:
+                    score = -cls.negamax(
+                        state,
+                        depth - 1,
+                        -b,
+                        -a,
+                        context,
+                        ply + 1,
+                    ).value
+            finally:
+                cls.pop(state)
+            if score > value:
+                value = score
+                best_action = action
+            a = max(a, value)
+            if a >= b:
+                stats.cutoffs += 1
+                context.ordering.record_cutoff(action, captures, ply, depth)
+                break
 
-        if current_player == Player.MAX:
-            value = -infinity
-            actions: list[tuple[Action, State]] = [
-                (action, cls.result(state, action))
-                for action in cls.actions(state)
-            ]
-
-            actions.sort(key=lambda act: cls.value(act[1]), reverse=True)
-            for action, next_state in actions:
-                child = cls.alphabeta_transposition_table(
-                    next_state,
-                    next_down,
-                    a,
-                    b,
-                )
-                if child.value > value:
-                    value = child.value
-                    best_action = action
-                a = max(a, value)
-                if a >= b:
-                    break
+        result = MinimaxResult(value, best_action)
+        cls._transposition_table_store(
+            context.table,
+            state_h,
+            depth,
+            result,
+            alpha_original,
+            b,
+        )
+        return result
 
-        elif current_player == Player.MIN:
-            value = infinity
-            actions = [
-                (action, cls.result(state, action))
-                for action in cls.actions(state)
-            ]
-
-            actions.sort(key=lambda act: cls.value(act[1]))
-            for action, next_state in actions:
-                child = cls.alphabeta_transposition_table(
-                    next_state,
-                    next_down,
-                    a,
-                    b,
-                )
-                if child.value < value:
-                    value = child.value
-                    best_action = action
-                b = min(b, value)
-                if b <= a:
+    @classmethod
+    def get_principal_variation(
+        cls,
+        state: State,
+        table: TranspositionTable[Action],
+        max_length: int = 20,
+    ) -> list[Action]:
+        """Return best actions stored in table, starting from state.
+
+        State is restored before returning.
+        """
+        variation: list[Action] = []
+        try:
+            while len(variation) < max_length and not cls.terminal(state):
+                entry = table.get(cls.hash_state(state))
+                if entry is None or entry.action is None:
                     break
-        else:
-            raise NotImplementedError(f"{current_player = }")
+                # Entry may be from a colliding position
+                if entry.action not in set(cls.actions(state)):
+                    break
+                variation.append(entry.action)
+                cls.push(state, entry.action)
+        finally:
+            for _ in variation:
+                cls.pop(state)
+        return variation
 
-        # 2) Store in transposition_table
-        result = MinimaxResult(value, best_action)
-        cls._transposition_table_store(state_h, depth, result, a, b)
-        return result
+    @classmethod
+    def alphabeta_transposition_table(
+        cls,
+        state: State,
+        depth: int = 5,
+        a: int | float = -infinity,
+        b: int | float = infinity,
+        table: TranspositionTable[Action] | None = None,
+        stats: SearchStats | None = None,
+    ) -> MinimaxResult[Action]:
+        """AlphaBeta with transposition table.
+
+        Value is from the point of view of MAX like alphabeta.
+        If table is None, a new table is used for this search only.
+        Node counts are added to stats if given.
+        """
+        context = SearchContext()
+        if table is not None:
+            context.table = table
+        if stats is not None:
+            context.stats = stats
+        return cls.search_root(state, depth, a, b, context)
+
+    @classmethod
+    def aspiration_search(
+        cls,
+        state: State,
+        depth: int,
+        guess: int | float,
+        context: SearchContext,
+    ) -> MinimaxResult[Action]:
+        """Return search_root result using a window around guess.
+
+        Window is widened on the side the value fell outside of and
+        searched again until value is inside it.
+        """
+        delta = cls.ASPIRATION_WINDOW
+        a = guess - delta
+        b = guess + delta
+        while True:
+            result = cls.search_root(state, depth, a, b, context)
+            if result.value <= a and a > cls.LOWEST:
+                a = max(cls.LOWEST, result.value - delta)
+            elif result.value >= b and b < cls.HIGHEST:
+                b = min(cls.HIGHEST, result.value + delta)
+            else:
+                return result
+            context.stats.researches += 1
+            delta *= 2
+
+    @classmethod
+    def search_root(
+        cls,
+        state: State,
+        depth: int,
+        a: int | float,
+        b: int | float,
+        context: SearchContext,
+    ) -> MinimaxResult[Action]:
+        """Return negamax result with value from the point of view of MAX."""
+        if cls.player(state) == Player.MAX:
+            return cls.negamax(state, depth, a, b, context)
+        value, action = cls.negamax(state, depth, -b, -a, context)
+        return MinimaxResult(-value, action)
 
     @classmethod
     def iterative_deepening(
@@ -205,43 +521,98 @@ class MinimaxWithID(Minimax[State, Action]):
         start_depth: int = 5,
         max_depth: int = 7,
         time_limit_ns: int | float | None = None,
+        table: TranspositionTable[Action] | None = None,
+        stats: SearchStats | None = None,
+        ordering: MoveOrdering[Action] | None = None,
     ) -> MinimaxResult[Action]:
         """Run alpha-beta with increasing depth up to max_depth.
 
-        If time_limit_ns is None, do all depths. Otherwise stop early.
+        If time_limit_ns is None, do all depths. Otherwise time limit
+        is checked inside the search, once it passes the depth being
+        searched is abandoned and the result of the last completed depth
+        is returned. If not even the first depth completes, the first
+        root action in search order is returned. No new depth is started
+        once half the time limit is used, as it would most likely not
+        finish.
+
+        Entries in table are kept between depths. If table is None, a
+        new table is used for this search only. Node counts of every
+        depth and deepest completed depth are added to stats if given.
+        Killer actions of ordering are forgotten and its history scores
+        aged before searching. If ordering is None, a new one is used
+        for this search only.
         """
-        best_result: MinimaxResult[Action] = MinimaxResult(0, None)
+        context = SearchContext()
+        if table is not None:
+            table.new_search()
+            context.table = table
+        if stats is not None:
+            context.stats = stats
+        if ordering is not None:
+            ordering.new_search()
+            context.ordering = ordering
+        best_result: MinimaxResult[Action] | None = None
         start_t = time.perf_counter_ns()
+        if time_limit_ns is not None:
+            context.deadline_ns = start_t + int(time_limit_ns)
 
         for depth in range(start_depth, max_depth + 1):
-            # clear or keep transposition_table between depths? often you keep it
-            # cls.TRANSPOSITION_TABLE.clear()
-
-            result = cls.alphabeta_transposition_table(
-                state,
-                depth,
-            )
+            try:
+                # Killer actions and history are kept between depths
+                if cls.USE_ASPIRATION and best_result is not None:
+                    result = cls.aspiration_search(
+                        state,
+                        depth,
+                        best_result.value,
+                        context,
+                    )
+                else:
+                    result = cls.search_root(
+                        state,
+                        depth,
+                        -infinity,
+                        infinity,
+                        context,
+                    )
+            except SearchTimeoutError:
+                break
             best_result = result
+            context.stats.depth = depth
 
             if abs(result.value) == cls.HIGHEST:
-                print(f"reached terminal state stop {depth=}")
+                # Reached terminal state, deeper search will not change it
                 break
-
-            # optional time check
-            if (
-                time_limit_ns
-                and (time.perf_counter_ns() - start_t) > time_limit_ns
-            ):
-                print(
-                    f"break from time expired {depth=} ({(time.perf_counter_ns() - start_t) / 1e9} seconds elaped)",
-                )
+            if time_limit_ns is None:
+                continue
+            elapsed = time.perf_counter_ns() - start_t
+            if elapsed * 2 > time_limit_ns:
                 break
-            print(
-                f"{depth=} ({(time.perf_counter_ns() - start_t) / 1e9} seconds elaped)",
-            )
 
+        if best_result is None:
+            return cls.first_ordered_action(state, context)
         return best_result
 
+    @classmethod
+    def first_ordered_action(
+        cls,
+        state: State,
+        context: SearchContext,
+    ) -> MinimaxResult[Action]:
+        """Return first root action search would try, with static value.
+
+        Action is None if there are no actions.
+        """
+        entry = context.table.get(cls.hash_state(state))
+        table_action = None if entry is None else entry.action
+        actions = context.ordering.order(
+            cls.action_captures(state),
+            0,
+            table_action,
+        )
+        if not actions:
+            return MinimaxResult(cls.value(state), None)
+        return MinimaxResult(cls.value(state), actions[0][0])
+
 
 # Minimax[State, Action]
 class CheckersMinimax(MinimaxWithID):
@@ -249,30 +620,42 @@ class CheckersMinimax(MinimaxWithID):
 
     __slots__ = ()
 
+    # Aspiration windows save most nodes in iterative deepening,
+    # set USE_PVS in a subclass for principal variation search
+    USE_ASPIRATION = True
+
+    # Static evaluation, replace in a subclass to change features
+    # or their weights
+    EVALUATOR: ClassVar[Evaluator] = Evaluator()
+    # Endgame tablebases probed by search, None to not probe
+    TABLEBASE: ClassVar[Tablebase | None] = None
+    # Tablebase win value is lowered this much per ply it takes,
+    # so shorter wins and longer losses are preferred
+    TABLEBASE_PLY_PENALTY = 1e-4
+
     @classmethod
     def hash_state(cls, state: State) -> int:
         """Return state hash value."""
-        # For small games you might do: return hash(state)
-        # For larger, use Zobrist or custom.
-        return hash((state.size, tuple(state.pieces.items()), state.turn))
+        # State hash is it's incrementally updated Zobrist key
+        return hash(state)
 
-    @staticmethod
-    def value(state: State) -> int | float:
+    @classmethod
+    def value(cls, state: State) -> int | float:
         """Return value of given game state."""
-        # Return winner if possible
-        win = state.check_for_win()
-        # If no winner, we have to predict the value
-        if win is None:
-            # We'll estimate the value by the pieces in play
-            counts = Counter(state.pieces.values())
-            # Score is pawns plus 3 times kings
-            min_ = counts[0] + 3 * counts[2]
-            max_ = counts[1] + 3 * counts[3]
-            # More max will make score higher,
-            # more min will make score lower
-            # Plus one in divisor makes so never / 0
-            return (max_ - min_) / (max_ + min_ + 1)
-        return win * 2 - 1
+        return cls.EVALUATOR.evaluate(state)
+
+    @classmethod
+    def probe(cls, state: State) -> int | float | None:
+        """Return exact value of state from tablebases if it is in one."""
+        if cls.TABLEBASE is None:
+            return None
+        result = cls.TABLEBASE.probe(state)
+        if result is None:
+            return None
+        if result.outcome == Outcome.DRAW:
+            return 0
+        value = cls.HIGHEST - cls.TABLEBASE_PLY_PENALTY * result.distance
+        return value if result.outcome == Outcome.WIN else -value
 
     @staticmethod
     def terminal(state: State) -> bool:
@@ -294,6 +677,16 @@ class CheckersMinimax(MinimaxWithID):
         """Return new state after performing given action on given current state."""
         return state.perform_action(action)
 
+    @staticmethod
+    def push(state: State, action: Action) -> None:
+        """Perform given action on given state in place."""
+        state.push(action)
+
+    @staticmethod
+    def pop(state: State) -> None:
+        """Undo last action performed on given state with push."""
+        state.pop()
+
     @classmethod
     def adaptive_depth_minimax(
         cls,
@@ -316,10 +709,133 @@ class CheckersMinimax(MinimaxWithID):
         return cls.minimax(state, final_depth)
 
 
+class Ponder:
+    """Search position after predicted opponent action in a thread.
+
+    Runs while opponent thinks. If opponent makes the predicted
+    action, search is given a deadline and its result used, otherwise
+    it is stopped.
+    """
+
+    __slots__ = ("context", "key", "minimax", "predicted", "result", "thread")
+
+    def __init__(
+        self,
+        minimax: type[MinimaxWithID],
+        state: State,
+        predicted: Action,
+        table: TranspositionTable[Action],
+    ) -> None:
+        """Initialize ponder of state after predicted action."""
+        self.minimax = minimax
+        self.predicted = predicted
+        # Thread gets its own state, it is mutated while searching
+        position = state.perform_action(predicted)
+        self.key = minimax.hash_state(position)
+        self.context = SearchContext(table)
+        self.result: MinimaxResult[Action] | None = None
+        self.thread = threading.Thread(
+            target=self.run,
+            args=(position,),
+            name="ponder",
+            daemon=True,
+        )
+
+    def run(self, state: State, max_depth: int = 20) -> None:
+        """Search state with iterative deepening until stopped."""
+        for depth in range(1, max_depth + 1):
+            try:
+                result = self.minimax.search_root(
+                    state,
+                    depth,
+                    -infinity,
+                    infinity,
+                    self.context,
+                )
+            except SearchTimeoutError:
+                return
+            self.result = result
+            self.context.stats.depth = depth
+            if abs(result.value) == self.minimax.HIGHEST:
+                return
+
+    def start(self) -> None:
+        """Start searching in background thread."""
+        self.thread.start()
+
+    def is_hit(self, state: State) -> bool:
+        """Return if state is position being pondered."""
+        return self.minimax.hash_state(state) == self.key
+
+    def finish(self, time_limit_ns: int) -> MinimaxResult[Action] | None:
+        """Let search continue for time limit, then return its result.
+
+        Blocks until search thread stops. Result is None if not even
+        the first depth finished.
+        """
+        self.context.deadline_ns = time.perf_counter_ns() + time_limit_ns
+        self.thread.join()
+        return self.result
+
+    def stop(self) -> None:
+        """Stop search, blocks until search thread stops."""
+        self.context.stop()
+        self.thread.join()
+
+
 class MinimaxPlayer(RemoteState):
     """Minimax Player."""
 
-    __slots__ = ()
+    __slots__ = (
+        "book_hits",
+        "clock_ns",
+        "move_ordering",
+        "move_time_ns",
+        "ponder",
+        "ponder_hits",
+        "pondering",
+        "transposition_table",
+    )
+
+    # Opening book probed before searching, None to always search
+    OPENING_BOOK: ClassVar[OpeningBook | None] = None
+
+    def __init__(self) -> None:
+        """Initialize minimax player."""
+        super().__init__()
+
+        # Owned by this player so games in one process do not share it
+        self.transposition_table: TranspositionTable[Action] = (
+            TranspositionTable()
+        )
+        # History scores are kept between moves, aging each search
+        self.move_ordering: MoveOrdering[Action] = MoveOrdering()
+        # Most thinking time for one move, used in middlegames
+        self.move_time_ns = int(5e9)
+        # Time left for rest of game, None if there is no game clock
+        self.clock_ns: int | None = None
+        # Search on opponent's time
+        self.pondering = True
+        self.ponder: Ponder | None = None
+        self.ponder_hits = 0
+        self.book_hits = 0
+
+    def search(
+        self,
+        state: State,
+        time_limit_ns: int,
+        stats: SearchStats,
+    ) -> MinimaxResult[Action]:
+        """Return best action for state, run in a worker thread."""
+        return CheckersMinimax.iterative_deepening(
+            state,
+            4,
+            20,
+            time_limit_ns,
+            self.transposition_table,
+            stats,
+            self.move_ordering,
+        )
 
     async def perform_turn(self) -> Action:
         """Perform turn."""
@@ -329,21 +845,137 @@ class MinimaxPlayer(RemoteState):
         ##)
         ##value, action = CheckersMinimax.minimax(self.state, 4)
         ##value, action = CheckersMinimax.alphabeta(self.state, 4)
-        value, action = CheckersMinimax.iterative_deepening(
-            self.state,
-            4,
-            20,
-            int(5 * 1e9),
+        stats = SearchStats()
+        budget = allocate_time(self.state, self.move_time_ns, self.clock_ns)
+        # Search mutates state it is given, so give it a copy of ours
+        state = State(
+            self.state.size,
+            dict(self.state.pieces),
+            self.state.turn,
+            rules=self.state.rules,
+            history=self.state.history,
         )
+        start = time.perf_counter_ns()
+        ponder = await self.finish_pondering(state)
+        if self.OPENING_BOOK is not None:
+            entry = self.OPENING_BOOK.probe(state)
+            if entry is not None:
+                if ponder is not None:
+                    await trio.to_thread.run_sync(ponder.stop)
+                self.book_hits += 1
+                if self.clock_ns is not None:
+                    self.clock_ns -= time.perf_counter_ns() - start
+                print(f"book {entry.value = } {entry.depth = }")
+                return entry.action
+        result = None
+        if ponder is not None:
+            stats = ponder.context.stats
+            result = await trio.to_thread.run_sync(ponder.finish, budget)
+        if result is not None:
+            value, action = result
+        else:
+            # Search in a thread so client keeps handling network events
+            value, action = await trio.to_thread.run_sync(
+                self.search,
+                state,
+                budget,
+                stats,
+            )
+        if self.clock_ns is not None:
+            self.clock_ns -= time.perf_counter_ns() - start
         if action is None:
             raise ValueError("action is None")
         print(f"{value = }")
+        print(stats.report())
         return action
 
+    def start_pondering(self) -> None:
+        """Start searching predicted position while opponent thinks."""
+        state = State(
+            self.state.size,
+            dict(self.state.pieces),
+            self.state.turn,
+            rules=self.state.rules,
+            history=self.state.history,
+        )
+        variation = CheckersMinimax.get_principal_variation(
+            state,
+            self.transposition_table,
+            1,
+        )
+        if not variation:
+            return
+        self.ponder = Ponder(
+            CheckersMinimax,
+            state,
+            variation[0],
+            self.transposition_table,
+        )
+        self.ponder.start()
+
+    async def finish_pondering(self, state: State) -> Ponder | None:
+        """Return ponder if it is searching state, otherwise stop it.
+
+        Returned ponder is still searching, so its result can be reused.
+        """
+        ponder, self.ponder = self.ponder, None
+        if ponder is None:
+            return None
+        if not ponder.is_hit(state):
+            await trio.to_thread.run_sync(ponder.stop)
+            return None
+        self.ponder_hits += 1
+        return ponder
+
+    async def handle_action_complete(
+        self,
+        event: Event[tuple[Pos, Pos, int]],
+    ) -> None:
+        """Perform action, then ponder if it is now the opponent's turn."""
+        await super().handle_action_complete(event)
+        _from_pos, _to_pos, turn = event.data
+        if (
+            self.pondering
+            and self.ponder is None
+            and turn != self.playing_as
+            and self.state.check_for_win() is None
+        ):
+            self.start_pondering()
+
+    async def handle_game_over(self, event: Event[int]) -> None:
+        """Stop pondering and disconnect."""
+        ponder, self.ponder = self.ponder, None
+        if ponder is not None:
+            # Stopping joins search thread, keep handling network events
+            await trio.to_thread.run_sync(ponder.stop)
+        await super().handle_game_over(event)
+
+
+def load_tablebase(directory: Path = DEFAULT_DIRECTORY) -> None:
+    """Make search probe tablebases in directory if it exists.
+
+    Build tablebases with the checkers_tablebase command.
+    """
+    if directory.is_dir():
+        CheckersMinimax.TABLEBASE = Tablebase(directory)
+        print(f"Using tablebases in {directory}")
+
+
+def load_opening_book(path: Path = DEFAULT_BOOK) -> None:
+    """Make minimax players play book actions if path exists.
+
+    Build an opening book with the checkers_opening_book command.
+    """
+    if path.is_file():
+        MinimaxPlayer.OPENING_BOOK = OpeningBook(path)
+        print(f"Using opening book {path}")
+
 
 def run() -> None:
     """Run MinimaxPlayer clients in local server."""
     print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    load_tablebase()
+    load_opening_book()
     try:
         run_clients_in_local_servers_sync(MinimaxPlayer)
     except Exception:
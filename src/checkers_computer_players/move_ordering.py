@@ -0,0 +1,107 @@
+"""Move Ordering - Decide which actions a search tries first."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Move Ordering"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+from typing import TYPE_CHECKING, Final, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+Action = TypeVar("Action")
+
+# Number of killer actions remembered per ply
+KILLER_SLOTS: Final = 2
+
+# Order classes, higher is tried first
+TABLE_ACTION: Final = 3
+CAPTURE: Final = 2
+KILLER: Final = 1
+QUIET: Final = 0
+
+
+class MoveOrdering(Generic[Action]):
+    """Order actions so alphabeta cutoffs happen early.
+
+    Actions are tried in this order:
+    1. Best action stored in transposition table
+    2. Captures, most pieces captured first
+    3. Killer actions, quiet actions that caused a cutoff at same ply
+    4. Other quiet actions, by history score of cutoffs they caused
+
+    Nothing needs to be performed or evaluated to order actions.
+    """
+
+    __slots__ = ("history", "killers")
+
+    def __init__(self) -> None:
+        """Initialize move ordering."""
+        # Killer actions for each ply, most recent first
+        self.killers: list[list[Action]] = []
+        # Action -> score of cutoffs it caused
+        self.history: dict[Action, int] = {}
+
+    def new_search(self) -> None:
+        """Forget killer actions and age history scores."""
+        self.killers.clear()
+        for action, score in tuple(self.history.items()):
+            if score > 1:
+                self.history[action] = score >> 1
+            else:
+                del self.history[action]
+
+    def order(
+        self,
+        actions: Iterable[tuple[Action, int]],
+        ply: int,
+        table_action: Action | None = None,
+    ) -> list[tuple[Action, int]]:
+        """Return (action, pieces captured) pairs in order to try them."""
+        killers = self.killers[ply] if ply < len(self.killers) else []
+        history = self.history
+
+        def sort_key(item: tuple[Action, int]) -> tuple[int, int]:
+            action, captures = item
+            if action == table_action:
+                return (TABLE_ACTION, 0)
+            if captures:
+                return (CAPTURE, captures)
+            if action in killers:
+                return (KILLER, -killers.index(action))
+            return (QUIET, history.get(action, 0))
+
+        # Sort is stable, so ties keep generation order
+        return sorted(actions, key=sort_key, reverse=True)
+
+    def record_cutoff(
+        self,
+        action: Action,
+        captures: int,
+        ply: int,
+        depth: int,
+    ) -> None:
+        """Remember action caused a beta cutoff.
+
+        Captures are already tried early, so only quiet actions are
+        remembered.
+        """
+        if captures:
+            return
+        while len(self.killers) <= ply:
+            self.killers.append([])
+        killers = self.killers[ply]
+        if action in killers:
+            killers.remove(action)
+        killers.insert(0, action)
+        del killers[KILLER_SLOTS:]
+        # Cutoffs deeper in the tree matter more
+        self.history[action] = self.history.get(action, 0) + depth * depth
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
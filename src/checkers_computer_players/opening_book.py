@@ -0,0 +1,293 @@
+"""Opening Book - Searched best actions of opening positions."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Opening Book"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import argparse
+import mmap
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from checkers.state import (
+    DEFAULT_RULES,
+    Action,
+    State,
+    generate_pieces,
+    get_geometry,
+)
+
+if TYPE_CHECKING:
+    from checkers.state import Pos
+    from checkers_computer_players.minimax_ai import MinimaxWithID
+
+# Opening books are for English rules on an 8x8 board
+SIZE: Final = DEFAULT_RULES.board_size
+# Playable tiles, actions are stored as indices of their tiles
+TILES: Final = get_geometry(SIZE).tiles
+TILE_INDEX: Final = get_geometry(SIZE).tile_indices
+
+DEFAULT_BOOK: Final = Path("opening_book.ckob")
+MAGIC: Final = b"CKOB"
+FORMAT_VERSION: Final = 1
+# Magic, format version, then number of entries
+HEADER: Final = struct.Struct("<4sBI")
+# Entries start after header padded to 16 bytes
+ENTRIES_OFFSET: Final = 16
+# Zobrist key, from and to tile index, value, search depth
+ENTRY: Final = struct.Struct("<QBBhBx")
+# Values are stored as integers, multiplied by this
+VALUE_SCALE: Final = 30000
+
+
+class BookEntry(NamedTuple):
+    """Searched best action of a position."""
+
+    action: Action
+    # Value of action for the player to move, between -1 and 1
+    value: float
+    depth: int
+
+
+def get_start_state() -> State:
+    """Return state at the start of a game."""
+    return State(SIZE, generate_pieces(*SIZE))
+
+
+def encode_entry(key: int, entry: BookEntry) -> bytes:
+    """Return bytes of book entry of position with Zobrist key."""
+    from_pos, to_pos = entry.action
+    return ENTRY.pack(
+        key,
+        TILE_INDEX[from_pos],
+        TILE_INDEX[to_pos],
+        round(entry.value * VALUE_SCALE),
+        entry.depth,
+    )
+
+
+def decode_entry(
+    data: bytes | mmap.mmap,
+    offset: int,
+) -> tuple[int, BookEntry]:
+    """Return Zobrist key and book entry stored at offset of data."""
+    key, from_tile, to_tile, value, depth = ENTRY.unpack_from(data, offset)
+    action = Action(TILES[from_tile], TILES[to_tile])
+    return key, BookEntry(action, value / VALUE_SCALE, depth)
+
+
+class OpeningBook:
+    """Memory mapped opening book file.
+
+    Entries are sorted by Zobrist key, so probing is a binary search
+    that reads a few entries.
+    """
+
+    __slots__ = ("book", "count", "path")
+
+    def __init__(self, path: Path | str = DEFAULT_BOOK) -> None:
+        """Initialize opening book, an empty book if path does not exist."""
+        self.path = Path(path)
+        self.book: mmap.mmap | None = None
+        self.count = 0
+        if not self.path.is_file():
+            return
+        with self.path.open("rb") as file:
+            self.book = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.book)
+        if (
+            magic != MAGIC
+            or version != FORMAT_VERSION
+            or len(self.book) != ENTRIES_OFFSET + self.count * ENTRY.size
+        ):
+            self.close()
+            raise ValueError(f"{self.path} is not an opening book")
+
+    def __len__(self) -> int:
+        """Return number of positions in book."""
+        return self.count
+
+    def close(self) -> None:
+        """Close book file."""
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+        self.count = 0
+
+    def get_entry(self, key: int) -> BookEntry | None:
+        """Return entry of position with Zobrist key if book has one."""
+        if self.book is None:
+            return None
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, entry = decode_entry(
+                self.book,
+                ENTRIES_OFFSET + middle * ENTRY.size,
+            )
+            if entry_key == key:
+                return entry
+            if entry_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def probe(self, state: State) -> BookEntry | None:
+        """Return book entry of state if book has one."""
+        if state.size != SIZE or state.rules != DEFAULT_RULES:
+            return None
+        entry = self.get_entry(hash(state))
+        if entry is None:
+            return None
+        # Guard against other positions with the same key
+        if entry.action not in set(state.get_all_actions(state.get_turn())):
+            return None
+        return entry
+
+
+def search_position(
+    minimax: type[MinimaxWithID],
+    pieces: dict[Pos, int],
+    turn: bool,
+    depth: int,
+) -> BookEntry:
+    """Return book entry of position from search, run in worker processes."""
+    state = State(SIZE, pieces, turn)
+    value, action = minimax.iterative_deepening(state, 1, depth)
+    assert action is not None
+    # Search values are from black's point of view
+    return BookEntry(action, value if turn else -value, depth)
+
+
+def build(
+    path: Path,
+    minimax: type[MinimaxWithID],
+    plies: int,
+    depth: int = 8,
+    workers: int | None = None,
+) -> dict[int, BookEntry]:
+    """Write opening book of positions up to plies from the start.
+
+    Book is built for each player in turn. Positions where that player
+    moves are searched to depth with minimax and only the best action
+    is followed, while every action of the other player is followed,
+    so the book has an answer to any opponent action. Positions of one ply are
+    searched at the same time in worker processes. Returns entries
+    by Zobrist key.
+    """
+    entries: dict[int, BookEntry] = {}
+    with ProcessPoolExecutor(workers) as executor:
+        for book_player in (1, 0):
+            start = get_start_state()
+            positions = {hash(start): start}
+            for _ in range(plies):
+                searched = [
+                    state
+                    for key, state in positions.items()
+                    if state.turn == book_player and key not in entries
+                ]
+                for state, entry in zip(
+                    searched,
+                    executor.map(
+                        search_position,
+                        repeat(minimax),
+                        [state.pieces for state in searched],
+                        [state.turn for state in searched],
+                        repeat(depth),
+                    ),
+                    strict=True,
+                ):
+                    entries[hash(state)] = entry
+                children: dict[int, State] = {}
+                for key, state in positions.items():
+                    if state.check_for_win() is not None:
+                        continue
+                    if state.turn == book_player:
+                        actions = [entries[key].action]
+                    else:
+                        actions = list(state.get_all_actions(state.get_turn()))
+                    for action in actions:
+                        child = state.perform_action(action)
+                        children[hash(child)] = child
+                positions = children
+            print(f"Searched {len(entries)} positions")
+
+    temporary = path.with_suffix(".tmp")
+    with temporary.open("wb") as file:
+        file.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, len(entries)).ljust(
+                ENTRIES_OFFSET,
+                b"\0",
+            ),
+        )
+        for key in sorted(entries):
+            file.write(encode_entry(key, entries[key]))
+    # Only complete files get the book file name
+    temporary.replace(path)
+    return entries
+
+
+def cli_run() -> None:
+    """Build opening book from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Build an opening book of English checkers by "
+        "searching positions near the start of the game.",
+    )
+    parser.add_argument(
+        "plies",
+        type=int,
+        nargs="?",
+        default=6,
+        help="Plies from the start of the game to cover "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--depth",
+        type=int,
+        default=8,
+        help="Search depth of each position (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_BOOK,
+        help="Opening book file to write (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    args = parser.parse_args()
+    # Imported here as minimax_ai imports this module to probe books
+    from checkers_computer_players.minimax_ai import (
+        CheckersMinimax,
+    )
+
+    start = time.perf_counter_ns()
+    entries = build(
+        args.output,
+        CheckersMinimax,
+        args.plies,
+        args.depth,
+        args.workers,
+    )
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    print(
+        f"Wrote {len(entries)} positions to {args.output} "
+        f"in {elapsed:.1f} seconds",
+    )
+
+
+if __name__ == "__main__":
+    cli_run()
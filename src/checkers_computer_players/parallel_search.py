@@ -0,0 +1,319 @@
+"""Parallel Search - Search root actions in worker processes."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Parallel Search"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import os
+import time
+import traceback
+from concurrent.futures import Future, ProcessPoolExecutor
+from math import inf as infinity
+from typing import TYPE_CHECKING, NamedTuple
+
+from checkers.state import Action, Pos, Rules, State
+from checkers_computer_players.machine_client import (
+    run_clients_in_local_servers_sync,
+)
+from checkers_computer_players.minimax import MinimaxResult, Player
+from checkers_computer_players.minimax_ai import (
+    CheckersMinimax,
+    MinimaxPlayer,
+    SearchContext,
+    SearchStats,
+    load_opening_book,
+    load_tablebase,
+)
+from checkers_computer_players.move_ordering import MoveOrdering
+from checkers_computer_players.tablebase import Tablebase
+from checkers_computer_players.time_management import SearchTimeoutError
+from checkers_computer_players.transposition_table import TranspositionTable
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import TracebackType
+
+    from libcomponent.component import Event
+    from typing_extensions import Self
+
+# Transposition table and move ordering of this worker process,
+# kept between tasks
+_worker_table: TranspositionTable[Action] | None = None
+_worker_ordering: MoveOrdering[Action] | None = None
+
+
+class ActionValue(NamedTuple):
+    """Value of a root action searched to one depth."""
+
+    action: Action
+    # Value from the point of view of MAX, None if deadline passed first
+    value: int | float | None
+    nodes: int
+
+
+def get_worker_table() -> TranspositionTable[Action]:
+    """Return transposition table of this process."""
+    global _worker_table
+    if _worker_table is None:
+        _worker_table = TranspositionTable()
+    return _worker_table
+
+
+def get_worker_ordering() -> MoveOrdering[Action]:
+    """Return move ordering of this process."""
+    global _worker_ordering
+    if _worker_ordering is None:
+        _worker_ordering = MoveOrdering()
+    return _worker_ordering
+
+
+def init_worker(
+    minimax: type[CheckersMinimax],
+    tablebase_directory: Path | None,
+) -> None:
+    """Load tablebases search probes in a new worker process.
+
+    Class attributes set in the parent process only reach workers
+    started by fork, not spawn or forkserver.
+    """
+    if tablebase_directory is not None and minimax.TABLEBASE is None:
+        minimax.TABLEBASE = Tablebase(tablebase_directory)
+
+
+def search_action(
+    minimax: type[CheckersMinimax],
+    size: tuple[int, int],
+    pieces: dict[Pos, int],
+    turn: bool,
+    rules: Rules,
+    history: tuple[int, ...],
+    action: Action,
+    depth: int,
+    a: int | float,
+    b: int | float,
+    deadline_ns: int | None,
+) -> ActionValue:
+    """Return value of performing action, searched to depth from root.
+
+    Runs in a worker process, so position is passed as plain data.
+    Window a, b is from the point of view of MAX. deadline_ns is a
+    time.time_ns time, as perf_counter times are not comparable between
+    processes. If it is None, search always completes.
+    """
+    state = State(size, pieces, turn, rules=rules, history=history)
+    state.push(action)
+    table = get_worker_table()
+    table.new_search()
+    ordering = get_worker_ordering()
+    if depth == 1:
+        # First depth of a new search
+        ordering.new_search()
+    context = SearchContext(table, ordering=ordering)
+    if deadline_ns is not None:
+        remaining = deadline_ns - time.time_ns()
+        context.deadline_ns = time.perf_counter_ns() + remaining
+    try:
+        value = minimax.search_root(state, depth - 1, a, b, context).value
+    except SearchTimeoutError:
+        return ActionValue(action, None, context.stats.nodes)
+    return ActionValue(action, value, context.stats.nodes)
+
+
+class ParallelSearch:
+    """Search every root action in its own worker process task.
+
+    Root actions are searched one depth at a time, and every action
+    finishes a depth before the next depth starts. Best action of the
+    previous depth is searched first with a full window, then the other
+    actions at once with a window that only lets better values through.
+    """
+
+    __slots__ = ("executor", "minimax", "workers")
+
+    def __init__(
+        self,
+        minimax: type[CheckersMinimax] = CheckersMinimax,
+        workers: int | None = None,
+    ) -> None:
+        """Initialize parallel search, workers defaults to CPU count."""
+        self.minimax = minimax
+        self.workers = workers or os.cpu_count() or 1
+        self.executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> Self:
+        """Return self."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Shut down worker processes."""
+        self.close()
+
+    def close(self) -> None:
+        """Shut down worker processes."""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def search(
+        self,
+        state: State,
+        max_depth: int,
+        time_limit_ns: int | None = None,
+        stats: SearchStats | None = None,
+    ) -> MinimaxResult[Action]:
+        """Return best action for state, blocks until search finishes.
+
+        Value is from the point of view of MAX. Node counts of every
+        worker and the depth all root actions reached are added to
+        stats if given.
+        """
+        actions = list(state.get_all_actions(state.get_turn()))
+        if not actions:
+            return MinimaxResult(self.minimax.value(state), None)
+        if self.executor is None:
+            tablebase = self.minimax.TABLEBASE
+            self.executor = ProcessPoolExecutor(
+                self.workers,
+                initializer=init_worker,
+                initargs=(
+                    self.minimax,
+                    None if tablebase is None else tablebase.directory,
+                ),
+            )
+        sign = 1 if self.minimax.player(state) == Player.MAX else -1
+        best: MinimaxResult[Action] = MinimaxResult(0, None)
+        start_ns = time.time_ns()
+        deadline_ns = None
+        nodes = 0
+
+        # First depth always completes so there is an action to return
+        for depth in range(1, max_depth + 1):
+            first = self.submit(
+                state,
+                actions[0],
+                depth,
+                -infinity,
+                infinity,
+                deadline_ns,
+            ).result()
+            nodes += first.nodes
+            if first.value is None:
+                break
+            # Other actions only matter if they are better than first
+            a, b = (
+                (first.value, infinity)
+                if sign == 1
+                else (-infinity, first.value)
+            )
+            futures = [
+                self.submit(state, action, depth, a, b, deadline_ns)
+                for action in actions[1:]
+            ]
+            results = [future.result() for future in futures]
+            nodes += sum(result.nodes for result in results)
+            if any(result.value is None for result in results):
+                break
+            best_action, best_value = first.action, first.value
+            for result in results:
+                assert result.value is not None
+                if sign * result.value > sign * best_value:
+                    best_action, best_value = result.action, result.value
+            best = MinimaxResult(best_value, best_action)
+            if stats is not None:
+                stats.depth = depth
+            # Search best action first at next depth
+            actions.remove(best_action)
+            actions.insert(0, best_action)
+
+            if abs(best_value) == self.minimax.HIGHEST:
+                # Game is decided, deeper searches give the same value
+                break
+            if time_limit_ns is None:
+                continue
+            elapsed = time.time_ns() - start_ns
+            if elapsed * 2 > time_limit_ns:
+                # Next depth would most likely not finish
+                break
+            deadline_ns = start_ns + time_limit_ns
+
+        if stats is not None:
+            stats.nodes += nodes
+        return best
+
+    def submit(
+        self,
+        state: State,
+        action: Action,
+        depth: int,
+        a: int | float,
+        b: int | float,
+        deadline_ns: int | None,
+    ) -> Future[ActionValue]:
+        """Return future of searching action in a worker process."""
+        assert self.executor is not None
+        return self.executor.submit(
+            search_action,
+            self.minimax,
+            state.size,
+            dict(state.pieces),
+            state.turn,
+            state.rules,
+            state.history,
+            action,
+            depth,
+            a,
+            b,
+            deadline_ns,
+        )
+
+
+class ParallelMinimaxPlayer(MinimaxPlayer):
+    """Minimax Player that searches with every CPU core."""
+
+    __slots__ = ("parallel",)
+
+    def __init__(self) -> None:
+        """Initialize parallel minimax player."""
+        super().__init__()
+
+        self.parallel = ParallelSearch()
+
+    def search(
+        self,
+        state: State,
+        time_limit_ns: int,
+        stats: SearchStats,
+    ) -> MinimaxResult[Action]:
+        """Return best action for state, run in a worker thread."""
+        return self.parallel.search(state, 20, time_limit_ns, stats)
+
+    async def handle_game_over(self, event: Event[int]) -> None:
+        """Shut down worker processes and disconnect."""
+        self.parallel.close()
+        await super().handle_game_over(event)
+
+
+def run() -> None:
+    """Run ParallelMinimaxPlayer clients in local server."""
+    print(f"{__title__} v{__version__}\nProgrammed by {__author__}.\n")
+    # Worker processes load the same tablebases when they start,
+    # the opening book is only probed by the player in this process
+    load_tablebase()
+    load_opening_book()
+    try:
+        run_clients_in_local_servers_sync(ParallelMinimaxPlayer)
+    except Exception:
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,514 @@
+"""Tablebase - Endgame tablebases for positions with few pieces."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Tablebase"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import argparse
+import math
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
+from itertools import repeat
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from checkers.state import DEFAULT_RULES, State, get_geometry
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from checkers.state import Pos
+
+# Tablebases are for English rules on an 8x8 board
+SIZE: Final = DEFAULT_RULES.board_size
+# Playable tiles, in tile index order
+TILES: Final = get_geometry(SIZE).tiles
+TILE_INDEX: Final = get_geometry(SIZE).tile_indices
+
+DEFAULT_DIRECTORY: Final = Path("tablebase")
+SUFFIX: Final = ".cktb"
+MAGIC: Final = b"CKTB"
+FORMAT_VERSION: Final = 1
+# Magic, format version, then piece counts of signature
+HEADER: Final = struct.Struct("<4sB4B")
+# Entries start after header padded to 16 bytes
+ENTRIES_OFFSET: Final = 16
+# Longest distance to win an entry byte can hold, in plies
+MAX_DISTANCE: Final = 253
+
+
+class Outcome(IntEnum):
+    """Game outcome for the player to move."""
+
+    LOSS = -1
+    DRAW = 0
+    WIN = 1
+
+
+class TablebaseResult(NamedTuple):
+    """Exact outcome of a position with perfect play."""
+
+    outcome: Outcome
+    # Plies until the losing player has no actions, 0 for draws
+    distance: int
+
+
+class Signature(NamedTuple):
+    """Number of pieces of each piece type, indexed by piece type."""
+
+    red_pawns: int
+    black_pawns: int
+    red_kings: int
+    black_kings: int
+
+    @property
+    def pieces(self) -> int:
+        """Total number of pieces."""
+        return sum(self)
+
+    @property
+    def pawns(self) -> int:
+        """Number of pawns of either player."""
+        return self.red_pawns + self.black_pawns
+
+    @property
+    def filename(self) -> str:
+        """Name of tablebase file for this signature."""
+        return "".join(map(str, self)) + SUFFIX
+
+    @property
+    def position_count(self) -> int:
+        """Number of entries in tablebase of this signature.
+
+        Every group of pieces of the same type is placed on any
+        playable tiles, for both players to move. Placements where
+        groups overlap are never probed.
+        """
+        count = 2
+        for pieces in self:
+            count *= math.comb(len(TILES), pieces)
+        return count
+
+
+def get_signature(pieces: dict[Pos, int]) -> Signature:
+    """Return signature of pieces."""
+    counts = [0, 0, 0, 0]
+    for piece_type in pieces.values():
+        counts[piece_type] += 1
+    return Signature(*counts)
+
+
+def get_signatures(max_pieces: int) -> list[Signature]:
+    """Return signatures with up to max_pieces pieces, in build order.
+
+    Captures remove pieces and promotions turn pawns into kings, so
+    every signature comes after the signatures its positions can reach.
+    Both players have at least one piece, otherwise the game is over.
+    """
+    signatures = [
+        Signature(*counts)
+        for counts in _iter_counts(max_pieces)
+        if counts[0] + counts[2] and counts[1] + counts[3]
+    ]
+    signatures.sort(key=lambda signature: (signature.pieces, signature.pawns))
+    return signatures
+
+
+def _iter_counts(max_pieces: int) -> Iterator[tuple[int, int, int, int]]:
+    """Yield piece counts of every piece type adding up to max_pieces or less."""
+    for red_pawns in range(max_pieces + 1):
+        for black_pawns in range(max_pieces + 1 - red_pawns):
+            left = max_pieces - red_pawns - black_pawns
+            for red_kings in range(left + 1):
+                for black_kings in range(left + 1 - red_kings):
+                    yield red_pawns, black_pawns, red_kings, black_kings
+
+
+def rank_tiles(tiles: list[int]) -> int:
+    """Return index of sorted tile indices among combinations of tiles."""
+    return sum(
+        math.comb(tile, number + 1) for number, tile in enumerate(tiles)
+    )
+
+
+def unrank_tiles(rank: int, count: int) -> list[int]:
+    """Return sorted tile indices of combination index rank."""
+    tiles = []
+    for number in range(count, 0, -1):
+        tile = number - 1
+        while math.comb(tile + 1, number) <= rank:
+            tile += 1
+        rank -= math.comb(tile, number)
+        tiles.append(tile)
+    tiles.reverse()
+    return tiles
+
+
+def get_index(
+    signature: Signature,
+    pieces: dict[Pos, int],
+    turn: bool,
+) -> int:
+    """Return tablebase entry index of position."""
+    groups: tuple[list[int], ...] = ([], [], [], [])
+    for position, piece_type in pieces.items():
+        groups[piece_type].append(TILE_INDEX[position])
+    index = 0
+    for count, tiles in zip(signature, groups, strict=True):
+        tiles.sort()
+        index = index * math.comb(len(TILES), count) + rank_tiles(tiles)
+    return index * 2 + turn
+
+
+def get_position(
+    signature: Signature,
+    index: int,
+) -> tuple[dict[Pos, int], bool] | None:
+    """Return pieces and turn of tablebase entry index.
+
+    Returns None if entry is not a legal position, either because
+    pieces overlap or because a pawn is on the tile it would be kinged
+    on.
+    """
+    index, turn = divmod(index, 2)
+    ranks = []
+    for count in reversed(signature):
+        index, rank = divmod(index, math.comb(len(TILES), count))
+        ranks.append(rank)
+    ranks.reverse()
+    king_tiles = get_geometry(SIZE).king_tiles
+    pieces: dict[Pos, int] = {}
+    for piece_type, (count, rank) in enumerate(
+        zip(signature, ranks, strict=True),
+    ):
+        for tile in unrank_tiles(rank, count):
+            position = TILES[tile]
+            if position in pieces:
+                return None
+            if piece_type < 2 and position in king_tiles[piece_type]:
+                return None
+            pieces[position] = piece_type
+    return pieces, bool(turn)
+
+
+def encode_result(result: TablebaseResult) -> int:
+    """Return entry byte of result.
+
+    Winning distances are odd and losing distances are even, so
+    0 is a draw, odd bytes are wins and other even bytes are losses
+    two plies longer than their distance.
+    """
+    if result.outcome == Outcome.DRAW:
+        return 0
+    if result.distance > MAX_DISTANCE:
+        raise ValueError(
+            f"Distance {result.distance} is too long for tablebase entries",
+        )
+    if result.outcome == Outcome.WIN:
+        return result.distance
+    return result.distance + 2
+
+
+def decode_result(entry: int) -> TablebaseResult:
+    """Return result of entry byte."""
+    if not entry:
+        return TablebaseResult(Outcome.DRAW, 0)
+    if entry & 1:
+        return TablebaseResult(Outcome.WIN, entry)
+    return TablebaseResult(Outcome.LOSS, entry - 2)
+
+
+class Tablebase:
+    """Memory mapped tablebase files of a directory.
+
+    Files are opened the first time a position of their signature is
+    probed. Probing a position without a tablebase file returns None.
+    """
+
+    __slots__ = ("directory", "files", "max_pieces", "tables")
+
+    def __init__(self, directory: Path | str = DEFAULT_DIRECTORY) -> None:
+        """Initialize tablebase, looking for files in directory."""
+        self.directory = Path(directory)
+        self.files: dict[Signature, Path] = {}
+        if self.directory.is_dir():
+            for path in self.directory.glob(f"*{SUFFIX}"):
+                signature = read_signature(path)
+                if signature is not None:
+                    self.files[signature] = path
+        self.max_pieces = max(
+            (signature.pieces for signature in self.files),
+            default=0,
+        )
+        self.tables: dict[Signature, mmap.mmap] = {}
+
+    def __contains__(self, signature: Signature) -> bool:
+        """Return if there is a tablebase file for signature."""
+        return signature in self.files
+
+    def close(self) -> None:
+        """Close opened tablebase files."""
+        for table in self.tables.values():
+            table.close()
+        self.tables.clear()
+
+    def get_table(self, signature: Signature) -> mmap.mmap | None:
+        """Return memory mapped tablebase file of signature if it exists."""
+        table = self.tables.get(signature)
+        if table is None:
+            path = self.files.get(signature)
+            if path is None:
+                return None
+            with path.open("rb") as file:
+                table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.tables[signature] = table
+        return table
+
+    def probe(self, state: State) -> TablebaseResult | None:
+        """Return exact result of state for the player to move.
+
+        Returns None if state is not in a tablebase.
+        """
+        pieces = state.pieces
+        if (
+            len(pieces) > self.max_pieces
+            or state.size != SIZE
+            or state.rules != DEFAULT_RULES
+        ):
+            return None
+        signature = get_signature(pieces)
+        table = self.get_table(signature)
+        if table is None:
+            return None
+        index = get_index(signature, pieces, state.turn)
+        return decode_result(table[ENTRIES_OFFSET + index])
+
+
+def read_signature(path: Path) -> Signature | None:
+    """Return signature of tablebase file, None if it is not complete."""
+    try:
+        with path.open("rb") as file:
+            header = file.read(HEADER.size)
+            size = os.fstat(file.fileno()).st_size
+    except OSError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    magic, version, *counts = HEADER.unpack(header)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        return None
+    signature = Signature(*counts)
+    if size != ENTRIES_OFFSET + signature.position_count:
+        return None
+    return signature
+
+
+def get_predecessors(
+    signature: Signature,
+    pieces: dict[Pos, int],
+    turn: bool,
+) -> Iterator[int]:
+    """Yield entry indices of positions one quiet action before position.
+
+    Only actions that do not change signature are undone, and only
+    positions where the action was legal, so the player did not have
+    to capture instead.
+    """
+    moves = get_geometry(SIZE).moves
+    mover = not turn
+    for position, piece_type in pieces.items():
+        if piece_type & 1 != mover:
+            continue
+        # Pawns came from behind, the way pawns of the enemy move
+        back_type = piece_type ^ 1 if piece_type < 2 else piece_type
+        for origin in moves[back_type][position]:
+            if origin in pieces:
+                continue
+            previous = dict(pieces)
+            del previous[position]
+            previous[origin] = piece_type
+            if State(SIZE, previous, mover).has_jump(mover):
+                continue
+            yield get_index(signature, previous, mover)
+
+
+def solve_child(
+    child: State,
+    tablebase: Tablebase,
+) -> TablebaseResult:
+    """Return result of position after an action that changed signature."""
+    if child.check_for_win() is not None:
+        return TablebaseResult(Outcome.LOSS, 0)
+    result = tablebase.probe(child)
+    if result is None:
+        signature = get_signature(child.pieces)
+        raise RuntimeError(f"Tablebase for {signature} has not been built")
+    return result
+
+
+def build_signature(directory: Path, signature: Signature) -> Path:
+    """Build tablebase file of signature and return its path.
+
+    Tablebases of every signature positions of signature can reach
+    must already be built in directory.
+
+    Positions are solved by retrograde analysis. Positions whose result
+    is decided by actions that leave the signature are queued first,
+    then results are spread back through quiet actions one distance at
+    a time. Anything left undecided is a draw.
+    """
+    tablebase = Tablebase(directory)
+    count = signature.position_count
+    entries = bytearray(count)
+    solved = bytearray(count)
+    # Quiet actions not yet known to lose
+    remaining = array("H", bytes(2 * count))
+    # Longest distance of actions known to lose, plus one
+    longest = array("H", bytes(2 * count))
+    # Positions with a way to win or draw queued or found
+    escapes = bytearray(count)
+    queue: dict[int, list[tuple[int, Outcome]]] = defaultdict(list)
+
+    for index in range(count):
+        position = get_position(signature, index)
+        if position is None:
+            solved[index] = 1
+            continue
+        pieces, turn = position
+        state = State(SIZE, pieces, turn)
+        win = math.inf
+        for action in state.get_all_actions(turn):
+            child = state.perform_action(action)
+            if get_signature(child.pieces) == signature:
+                remaining[index] += 1
+                continue
+            child_result = solve_child(child, tablebase)
+            if child_result.outcome == Outcome.LOSS:
+                win = min(win, child_result.distance + 1)
+            elif child_result.outcome == Outcome.WIN:
+                longest[index] = max(
+                    longest[index],
+                    child_result.distance + 1,
+                )
+            else:
+                escapes[index] = 1
+        if win != math.inf:
+            escapes[index] = 1
+            queue[int(win)].append((index, Outcome.WIN))
+        elif not remaining[index] and not escapes[index]:
+            queue[longest[index]].append((index, Outcome.LOSS))
+    tablebase.close()
+
+    while queue:
+        distance = min(queue)
+        for index, outcome in queue.pop(distance):
+            if solved[index]:
+                continue
+            solved[index] = 1
+            entries[index] = encode_result(TablebaseResult(outcome, distance))
+            position = get_position(signature, index)
+            assert position is not None
+            for previous in get_predecessors(signature, *position):
+                if solved[previous]:
+                    continue
+                if outcome == Outcome.LOSS:
+                    escapes[previous] = 1
+                    queue[distance + 1].append((previous, Outcome.WIN))
+                    continue
+                remaining[previous] -= 1
+                longest[previous] = max(longest[previous], distance + 1)
+                if not remaining[previous] and not escapes[previous]:
+                    queue[longest[previous]].append((previous, Outcome.LOSS))
+
+    path = directory / signature.filename
+    temporary = path.with_suffix(".tmp")
+    with temporary.open("wb") as file:
+        file.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, *signature).ljust(
+                ENTRIES_OFFSET,
+                b"\0",
+            ),
+        )
+        file.write(entries)
+    # Only complete files get the tablebase file name
+    temporary.replace(path)
+    return path
+
+
+def build(
+    directory: Path,
+    max_pieces: int,
+    workers: int | None = None,
+) -> list[Signature]:
+    """Build missing tablebases with up to max_pieces pieces.
+
+    Signatures with the same number of pieces and pawns do not depend
+    on each other, so they are built at the same time in worker
+    processes. Files already in directory are kept, so an interrupted
+    build continues where it stopped. Returns built signatures.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    existing = Tablebase(directory)
+    levels: dict[tuple[int, int], list[Signature]] = defaultdict(list)
+    for signature in get_signatures(max_pieces):
+        if signature not in existing:
+            levels[signature.pieces, signature.pawns].append(signature)
+    built: list[Signature] = []
+    with ProcessPoolExecutor(workers) as executor:
+        for level in sorted(levels):
+            signatures = levels[level]
+            for signature, path in zip(
+                signatures,
+                executor.map(build_signature, repeat(directory), signatures),
+                strict=True,
+            ):
+                print(f"Built {path}")
+                built.append(signature)
+    return built
+
+
+def cli_run() -> None:
+    """Build tablebases from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Build endgame tablebases of English checkers "
+        "positions with few pieces. Run again to continue an "
+        "interrupted build.",
+    )
+    parser.add_argument(
+        "pieces",
+        type=int,
+        nargs="?",
+        default=3,
+        help="Most pieces on the board (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        default=DEFAULT_DIRECTORY,
+        help="Directory to write tablebases to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    args = parser.parse_args()
+    start = time.perf_counter_ns()
+    built = build(args.directory, args.pieces, args.workers)
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    print(f"Built {len(built)} tablebases in {elapsed:.1f} seconds")
+
+
+if __name__ == "__main__":
+    cli_run()
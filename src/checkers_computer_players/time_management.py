@@ -0,0 +1,88 @@
+"""Time Management - Decide how long a search may think."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Time Management"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+from functools import cache
+from itertools import pairwise
+from typing import TYPE_CHECKING, Final
+
+from checkers.state import generate_pieces
+
+if TYPE_CHECKING:
+    from checkers.state import State
+
+# (game phase, time factor) points, linearly interpolated between.
+# Openings are simple, middlegames have the most tactics to find.
+# Factors are at most 1.0, so no move gets more than the move time.
+PHASE_FACTORS: Final = ((0.0, 0.4), (0.5, 1.0), (1.0, 0.7))
+
+# Estimated moves left in game at start and end of game
+MOVES_LEFT_OPENING: Final = 30
+MOVES_LEFT_ENDGAME: Final = 10
+
+# Never spend more than this fraction of remaining clock on one move
+MAX_CLOCK_FRACTION: Final = 0.5
+
+
+class SearchTimeoutError(Exception):
+    """Raised inside a search when its deadline has passed."""
+
+    __slots__ = ()
+
+
+@cache
+def get_start_piece_count(size: tuple[int, int]) -> int:
+    """Return number of pieces at start of game on board of given size."""
+    return len(generate_pieces(*size))
+
+
+def get_game_phase(state: State) -> float:
+    """Return game phase, 0.0 at start of game to 1.0 with no pieces left."""
+    start = get_start_piece_count(state.size)
+    if not start:
+        return 1.0
+    return max(0.0, 1.0 - len(state.pieces) / start)
+
+
+def get_phase_factor(phase: float) -> float:
+    """Return time factor for game phase."""
+    for (start, start_factor), (end, end_factor) in pairwise(PHASE_FACTORS):
+        if phase <= end:
+            progress = (phase - start) / (end - start)
+            return start_factor + (end_factor - start_factor) * progress
+    return PHASE_FACTORS[-1][1]
+
+
+def allocate_time(
+    state: State,
+    move_time_ns: int,
+    clock_ns: int | None = None,
+    increment_ns: int = 0,
+) -> int:
+    """Return nanoseconds a search of state may take.
+
+    move_time_ns is the most time for one move, which is scaled down
+    by game phase. If clock_ns (time left for the rest of the game) is
+    given, budget is also limited by the clock shared over the
+    estimated number of moves left, plus increment_ns gained per move,
+    and never more than MAX_CLOCK_FRACTION of the clock.
+    """
+    phase = get_game_phase(state)
+    budget = move_time_ns * get_phase_factor(phase)
+    if clock_ns is not None:
+        moves_left = MOVES_LEFT_OPENING + (
+            MOVES_LEFT_ENDGAME - MOVES_LEFT_OPENING
+        ) * min(phase, 1.0)
+        per_move = clock_ns / moves_left + increment_ns
+        budget = min(budget, per_move, clock_ns * MAX_CLOCK_FRACTION)
+    return max(0, int(budget))
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -0,0 +1,464 @@
+"""Tournament - Rate computer players with Elo and SPRT."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Tournament"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+import argparse
+import math
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from enum import Enum
+from itertools import combinations
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+from checkers_computer_players.arena import (
+    DEFAULT_MAX_PLIES,
+    PLAYERS,
+    GameResult,
+    MatchStats,
+    play_game_sync,
+    random_opening,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+    from checkers_computer_players.machine_client import RemoteState
+
+DEFAULT_RESULTS: Final = Path("tournament.txt")
+# Two sided 95% confidence interval
+Z_95: Final = 1.959964
+# Outcome letters for the first player of a pairing in results files
+OUTCOMES: Final = {"W": 1, "L": 0, "D": None}
+
+
+class Mode(str, Enum):
+    """Which players play each other."""
+
+    # Every player plays every other player
+    ROUND_ROBIN = "round-robin"
+    # First player plays every other player
+    GAUNTLET = "gauntlet"
+
+
+class Pairing(NamedTuple):
+    """Two players of a match, results are for first player."""
+
+    first: str
+    second: str
+
+
+class SPRTDecision(str, Enum):
+    """Result of a sequential probability ratio test."""
+
+    # First player is not elo1 stronger
+    H0 = "H0"
+    # First player is at least elo1 stronger
+    H1 = "H1"
+
+
+def elo_to_score(elo: float) -> float:
+    """Return expected score of player elo points stronger."""
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """Return Elo difference expected to give score."""
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return 400 * math.log10(score / (1 - score))
+
+
+def score_variance(stats: MatchStats) -> float:
+    """Return variance of the score of one game."""
+    if not stats.games:
+        return 0.0
+    score = stats.score
+    return (
+        stats.wins * (1 - score) ** 2
+        + stats.draws * (0.5 - score) ** 2
+        + stats.losses * score**2
+    ) / stats.games
+
+
+def elo_interval(
+    stats: MatchStats,
+    z: float = Z_95,
+) -> tuple[float, float, float]:
+    """Return Elo difference and its confidence interval bounds."""
+    score = stats.score
+    error = z * math.sqrt(score_variance(stats) / max(1, stats.games))
+    return (
+        score_to_elo(score),
+        score_to_elo(score - error),
+        score_to_elo(score + error),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SPRT:
+    """Sequential probability ratio test of Elo difference.
+
+    Tests if first player is elo0 (H0) or elo1 (H1) stronger, using
+    the normal approximation of the log likelihood ratio of game
+    scores. alpha and beta are the false positive and negative rates.
+    """
+
+    elo0: float = 0.0
+    elo1: float = 10.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        """Log likelihood ratio where H0 and H1 are accepted."""
+        return (
+            math.log(self.beta / (1 - self.alpha)),
+            math.log((1 - self.beta) / self.alpha),
+        )
+
+    def llr(self, stats: MatchStats) -> float:
+        """Return log likelihood ratio of H1 against H0."""
+        variance = score_variance(stats)
+        if not variance:
+            # Every game had the same outcome, count one extra draw so
+            # lopsided results are still decided
+            variance = score_variance(
+                MatchStats(stats.wins, stats.losses, stats.draws + 1),
+            )
+            if not variance:
+                return 0.0
+        score0 = elo_to_score(self.elo0)
+        score1 = elo_to_score(self.elo1)
+        return (
+            stats.games
+            * (score1 - score0)
+            * (2 * stats.score - score0 - score1)
+            / (2 * variance)
+        )
+
+    def decide(self, stats: MatchStats) -> SPRTDecision | None:
+        """Return accepted hypothesis, None if more games are needed."""
+        lower, upper = self.bounds
+        llr = self.llr(stats)
+        if llr <= lower:
+            return SPRTDecision.H0
+        if llr >= upper:
+            return SPRTDecision.H1
+        return None
+
+
+class ResultsFile:
+    """Append only text file of tournament game results.
+
+    First line holds tournament settings. Every other line is one
+    game, `first second game outcome plies`, with outcome W, L or D for
+    the first player. Interrupted tournaments continue from the games
+    in the file.
+    """
+
+    __slots__ = ("path", "settings")
+
+    def __init__(self, path: Path, settings: str) -> None:
+        """Initialize results file."""
+        self.path = path
+        self.settings = settings
+
+    def load(self) -> dict[Pairing, dict[int, GameResult]]:
+        """Return results of games already played, by pairing and game.
+
+        Winners are given as if first player plays black. Raises
+        ValueError if the file is from a tournament with other settings.
+        """
+        results: dict[Pairing, dict[int, GameResult]] = {}
+        if not self.path.exists():
+            return results
+        lines = self.path.read_text(encoding="utf-8").splitlines(keepends=True)
+        if lines and not lines[-1].endswith("\n"):
+            # Interrupted while writing last line, so remove it
+            lines.pop()
+            self.path.write_text("".join(lines), encoding="utf-8")
+        if not lines:
+            self.path.unlink()
+            return results
+        header = lines[0].rstrip("\n")
+        if header != f"# {self.settings}":
+            raise ValueError(
+                f"{self.path} has results of other settings: {header!r}",
+            )
+        for line in lines[1:]:
+            first, second, game, outcome, plies = line.split()
+            results.setdefault(Pairing(first, second), {})[int(game)] = (
+                GameResult(OUTCOMES[outcome], int(plies))
+            )
+        return results
+
+    def create(self) -> None:
+        """Write settings line if file does not exist yet."""
+        if not self.path.exists():
+            self.path.write_text(f"# {self.settings}\n", encoding="utf-8")
+
+    def append(self, pairing: Pairing, game: int, result: GameResult) -> None:
+        """Add result of game, winner as if first player plays black."""
+        outcome = {1: "W", 0: "L", None: "D"}[result.winner]
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(
+                f"{pairing.first} {pairing.second} {game} {outcome} "
+                f"{result.plies}\n",
+            )
+
+
+@dataclass(slots=True)
+class PairingState:
+    """Results of one pairing so far."""
+
+    stats: MatchStats
+    decision: SPRTDecision | None = None
+
+
+class Tournament:
+    """Matches between computer players, rated with Elo.
+
+    Games of a pairing come in pairs from the same random opening with
+    colours swapped, and are played on every CPU core. With an SPRT,
+    a pairing stops as soon as the test is decided.
+    """
+
+    __slots__ = (
+        "games",
+        "max_plies",
+        "mode",
+        "move_time_ns",
+        "opening_plies",
+        "pairings",
+        "players",
+        "results",
+        "seed",
+        "sprt",
+        "workers",
+    )
+
+    def __init__(
+        self,
+        players: dict[str, type[RemoteState]],
+        games: int,
+        results: Path = DEFAULT_RESULTS,
+        mode: Mode = Mode.ROUND_ROBIN,
+        sprt: SPRT | None = None,
+        workers: int | None = None,
+        opening_plies: int = 4,
+        max_plies: int = DEFAULT_MAX_PLIES,
+        move_time_ns: int | None = None,
+        seed: int = 0,
+    ) -> None:
+        """Initialize tournament, games is the most games per pairing."""
+        if len(players) < 2:
+            raise ValueError("Tournament needs at least two players")
+        self.players = players
+        self.games = games
+        self.mode = mode
+        self.sprt = sprt
+        self.workers = workers
+        self.opening_plies = opening_plies
+        self.max_plies = max_plies
+        self.move_time_ns = move_time_ns
+        self.seed = seed
+        self.results = ResultsFile(
+            results,
+            f"seed {seed} opening_plies {opening_plies} "
+            f"max_plies {max_plies} move_time_ns {move_time_ns}",
+        )
+        names = list(players)
+        if mode == Mode.GAUNTLET:
+            self.pairings = [Pairing(names[0], name) for name in names[1:]]
+        else:
+            self.pairings = [Pairing(*pair) for pair in combinations(names, 2)]
+
+    def get_game_arguments(
+        self,
+        pairing: Pairing,
+        game: int,
+    ) -> tuple[type[RemoteState], type[RemoteState], int]:
+        """Return black and red player and who first player plays as."""
+        first = self.players[pairing.first]
+        second = self.players[pairing.second]
+        playing_as = 1 - game % 2
+        if playing_as:
+            return first, second, playing_as
+        return second, first, playing_as
+
+    def run(self) -> dict[Pairing, PairingState]:
+        """Play missing games and return results of every pairing."""
+        loaded = self.results.load()
+        self.results.create()
+        states: dict[Pairing, PairingState] = {}
+        todo: list[tuple[Pairing, int]] = []
+        for pairing in self.pairings:
+            state = PairingState(MatchStats())
+            states[pairing] = state
+            played = loaded.get(pairing, {})
+            for result in played.values():
+                state.stats.add(result, 1)
+            state.decision = self.get_decision(state.stats)
+            if state.decision is None:
+                todo.extend(
+                    (pairing, game)
+                    for game in range(self.games)
+                    if game not in played
+                )
+        if not todo:
+            return states
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            pending: dict[Future[GameResult], tuple[Pairing, int, int]] = {}
+            for pairing, game in todo:
+                black, red, playing_as = self.get_game_arguments(
+                    pairing,
+                    game,
+                )
+                future = executor.submit(
+                    play_game_sync,
+                    black,
+                    red,
+                    random_opening(self.seed + game // 2, self.opening_plies),
+                    self.max_plies,
+                    self.move_time_ns,
+                )
+                pending[future] = (pairing, game, playing_as)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pairing, game, playing_as = pending.pop(future)
+                    if future.cancelled():
+                        continue
+                    result = future.result()
+                    if result.winner is not None and not playing_as:
+                        # Store winner as if first player played black
+                        result = GameResult(1 - result.winner, result.plies)
+                    self.results.append(pairing, game, result)
+                    state = states[pairing]
+                    state.stats.add(result, 1)
+                    if state.decision is None:
+                        state.decision = self.get_decision(state.stats)
+                        if state.decision is not None:
+                            for other, (other_pairing, *_) in pending.items():
+                                if other_pairing == pairing:
+                                    other.cancel()
+        return states
+
+    def get_decision(self, stats: MatchStats) -> SPRTDecision | None:
+        """Return SPRT decision of pairing results, None without SPRT."""
+        if self.sprt is None:
+            return None
+        return self.sprt.decide(stats)
+
+    def report(self, states: dict[Pairing, PairingState]) -> str:
+        """Return summary of every pairing."""
+        lines = []
+        for pairing, state in states.items():
+            elo, lower, upper = elo_interval(state.stats)
+            line = (
+                f"{pairing.first} vs {pairing.second}: "
+                f"{state.stats.report()}\n"
+                f"  Elo {elo:+.1f} (95% {lower:+.1f} to {upper:+.1f})"
+            )
+            if self.sprt is not None:
+                lower_bound, upper_bound = self.sprt.bounds
+                decision = state.decision.value if state.decision else "-"
+                line += (
+                    f", LLR {self.sprt.llr(state.stats):.2f} "
+                    f"({lower_bound:.2f}, {upper_bound:.2f}) {decision}"
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+
+def cli_run() -> None:
+    """Run tournament from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Play computer players against each other and rate "
+        "them with Elo. Run again with the same results file to continue "
+        "an interrupted tournament.",
+    )
+    parser.add_argument("players", nargs="+", choices=tuple(PLAYERS))
+    parser.add_argument(
+        "--mode",
+        type=Mode,
+        choices=tuple(Mode),
+        default=Mode.ROUND_ROBIN,
+        help="Who plays who, gauntlet plays the first player against the "
+        "others (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--games",
+        type=int,
+        default=100,
+        help="Most games per pairing (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=DEFAULT_RESULTS,
+        help="Results file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--sprt",
+        nargs=2,
+        type=float,
+        metavar=("ELO0", "ELO1"),
+        help="Stop pairings once SPRT of elo0 against elo1 is decided",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "--opening-plies",
+        type=int,
+        default=4,
+        help="Random actions at the start of each game pair "
+        "(default: %(default)s)",
+    )
+    parser.add_argument(
+        "--max-plies",
+        type=int,
+        default=DEFAULT_MAX_PLIES,
+        help="Games longer than this are draws (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--move-time",
+        type=float,
+        default=0.1,
+        help="Seconds minimax players think per move (default: %(default)s)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    if len(set(args.players)) < 2:
+        parser.error("need at least two different players")
+    tournament = Tournament(
+        {name: PLAYERS[name] for name in args.players},
+        args.games,
+        args.results,
+        args.mode,
+        SPRT(*args.sprt) if args.sprt else None,
+        args.workers,
+        args.opening_plies,
+        args.max_plies,
+        int(args.move_time * 1e9),
+        args.seed,
+    )
+    print(tournament.report(tournament.run()))
+
+
+if __name__ == "__main__":
+    cli_run()
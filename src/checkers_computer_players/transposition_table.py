@@ -0,0 +1,172 @@
+"""Transposition Table - Fixed capacity search result cache."""
+
+from __future__ import annotations
+
+# Programmed by CoolCat467
+
+__title__ = "Transposition Table"
+__author__ = "CoolCat467"
+__version__ = "0.0.0"
+
+from array import array
+from enum import IntEnum, auto
+from typing import Final, Generic, NamedTuple, TypeVar
+
+Action = TypeVar("Action")
+
+# 2 entries per bucket, about 3 MiB of arrays plus stored actions
+DEFAULT_BUCKETS: Final = 1 << 16
+KEY_MASK: Final = (1 << 64) - 1
+GENERATION_MASK: Final = 0xFF
+
+
+class TranspositionFlag(IntEnum):
+    """Flag enum for transposition table."""
+
+    LOWERBOUND = 0
+    EXACT = auto()
+    UPPERBOUND = auto()
+
+
+class TranspositionEntry(NamedTuple, Generic[Action]):
+    """Transposition table entry."""
+
+    depth: int
+    value: int | float
+    action: Action | None
+    flag: TranspositionFlag
+
+
+class TranspositionTable(Generic[Action]):
+    """Fixed capacity transposition table.
+
+    Entries live in arrays allocated up front, so memory use does not
+    grow however many positions are stored. Each bucket has a
+    depth-preferred entry, only replaced by a search at least as deep
+    or once it is from an older search, and an always-replace entry
+    that takes everything else.
+
+    Call new_search before each search so entries from older searches
+    can be replaced first.
+    """
+
+    __slots__ = (
+        "actions",
+        "depths",
+        "flags",
+        "generation",
+        "generations",
+        "keys",
+        "mask",
+        "values",
+    )
+
+    def __init__(self, buckets: int = DEFAULT_BUCKETS) -> None:
+        """Initialize table with buckets buckets, must be a power of two."""
+        if buckets <= 0 or buckets & (buckets - 1):
+            raise ValueError(f"buckets must be a power of two, not {buckets}")
+        self.mask = buckets - 1
+        entries = buckets * 2
+        self.keys = array("Q", bytes(8 * entries))
+        # Depth of -1 marks an empty entry
+        self.depths = array("h", [-1]) * entries
+        self.values = array("d", bytes(8 * entries))
+        self.flags = array("B", bytes(entries))
+        self.generations = array("B", bytes(entries))
+        self.actions: list[Action | None] = [None] * entries
+        self.generation = 0
+
+    def __len__(self) -> int:
+        """Return number of stored entries."""
+        return sum(1 for depth in self.depths if depth >= 0)
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of entries table can hold."""
+        return len(self.depths)
+
+    def new_search(self) -> None:
+        """Start a new search, ageing every stored entry."""
+        self.generation = (self.generation + 1) & GENERATION_MASK
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        entries = self.capacity
+        self.depths = array("h", [-1]) * entries
+        self.actions = [None] * entries
+
+    def get(self, key: int) -> TranspositionEntry[Action] | None:
+        """Return entry stored for key or None."""
+        key &= KEY_MASK
+        index = (key & self.mask) << 1
+        for entry in (index, index + 1):
+            if self.keys[entry] == key and self.depths[entry] >= 0:
+                return TranspositionEntry(
+                    self.depths[entry],
+                    self.values[entry],
+                    self.actions[entry],
+                    TranspositionFlag(self.flags[entry]),
+                )
+        return None
+
+    def _write(
+        self,
+        entry: int,
+        key: int,
+        depth: int,
+        value: int | float,
+        action: Action | None,
+        flag: int,
+    ) -> None:
+        """Write values to entry index."""
+        self.keys[entry] = key
+        self.depths[entry] = depth
+        self.values[entry] = value
+        self.actions[entry] = action
+        self.flags[entry] = flag
+        self.generations[entry] = self.generation
+
+    def store(
+        self,
+        key: int,
+        depth: int,
+        value: int | float,
+        action: Action | None,
+        flag: TranspositionFlag,
+    ) -> None:
+        """Store search result for key, replacing an older entry."""
+        key &= KEY_MASK
+        preferred = (key & self.mask) << 1
+        always = preferred + 1
+        depths = self.depths
+        keys = self.keys
+
+        stored_depth = depths[preferred]
+        if (
+            stored_depth < 0
+            or keys[preferred] == key
+            or depth >= stored_depth
+            or self.generations[preferred] != self.generation
+        ):
+            if stored_depth >= 0 and keys[preferred] != key:
+                # Keep displaced entry around in always-replace entry
+                self._write(
+                    always,
+                    keys[preferred],
+                    stored_depth,
+                    self.values[preferred],
+                    self.actions[preferred],
+                    self.flags[preferred],
+                )
+                self.generations[always] = self.generations[preferred]
+            elif keys[always] == key:
+                # Do not leave an older copy of this key behind
+                depths[always] = -1
+                self.actions[always] = None
+            self._write(preferred, key, depth, value, action, flag)
+            return
+        self._write(always, key, depth, value, action, flag)
+
+
+if __name__ == "__main__":
+    print(f"{__title__}\nProgrammed by {__author__}.\n")
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import pytest
+
+from checkers.state import Action
+from checkers_computer_players.arena import (
+    GameResult,
+    IllegalActionError,
+    MatchStats,
+    get_start_state,
+    play_game,
+    random_opening,
+    run_match,
+)
+from checkers_computer_players.example_ai import ComputerPlayer
+from checkers_computer_players.machine_client import RemoteState
+from checkers_computer_players.max_y_jumper_ai import MaxYJumperPlayer
+from checkers_computer_players.minimax_ai import MinimaxPlayer
+
+
+class IllegalPlayer(RemoteState):
+    """Player that moves a piece that does not exist."""
+
+    __slots__ = ()
+
+    async def perform_turn(self) -> Action:
+        """Return illegal action."""
+        return Action((0, 0), (1, 1))
+
+
+def test_random_opening() -> None:
+    opening = random_opening(3, 6)
+    assert opening == random_opening(3, 6)
+    assert len(opening) == 6
+    state = get_start_state()
+    for action in opening:
+        assert action in set(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(action)
+
+
+def test_match_stats() -> None:
+    stats = MatchStats()
+    stats.add(GameResult(1, 10), 1)
+    stats.add(GameResult(1, 20), 0)
+    stats.add(GameResult(None, 30), 0)
+    assert (stats.wins, stats.losses, stats.draws) == (1, 1, 1)
+    assert stats.score == 0.5
+    assert stats.report() == (
+        "3 games, 1 wins, 1 losses, 1 draws, score 50.0%, 20.0 plies per game"
+    )
+    assert MatchStats().score == 0.0
+
+
+@pytest.mark.trio
+async def test_play_game() -> None:
+    result = await play_game(MaxYJumperPlayer, ComputerPlayer)
+    assert 0 < result.plies <= 200
+    # Draws by rules are reported like draws by ply limit
+    assert result.winner in {0, 1, None}
+
+
+@pytest.mark.trio
+async def test_play_game_max_plies() -> None:
+    result = await play_game(MaxYJumperPlayer, ComputerPlayer, max_plies=5)
+    assert result == GameResult(None, 5)
+
+
+@pytest.mark.trio
+async def test_play_game_opening() -> None:
+    opening = random_opening(0, 3)
+    result = await play_game(
+        ComputerPlayer,
+        ComputerPlayer,
+        opening,
+        max_plies=0,
+    )
+    assert result == GameResult(None, 0)
+
+
+@pytest.mark.trio
+async def test_illegal_action() -> None:
+    with pytest.raises(IllegalActionError, match="IllegalPlayer"):
+        await play_game(IllegalPlayer, ComputerPlayer)
+
+
+@pytest.mark.trio
+async def test_minimax_plays_game() -> None:
+    result = await play_game(
+        MinimaxPlayer,
+        ComputerPlayer,
+        max_plies=6,
+        move_time_ns=10_000_000,
+    )
+    assert result.plies == 6
+
+
+def test_run_match() -> None:
+    stats = run_match(MaxYJumperPlayer, ComputerPlayer, 4, 2)
+    assert stats.games == 4
+    assert stats.plies > 0
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import random
+import sys
+from typing import cast
+
+import pytest
+
+from checkers.bitboard import BitboardState, get_layout
+from checkers.state import DRAW, Action, Rules, State, generate_pieces
+from checkers_computer_players.minimax_ai import CheckersMinimax
+
+
+def test_layout_odd_width() -> None:
+    with pytest.raises(ValueError, match="even board width"):
+        get_layout((7, 8))
+
+
+def test_layout_8x8_playable_count() -> None:
+    layout = get_layout((8, 8))
+    assert len(layout.bits) == 32
+    assert layout.playable.bit_count() == 32
+
+
+def test_round_trip() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    bitboard = BitboardState.from_state(state)
+    assert bitboard.to_state() == state
+    assert bitboard.pieces == state.pieces
+    assert hash(bitboard) == hash(state)
+
+
+def test_round_trip_keeps_history() -> None:
+    # Kings shuffling back and forth, one move from a repetition draw
+    state = State(
+        (8, 8),
+        {(1, 0): 2, (6, 7): 3},
+        rules=Rules(repetition_limit=2),
+    )
+    for action in (
+        Action((6, 7), (7, 6)),
+        Action((1, 0), (0, 1)),
+        Action((7, 6), (6, 7)),
+    ):
+        state = state.perform_action(action)
+    assert len(state.history) == 3
+    bitboard = BitboardState.from_state(state)
+    assert bitboard.history == state.history
+    round_trip = bitboard.to_state()
+    assert round_trip.history == state.history
+    assert hash(round_trip) == hash(state)
+    # History keys of both representations can be mixed
+    action = Action((0, 1), (1, 0))
+    assert state.perform_action(action).check_for_win() == DRAW
+    assert bitboard.perform_action(action).check_for_win() == DRAW
+    assert round_trip.perform_action(action).check_for_win() == DRAW
+
+
+def test_repetition_draw_survives_conversion() -> None:
+    rules = Rules(repetition_limit=2)
+    pieces = {(1, 0): 2, (4, 7): 3}
+    state = State((8, 8), pieces, rules=rules)
+    bitboard = BitboardState.from_pieces((8, 8), pieces, rules=rules)
+    for action in (
+        Action((4, 7), (5, 6)),
+        Action((1, 0), (0, 1)),
+        Action((5, 6), (4, 7)),
+        Action((0, 1), (1, 0)),
+    ):
+        state = state.perform_action(action)
+        bitboard = bitboard.perform_action(action)
+    # Python hashes large ints modulo a prime, so history must hold
+    # raw Zobrist keys for the two representations to agree
+    assert state.zobrist_key is not None
+    assert state.zobrist_key > sys.hash_info.modulus
+    assert bitboard.history == state.history
+    assert state.check_for_win() == DRAW
+    assert bitboard.check_for_win() == DRAW
+    assert BitboardState.from_state(state).check_for_win() == DRAW
+    assert bitboard.to_state().check_for_win() == DRAW
+
+
+def test_flying_kings_unsupported() -> None:
+    with pytest.raises(ValueError, match="flying kings"):
+        BitboardState((8, 8), (0, 0, 0, 0), rules=Rules(flying_kings=True))
+
+
+def test_from_pieces_unplayable_tile() -> None:
+    with pytest.raises(ValueError, match="not on a playable tile"):
+        BitboardState.from_pieces((8, 8), {(0, 0): 1})
+
+
+def assert_same_position(state: State, bitboard: BitboardState) -> None:
+    assert bitboard.to_state() == state
+    assert bitboard.zobrist_key == state.zobrist_key
+    assert bitboard.check_for_win() == state.check_for_win()
+    for player in range(2):
+        assert set(bitboard.get_all_actions(player)) == set(
+            state.get_all_actions(player),
+        )
+        assert sorted(bitboard.generate_action_list(player)) == sorted(
+            state.generate_action_list(player),
+        )
+        assert bitboard.has_jump(player) == state.has_jump(player)
+    for position in state.pieces:
+        assert bitboard.get_moves(position) == state.get_moves(position)
+        assert bitboard.get_jumps(position) == state.get_jumps(position)
+        assert bitboard.calculate_actions(
+            position,
+        ) == state.calculate_actions(position)
+
+
+@pytest.mark.parametrize(
+    ("size", "rules"),
+    [
+        ((8, 8), Rules()),
+        ((10, 10), Rules()),
+        ((6, 8), Rules()),
+        ((8, 8), Rules(pawn_jump_forward_only=False)),
+        ((8, 8), Rules(mandatory_capture=False)),
+    ],
+)
+def test_random_games_match_state(size: tuple[int, int], rules: Rules) -> None:
+    rng = random.Random(size[0] * 31 + size[1])  # noqa: S311
+    for _ in range(4):
+        state = State(size, generate_pieces(*size), rules=rules)
+        bitboard = BitboardState.from_state(state)
+        for _ in range(200):
+            assert_same_position(state, bitboard)
+            if state.check_for_win() is not None:
+                break
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            action = rng.choice(actions)
+            state = state.perform_action(action)
+            bitboard.push(action)
+            assert_same_position(state, bitboard)
+            assert bitboard.pop() == action
+            bitboard = bitboard.perform_action(action)
+
+
+def test_king_multi_jump() -> None:
+    pieces = {
+        (1, 2): 3,
+        (2, 3): 0,
+        (4, 3): 0,
+        (4, 5): 0,
+        (2, 5): 0,
+    }
+    state = State((8, 8), pieces)
+    bitboard = BitboardState.from_state(state)
+    assert bitboard.get_jumps((1, 2)) == state.get_jumps((1, 2))
+    action = Action((1, 2), (1, 6))
+    assert bitboard.perform_action(action).to_state() == state.perform_action(
+        action,
+    )
+
+
+def test_king_long_chain() -> None:
+    pieces = {
+        (0, 1): 3,
+        (1, 2): 0,
+        (3, 2): 0,
+        (5, 2): 0,
+        (1, 4): 0,
+        (3, 4): 0,
+        (5, 4): 0,
+        (6, 5): 0,
+    }
+    state = State((8, 8), pieces)
+    bitboard = BitboardState.from_state(state)
+    assert bitboard.get_jumps((0, 1)) == state.get_jumps((0, 1))
+
+
+def test_minimax_searches_bitboard() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    bitboard = BitboardState.from_state(state)
+    # BitboardState has the same interface as State
+    value, action = CheckersMinimax.iterative_deepening(
+        cast("State", bitboard),
+        1,
+        4,
+    )
+    expected_value, _action = CheckersMinimax.iterative_deepening(state, 1, 4)
+    assert value == pytest.approx(expected_value)
+    assert action in set(state.get_all_actions(state.get_turn()))
+    # Search restores the state it walks in place
+    assert bitboard.to_state() == state
+    assert bitboard.zobrist_key == state.zobrist_key
+    with pytest.raises(IndexError, match="empty undo stack"):
+        bitboard.pop()
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import random
+from collections import Counter
+
+import pytest
+
+from checkers.state import State, generate_pieces
+from checkers_computer_players.evaluation import (
+    MATERIAL_WEIGHTS,
+    EvaluationWeights,
+    Evaluator,
+    get_square_tables,
+)
+
+
+def random_positions(seed: int, count: int) -> list[State]:
+    # No need for cryptographic secure random
+    rng = random.Random(seed)  # noqa: S311
+    positions: list[State] = []
+    state = State((8, 8), generate_pieces(8, 8))
+    while len(positions) < count:
+        positions.append(state)
+        if state.check_for_win() is not None:
+            state = State((8, 8), generate_pieces(8, 8))
+            continue
+        actions = sorted(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(rng.choice(actions))
+    return positions
+
+
+def test_material_weights_count_pieces() -> None:
+    evaluator = Evaluator(MATERIAL_WEIGHTS)
+    for state in random_positions(0, 60):
+        if state.check_for_win() is not None:
+            continue
+        counts = Counter(state.pieces.values())
+        min_ = counts[0] + 3 * counts[2]
+        max_ = counts[1] + 3 * counts[3]
+        assert evaluator.evaluate(state) == pytest.approx(
+            (max_ - min_) / (max_ + min_ + 1),
+        )
+
+
+def test_start_position_is_even() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    assert Evaluator().evaluate(state) == 0
+
+
+def test_value_range() -> None:
+    evaluator = Evaluator(EvaluationWeights(runaway=100.0))
+    for state in random_positions(1, 60):
+        value = evaluator.evaluate(state)
+        if state.check_for_win() is None:
+            assert -1 < value < 1
+        else:
+            assert value in {-1, 1}
+
+
+def test_value_independent_of_piece_order() -> None:
+    state = random_positions(2, 20)[-1]
+    reversed_state = State(
+        state.size,
+        dict(reversed(state.pieces.items())),
+        state.turn,
+    )
+    evaluator = Evaluator()
+    assert evaluator.evaluate(state) == evaluator.evaluate(reversed_state)
+
+
+def test_runaway_pawn() -> None:
+    evaluator = Evaluator(EvaluationWeights(runaway=1.0))
+    baseline = Evaluator(EvaluationWeights(runaway=0.0))
+    # Nothing can stop black pawn at (3, 4), red king at (0, 1) is behind
+    state = State((8, 8), {(3, 4): 1, (0, 1): 2})
+    assert evaluator.evaluate(state) > baseline.evaluate(state)
+    # Red pawn at (5, 6) is in the way, and black pawn in its way
+    blocked = State((8, 8), {(3, 4): 1, (0, 1): 2, (5, 6): 0})
+    assert evaluator.evaluate(blocked) == baseline.evaluate(blocked)
+
+
+def test_square_tables_mirror() -> None:
+    tables = get_square_tables((8, 8))
+    for (x, y), value in tables.advancement[1].items():
+        assert tables.advancement[0][7 - x, 7 - y] == value
+    assert tables.back_rank[1][1, 0] == 1
+    assert tables.back_rank[0][0, 7] == 1
+    best = max(tables.centre.values())
+    assert tables.centre[3, 3] == tables.centre[4, 4] == best
+
+
+@pytest.mark.parametrize("weights", [EvaluationWeights(), MATERIAL_WEIGHTS])
+def test_batch_matches_evaluate(weights: EvaluationWeights) -> None:
+    pytest.importorskip("numpy")
+    evaluator = Evaluator(weights)
+    states = random_positions(3, 120)
+    batch = evaluator.evaluate_batch(states)
+    assert batch == pytest.approx([evaluator.evaluate(s) for s in states])
+
+
+def test_batch_sizes_must_match() -> None:
+    pytest.importorskip("numpy")
+    states = [
+        State((8, 8), generate_pieces(8, 8)),
+        State((10, 10), generate_pieces(10, 10)),
+    ]
+    with pytest.raises(ValueError, match="same board size"):
+        Evaluator().evaluate_batch(states)
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import pytest
+import trio.testing
+from libcomponent.component import ComponentManager, Event
+
+from checkers.client import GameClient
+from checkers.server import ServerClient
+from checkers.state import Action, Rules
+from checkers_computer_players.machine_client import RemoteState
+
+
+class WatchingState(RemoteState):
+    """Remote state that only keeps track of the game."""
+
+    __slots__ = ()
+
+    async def perform_turn(self) -> Action:
+        """Never called, playing_as event is not sent."""
+        raise NotImplementedError
+
+
+@pytest.mark.trio
+async def test_initial_config_sends_rules() -> None:
+    server_stream, client_stream = trio.testing.memory_stream_pair()
+    server_client = ServerClient.from_stream(0, stream=server_stream)
+    client = GameClient.from_stream("game_client", stream=client_stream)
+    remote = WatchingState()
+    manager = ComponentManager("manager")
+    manager.add_components((client, remote))
+
+    rules = Rules(
+        mandatory_capture=False,
+        board_size=(6, 6),
+        repetition_limit=0,
+    )
+    await server_client.handle_initial_config(
+        Event("initial_config->network", ((6, 6), 1, rules)),
+    )
+    await server_client.handle_create_piece(
+        Event("create_piece->network", ((1, 0), 1)),
+    )
+    for _ in range(2):
+        await client.raise_event(await client.read_event())
+
+    assert remote.state.size == (6, 6)
+    assert remote.state.rules == rules
+    assert remote.state.pieces == {(1, 0): 1}
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import itertools
+import random
+
+import pytest
+
+from checkers.state import Action, State, generate_pieces
+from checkers_computer_players import mcts_ai
+from checkers_computer_players.arena import play_game
+from checkers_computer_players.evaluation import Evaluator
+from checkers_computer_players.example_ai import ComputerPlayer
+from checkers_computer_players.mcts_ai import (
+    MCTSPlayer,
+    MonteCarloSearch,
+    PlayoutStats,
+    SearchTree,
+    rollout,
+    rollout_positions,
+)
+
+
+def start_state() -> State:
+    return State((8, 8), generate_pieces(8, 8))
+
+
+def test_expand_actions_round_trip() -> None:
+    # 20x20 has more tiles than fit in one byte
+    for size, turn in itertools.product(
+        ((8, 8), (10, 10), (20, 20)),
+        (True, False),
+    ):
+        state = State(size, generate_pieces(*size), turn)
+        tree = SearchTree(state)
+        tree.expand(0)
+        actions = [tree.get_action(child) for child in tree.get_children(0)]
+        assert sorted(actions) == sorted(
+            state.get_all_actions(state.get_turn()),
+        )
+
+
+def test_tree_board_too_large() -> None:
+    state = State((258, 256), {})
+    with pytest.raises(ValueError, match="not supported"):
+        SearchTree(state)
+
+
+def test_rollout_restores_state() -> None:
+    state = start_state()
+    # No need for cryptographic secure random
+    rng = random.Random(0)  # noqa: S311
+    for evaluator in (Evaluator(), None):
+        value = rollout(state, 8, evaluator, rng)
+        assert -1 <= value <= 1
+        assert state == start_state()
+        assert not state.history
+
+
+def test_rollout_positions_batch_evaluates() -> None:
+    start = start_state()
+    won = State((8, 8), {(1, 0): 1}, False)
+    positions = [
+        (dict(state.pieces), state.turn, state.history)
+        for state in (start, won)
+    ]
+    evaluator = Evaluator()
+    # Without random actions, values are those of the positions
+    values = rollout_positions((8, 8), start.rules, positions, 0, evaluator, 0)
+    assert values == pytest.approx(
+        [evaluator.evaluate(start), evaluator.evaluate(won)],
+    )
+    assert values[1] == 1.0
+    # Without an evaluator games are played to the end
+    values = rollout_positions((8, 8), start.rules, positions, 0, None, 0)
+    assert all(value in {-1.0, 0.0, 1.0} for value in values)
+    assert values[1] == 1.0
+
+
+def test_backpropagate_alternates_players() -> None:
+    tree = SearchTree(start_state())
+    path = tree.select()
+    tree.pop(path)
+    # Black performed the action leading to first node and won
+    tree.backpropagate(path, 1.0)
+    assert tree.rewards[path[1]] == 1.0
+    path = tree.select()
+    tree.pop(path)
+    path.append(tree.add_node(0, 1, 0.0))
+    # Red won, red performed the second action
+    tree.backpropagate(path, -1.0)
+    assert tree.rewards[path[1]] == 0.0
+    assert tree.rewards[path[2]] == 1.0
+
+
+def test_search_visits_every_action() -> None:
+    state = start_state()
+    search = MonteCarloSearch(evaluator=Evaluator(), seed=0)
+    stats = PlayoutStats()
+    action = search.search(state, 0, stats)
+    actions = set(state.get_all_actions(state.get_turn()))
+    assert action in actions
+    assert stats.playouts == len(actions)
+    assert search.tree is not None
+    children = search.tree.get_children(0)
+    assert all(search.tree.visits[child] == 1 for child in children)
+    # Search does not change the state it is given
+    assert state == start_state()
+
+
+def test_search_finds_winning_capture() -> None:
+    # Black can jump red's last piece or walk away
+    state = State((8, 8), {(2, 5): 1, (3, 6): 0, (6, 1): 1}, True)
+    search = MonteCarloSearch(evaluator=Evaluator(), seed=0)
+    action = search.search(state, 20_000_000)
+    assert action == Action((2, 5), (4, 7))
+
+
+def test_search_no_actions() -> None:
+    # Black pawn blocked by red pawns it cannot jump
+    blocked = State((8, 8), {(0, 5): 1, (1, 6): 0, (2, 7): 0}, True)
+    assert MonteCarloSearch().search(blocked, 0) is None
+    # Only action is played without searching
+    single = State((8, 8), {(0, 1): 1, (7, 6): 0}, True)
+    stats = PlayoutStats()
+    assert MonteCarloSearch().search(single, 0, stats) == Action(
+        (0, 1),
+        (1, 2),
+    )
+    assert stats.playouts == 0
+
+
+def test_subtree_reused() -> None:
+    state = start_state()
+    search = MonteCarloSearch(evaluator=Evaluator(), seed=1)
+    action = search.search(state, 50_000_000)
+    assert action is not None
+    state = state.perform_action(action)
+    reply = min(state.get_all_actions(state.get_turn()))
+    state = state.perform_action(reply)
+    tree = search.tree
+    assert tree is not None
+    node = tree.find(state)
+    assert node is not None
+    kept = tree.visits[node]
+
+    stats = PlayoutStats()
+    search.search(state, 0, stats)
+    assert stats.reused > 0
+    new_tree = search.tree
+    assert new_tree is not None
+    assert new_tree.visits[0] == kept + stats.playouts
+    # Children of every node stay together and add up to its visits
+    for node in range(len(new_tree)):
+        children = new_tree.get_children(node)
+        visits = sum(new_tree.visits[child] for child in children)
+        assert visits <= new_tree.visits[node]
+    # Unrelated position starts a new tree
+    assert search.set_root(start_state()) == 0
+
+
+def test_parallel_rollouts() -> None:
+    state = start_state()
+    with MonteCarloSearch(2, Evaluator(), seed=2) as search:
+        stats = PlayoutStats()
+        action = search.search(state, 0, stats)
+        assert action in set(state.get_all_actions(state.get_turn()))
+        assert stats.playouts > 0
+        assert search.executor is not None
+        # Virtual losses are all replaced by played out visits
+        tree = search.tree
+        assert tree is not None
+        visits = sum(tree.visits[child] for child in tree.get_children(0))
+        assert visits == tree.visits[0]
+    assert search.executor is None
+
+
+def test_parallel_search_visits_every_action(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # First batch has fewer playouts than there are actions
+    monkeypatch.setattr(mcts_ai, "ROLLOUTS_PER_TASK", 1)
+    state = start_state()
+    with MonteCarloSearch(2, Evaluator(), seed=3) as search:
+        search.search(state, 0)
+        tree = search.tree
+        assert tree is not None
+        children = tree.get_children(0)
+        assert len(children) > 2
+        assert all(tree.visits[child] >= 1 for child in children)
+
+
+@pytest.mark.trio
+async def test_mcts_plays_game() -> None:
+    result = await play_game(
+        MCTSPlayer,
+        ComputerPlayer,
+        max_plies=6,
+        move_time_ns=10_000_000,
+    )
+    assert result.plies == 6
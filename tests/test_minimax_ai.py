@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from math import inf as infinity
+
+import pytest
+from libcomponent.component import ComponentManager, Event
+
+from checkers.state import Action, Rules, State, generate_pieces
+from checkers_computer_players.evaluation import MATERIAL_WEIGHTS, Evaluator
+from checkers_computer_players.minimax_ai import (
+    CheckersMinimax,
+    MinimaxPlayer,
+    Ponder,
+    SearchContext,
+    SearchStats,
+)
+from checkers_computer_players.time_management import SearchTimeoutError
+from checkers_computer_players.transposition_table import (
+    TranspositionFlag,
+    TranspositionTable,
+)
+
+
+def test_alphabeta_in_place_matches_alphabeta() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    in_place = CheckersMinimax.alphabeta_in_place(state, 4)
+    copying = CheckersMinimax.alphabeta(state, 4)
+    assert in_place.value == copying.value
+    assert in_place.action == copying.action
+    # Search restores the state it was given
+    assert state == State((8, 8), generate_pieces(8, 8))
+
+
+def random_position(seed: int, plies: int) -> State:
+    # No need for cryptographic secure random
+    rng = random.Random(seed)  # noqa: S311
+    state = State((8, 8), generate_pieces(8, 8))
+    for _ in range(plies):
+        if state.check_for_win() is not None:
+            break
+        actions = sorted(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(rng.choice(actions))
+    return state
+
+
+class NoQuiescenceMinimax(CheckersMinimax):
+    """Checkers minimax that stops at depth limit."""
+
+    __slots__ = ()
+
+    USE_QUIESCENCE = False
+
+
+class MaterialMinimax(CheckersMinimax):
+    """Checkers minimax that only counts material."""
+
+    __slots__ = ()
+
+    EVALUATOR = Evaluator(MATERIAL_WEIGHTS)
+
+
+class MaterialHorizonMinimax(MaterialMinimax):
+    """Checkers minimax that only counts material and stops at depth limit."""
+
+    __slots__ = ()
+
+    USE_QUIESCENCE = False
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_transposition_search_matches_minimax(seed: int) -> None:
+    # Odd and even plies so both players are searched for
+    state = random_position(seed, 13 + seed % 2)
+    pieces = dict(state.pieces)
+    stats = SearchStats()
+    result = NoQuiescenceMinimax.alphabeta_transposition_table(
+        state,
+        3,
+        stats=stats,
+    )
+    assert result.value == CheckersMinimax.minimax(state, 3).value
+    assert state.pieces == pieces
+    assert stats.nodes > stats.expanded > 0
+
+
+def test_transposition_store_uses_original_window() -> None:
+    state = random_position(1, 14)
+    exact = CheckersMinimax.alphabeta_transposition_table(state, 3).value
+    color = 1 if state.get_turn() else -1
+    table: TranspositionTable[Action] = TranspositionTable(1 << 10)
+    # Window entirely above true value fails low
+    low = color * exact + 0.25
+    result = CheckersMinimax.negamax(
+        state,
+        3,
+        low,
+        low + 0.25,
+        SearchContext(table),
+    )
+    assert result.value <= low
+    entry = table.get(CheckersMinimax.hash_state(state))
+    assert entry is not None
+    assert entry.flag == TranspositionFlag.UPPERBOUND
+    assert entry.depth == 3
+
+
+def test_transposition_search_stores_best_action() -> None:
+    state = random_position(2, 10)
+    table: TranspositionTable[Action] = TranspositionTable(1 << 10)
+    result = CheckersMinimax.alphabeta_transposition_table(
+        state,
+        3,
+        table=table,
+    )
+    entry = table.get(CheckersMinimax.hash_state(state))
+    assert entry is not None
+    assert entry.flag == TranspositionFlag.EXACT
+    assert entry.action == result.action
+
+
+def test_search_stats_report() -> None:
+    stats = SearchStats(nodes=10, expanded=4, cutoffs=1, table_hits=2)
+    assert stats.cutoff_rate == 0.25
+    assert stats.report() == (
+        "depth 0, 10 nodes (0 quiescence), 4 expanded, "
+        "1 cutoffs (25.0%), 2 table hits, 0 researches, 0 tablebase hits, "
+        "0 repetitions"
+    )
+    assert SearchStats().cutoff_rate == 0.0
+
+
+def test_negamax_deadline_restores_state() -> None:
+    state = random_position(3, 12)
+    pieces = dict(state.pieces)
+    context = SearchContext(deadline_ns=0)
+    with pytest.raises(SearchTimeoutError):
+        CheckersMinimax.negamax(state, 8, -infinity, infinity, context)
+    assert state.pieces == pieces
+
+
+def test_iterative_deepening_stops_mid_depth() -> None:
+    state = random_position(4, 12)
+    stats = SearchStats()
+    start = time.perf_counter_ns()
+    result = CheckersMinimax.iterative_deepening(
+        state,
+        1,
+        60,
+        50_000_000,
+        stats=stats,
+    )
+    elapsed = time.perf_counter_ns() - start
+    assert result.action is not None
+    assert 1 <= stats.depth < 60
+    assert elapsed < 2_000_000_000
+    # Result is that of last completed depth
+    completed = CheckersMinimax.alphabeta_transposition_table(
+        state,
+        stats.depth,
+    )
+    assert result.value == completed.value
+
+
+def test_iterative_deepening_bounds_first_depth() -> None:
+    state = random_position(4, 12)
+    stats = SearchStats()
+    start = time.perf_counter_ns()
+    result = CheckersMinimax.iterative_deepening(
+        state,
+        30,
+        30,
+        50_000_000,
+        stats=stats,
+    )
+    assert time.perf_counter_ns() - start < 2_000_000_000
+    # First depth did not finish, so no depth is recorded
+    assert stats.depth == 0
+    assert result.action in set(state.get_all_actions(state.get_turn()))
+
+
+def test_first_ordered_action_prefers_table_action() -> None:
+    state = random_position(5, 12)
+    actions = sorted(state.get_all_actions(state.get_turn()))
+    context = SearchContext()
+    context.table.store(
+        CheckersMinimax.hash_state(state),
+        1,
+        0,
+        actions[-1],
+        TranspositionFlag.EXACT,
+    )
+    result = CheckersMinimax.first_ordered_action(state, context)
+    assert result.action == actions[-1]
+    assert result.value == CheckersMinimax.value(state)
+
+
+def test_quiescence_plays_out_forced_capture() -> None:
+    # Black must jump red pawn at (2, 3)
+    state = State((8, 8), {(1, 2): 1, (2, 3): 0, (7, 6): 0}, True)
+    assert MaterialMinimax.value(state) < 0
+    context = SearchContext()
+    value = MaterialMinimax.quiescence(state, -infinity, infinity, context, 0)
+    assert value == 0
+    assert context.stats.quiescence_nodes == 2
+    assert state.pieces == {(1, 2): 1, (2, 3): 0, (7, 6): 0}
+
+
+def test_quiescence_quiet_position_is_static() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    context = SearchContext()
+    value = CheckersMinimax.quiescence(state, -infinity, infinity, context, 0)
+    assert value == CheckersMinimax.value(state)
+    assert context.stats.nodes == context.stats.quiescence_nodes == 1
+
+
+def test_search_sees_capture_past_horizon() -> None:
+    # Both moves of black's last pawn walk into a jump
+    state = State((8, 8), {(3, 2): 1, (1, 4): 0, (5, 4): 0}, True)
+    horizon = MaterialHorizonMinimax.alphabeta_transposition_table(state, 1)
+    assert horizon.value == -0.25
+    with_quiescence = MaterialMinimax.alphabeta_transposition_table(state, 1)
+    assert with_quiescence.value == -1
+
+
+def test_search_scores_repetition_as_draw() -> None:
+    # Lone kings, black king moved away and can move back
+    state = State((8, 8), {(3, 4): 3, (6, 1): 2}, True)
+    state = state.perform_action(Action((3, 4), (4, 5)))
+    state = state.perform_action(Action((6, 1), (7, 0)))
+    history = state.history
+    back = state.perform_action(Action((4, 5), (3, 4)))
+    back = back.perform_action(Action((7, 0), (6, 1)))
+    assert CheckersMinimax.is_repetition(back)
+    context = SearchContext()
+    CheckersMinimax.negamax(state, 4, -infinity, infinity, context)
+    assert context.stats.repetitions > 0
+    # Search restores position history
+    assert state.history == history
+    no_draws = State(
+        (8, 8),
+        back.pieces,
+        rules=Rules(repetition_limit=0),
+        history=back.history,
+    )
+    assert not CheckersMinimax.is_repetition(no_draws)
+
+
+class PlainMinimax(CheckersMinimax):
+    """Checkers minimax with full windows."""
+
+    __slots__ = ()
+
+    USE_PVS = False
+    USE_ASPIRATION = False
+
+
+class PVSMinimax(CheckersMinimax):
+    """Checkers minimax with principal variation search."""
+
+    __slots__ = ()
+
+    USE_PVS = True
+    USE_ASPIRATION = True
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_pvs_matches_full_window(seed: int) -> None:
+    state = random_position(seed, 12 + seed % 2)
+    plain = PlainMinimax.alphabeta_transposition_table(state, 5)
+    stats = SearchStats()
+    pvs = PVSMinimax.alphabeta_transposition_table(state, 5, stats=stats)
+    assert pvs.value == plain.value
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_aspiration_matches_full_window(seed: int) -> None:
+    state = random_position(seed + 10, 12 + seed % 2)
+    plain = PlainMinimax.iterative_deepening(state, 1, 5)
+    aspiration = PVSMinimax.iterative_deepening(state, 1, 5)
+    assert aspiration.value == plain.value
+
+
+def test_aspiration_widens_window() -> None:
+    state = random_position(5, 12)
+    guess = CheckersMinimax.alphabeta_transposition_table(state, 3).value
+    stats = SearchStats()
+    # Guess far off true value fails and has to be searched again
+    result = CheckersMinimax.aspiration_search(
+        state,
+        3,
+        guess + 0.5,
+        SearchContext(stats=stats),
+    )
+    assert result.value == guess
+    assert stats.researches >= 1
+
+
+def test_principal_variation_is_legal() -> None:
+    state = random_position(7, 12)
+    pieces = dict(state.pieces)
+    table: TranspositionTable[Action] = TranspositionTable()
+    CheckersMinimax.alphabeta_transposition_table(state, 4, table=table)
+    variation = CheckersMinimax.get_principal_variation(state, table)
+    assert variation
+    # State is restored
+    assert state.pieces == pieces
+    for action in variation:
+        assert action in set(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(action)
+
+
+def test_ponder_stop() -> None:
+    state = random_position(8, 12)
+    action = min(state.get_all_actions(state.get_turn()))
+    ponder = Ponder(CheckersMinimax, state, action, TranspositionTable())
+    ponder.start()
+    time.sleep(0.05)
+    ponder.stop()
+    assert not ponder.thread.is_alive()
+    assert ponder.is_hit(state.perform_action(action))
+    assert not ponder.is_hit(state)
+
+
+@pytest.mark.trio
+async def test_player_ponder_hit() -> None:
+    player = MinimaxPlayer()
+    player.state = random_position(9, 12)
+    player.move_time_ns = 100_000_000
+    await player.perform_turn()
+    # Our reply was played, it is now the opponent's turn
+    opponent = player.state.perform_action(
+        min(player.state.get_all_actions(player.state.get_turn())),
+    )
+    player.state = opponent
+    player.start_pondering()
+    ponder = player.ponder
+    assert ponder is not None
+    # Opponent plays the predicted action
+    player.state = opponent.perform_action(ponder.predicted)
+    action = await player.perform_turn()
+    assert player.ponder_hits == 1
+    assert player.ponder is None
+    assert not ponder.thread.is_alive()
+    assert action in set(player.state.get_all_actions(player.state.get_turn()))
+
+
+@pytest.mark.trio
+async def test_game_over_stops_ponder_in_thread(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    player = MinimaxPlayer()
+    manager = ComponentManager("manager")
+    manager.add_component(player)
+    player.state = random_position(11, 12)
+    player.move_time_ns = 100_000_000
+    await player.perform_turn()
+    player.start_pondering()
+    ponder = player.ponder
+    assert ponder is not None
+    stopped_in: list[threading.Thread] = []
+    stop = Ponder.stop
+
+    def record_stop(self: Ponder) -> None:
+        stopped_in.append(threading.current_thread())
+        stop(self)
+
+    monkeypatch.setattr(Ponder, "stop", record_stop)
+    await player.handle_game_over(Event("game_over", 0))
+    assert player.ponder is None
+    assert not ponder.thread.is_alive()
+    # Joining search thread must not block the event loop
+    assert stopped_in
+    assert stopped_in[0] is not threading.main_thread()
+
+
+@pytest.mark.trio
+async def test_player_ponder_miss() -> None:
+    player = MinimaxPlayer()
+    player.state = random_position(10, 12)
+    player.move_time_ns = 100_000_000
+    await player.perform_turn()
+    opponent = player.state.perform_action(
+        min(player.state.get_all_actions(player.state.get_turn())),
+    )
+    player.state = opponent
+    player.start_pondering()
+    ponder = player.ponder
+    assert ponder is not None
+    actions = set(opponent.get_all_actions(opponent.get_turn()))
+    actions.discard(ponder.predicted)
+    if not actions:
+        pytest.skip("opponent has only the predicted action")
+    player.state = opponent.perform_action(min(actions))
+    action = await player.perform_turn()
+    assert player.ponder_hits == 0
+    assert not ponder.thread.is_alive()
+    assert action in set(player.state.get_all_actions(player.state.get_turn()))
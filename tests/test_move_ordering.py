@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import random
+from math import inf as infinity
+from typing import TYPE_CHECKING
+
+from checkers.state import Action, State, generate_pieces
+from checkers_computer_players.minimax_ai import CheckersMinimax, SearchContext
+from checkers_computer_players.move_ordering import MoveOrdering
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def test_order_classes() -> None:
+    ordering: MoveOrdering[str] = MoveOrdering()
+    ordering.record_cutoff("killer", 0, 0, 1)
+    ordering.history["history"] = 50
+    actions = [
+        ("quiet", 0),
+        ("history", 0),
+        ("killer", 0),
+        ("single", 1),
+        ("double", 2),
+        ("table", 0),
+    ]
+    assert [action for action, _ in ordering.order(actions, 0, "table")] == [
+        "table",
+        "double",
+        "single",
+        "killer",
+        "history",
+        "quiet",
+    ]
+
+
+def test_killers_per_ply() -> None:
+    ordering: MoveOrdering[str] = MoveOrdering()
+    for action in ("first", "second", "third"):
+        ordering.record_cutoff(action, 0, 2, 1)
+    assert ordering.killers[2] == ["third", "second"]
+    # Other plies are not affected
+    assert [
+        action for action, _ in ordering.order([("a", 0), ("third", 0)], 1)
+    ] == ["third", "a"]
+    assert ordering.killers[0] == []
+
+
+def test_captures_not_recorded() -> None:
+    ordering: MoveOrdering[str] = MoveOrdering()
+    ordering.record_cutoff("jump", 1, 0, 3)
+    assert ordering.killers == []
+    assert ordering.history == {}
+
+
+def test_new_search_ages_history() -> None:
+    ordering: MoveOrdering[str] = MoveOrdering()
+    ordering.record_cutoff("a", 0, 0, 3)
+    ordering.record_cutoff("b", 0, 0, 1)
+    ordering.new_search()
+    assert ordering.killers == []
+    assert ordering.history == {"a": 4}
+
+
+class GenerationOrder(MoveOrdering[Action]):
+    """Try table action first and everything else in generation order."""
+
+    __slots__ = ()
+
+    def order(
+        self,
+        actions: Iterable[tuple[Action, int]],
+        ply: int,
+        table_action: Action | None = None,
+    ) -> list[tuple[Action, int]]:
+        """Return actions with table action first."""
+        return sorted(
+            actions,
+            key=lambda item: item[0] == table_action,
+            reverse=True,
+        )
+
+
+def count_nodes(state: State, ordering: MoveOrdering[Action]) -> int:
+    context = SearchContext(ordering=ordering)
+    for depth in range(1, 6):
+        CheckersMinimax.search_root(state, depth, -infinity, infinity, context)
+    return context.stats.nodes
+
+
+def test_ordering_searches_fewer_nodes() -> None:
+    # No need for cryptographic secure random
+    rng = random.Random(0)  # noqa: S311
+    ordered = unordered = 0
+    for _ in range(4):
+        state = State((8, 8), generate_pieces(8, 8))
+        for _ in range(12):
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            state = state.perform_action(rng.choice(actions))
+        ordered += count_nodes(state, MoveOrdering())
+        unordered += count_nodes(state, GenerationOrder())
+    assert ordered < unordered
+
+
+def test_iterative_deepening_starts_new_search() -> None:
+    ordering: MoveOrdering[Action] = MoveOrdering()
+    # Cutoff from an earlier move, far deeper than this search reaches
+    stale = Action((0, 0), (1, 1))
+    ordering.record_cutoff(stale, 0, 30, 3)
+    state = State((8, 8), generate_pieces(8, 8))
+    CheckersMinimax.iterative_deepening(state, 1, 3, ordering=ordering)
+    assert len(ordering.killers) < 30
+    assert all(stale not in killers for killers in ordering.killers)
+    assert ordering.history[stale] == 4
+    # Search recorded cutoffs of its own
+    assert len(ordering.history) > 1
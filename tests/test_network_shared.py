@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from libcomponent.buffer import Buffer
 
-from checkers.network_shared import read_position, write_position
+from checkers.network_shared import (
+    read_position,
+    read_rules,
+    write_position,
+    write_rules,
+)
+from checkers.state import DEFAULT_RULES, INTERNATIONAL_RULES, Rules
 
 
 def test_read_position() -> None:
@@ -16,3 +22,14 @@ def test_write_position() -> None:
 
     write_position(buffer, (13, 18))
     assert buffer == b"\r\x12"
+
+
+def test_rules_round_trip() -> None:
+    for rules in (
+        DEFAULT_RULES,
+        INTERNATIONAL_RULES,
+        Rules(mandatory_capture=False, no_progress_limit=0),
+    ):
+        buffer = Buffer()
+        write_rules(buffer, rules)
+        assert read_rules(Buffer(buffer)) == rules
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+import trio
+
+from checkers.state import INTERNATIONAL_RULES, Action, State
+from checkers_computer_players.minimax_ai import CheckersMinimax, MinimaxPlayer
+from checkers_computer_players.opening_book import (
+    ENTRY,
+    BookEntry,
+    OpeningBook,
+    build,
+    decode_entry,
+    encode_entry,
+    get_start_state,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(scope="module")
+def book_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("book") / "book.ckob"
+    build(path, CheckersMinimax, 3, 2, 1)
+    return path
+
+
+def test_entry_round_trip() -> None:
+    entry = BookEntry(Action((1, 2), (0, 3)), -0.25, 8)
+    data = encode_entry(2**64 - 1, entry)
+    assert len(data) == ENTRY.size
+    assert decode_entry(data, 0) == (2**64 - 1, entry)
+
+
+def test_book_covers_opponent_actions(book_path: Path) -> None:
+    book = OpeningBook(book_path)
+    start = get_start_state()
+    entry = book.probe(start)
+    assert entry is not None
+    assert entry.depth == 2
+    state = start.perform_action(entry.action)
+    # Book answers every reply of red
+    for action in state.get_all_actions(state.get_turn()):
+        child = state.perform_action(action)
+        child_entry = book.probe(child)
+        assert child_entry is not None
+        assert child_entry.action in set(
+            child.get_all_actions(child.get_turn()),
+        )
+    # Red has a book for every black opening action
+    for action in start.get_all_actions(start.get_turn()):
+        assert book.probe(start.perform_action(action)) is not None
+    book.close()
+
+
+def test_probe_outside_book(book_path: Path) -> None:
+    book = OpeningBook(book_path)
+    assert len(book) > 0
+    assert book.probe(State((8, 8), {(1, 0): 2, (3, 0): 3})) is None
+    start = get_start_state()
+    assert (
+        book.probe(State((8, 8), start.pieces, rules=INTERNATIONAL_RULES))
+        is None
+    )
+    # Another position with the same key
+    assert book.get_entry(hash(start)) is not None
+    other = State((8, 8), {(1, 0): 2, (3, 0): 3}, zobrist_key=hash(start))
+    assert book.probe(other) is None
+    book.close()
+    assert book.probe(start) is None
+
+
+def test_missing_and_invalid_book(tmp_path: Path) -> None:
+    assert len(OpeningBook(tmp_path / "missing.ckob")) == 0
+    invalid = tmp_path / "invalid.ckob"
+    invalid.write_bytes(b"not a book, too short")
+    with pytest.raises(ValueError, match="not an opening book"):
+        OpeningBook(invalid)
+
+
+@pytest.mark.trio
+async def test_player_plays_book_action(book_path: Path) -> None:
+    book = OpeningBook(book_path)
+    MinimaxPlayer.OPENING_BOOK = book
+    try:
+        player = MinimaxPlayer()
+        player.state = get_start_state()
+        player.playing_as = 1
+        with trio.fail_after(1):
+            action = await player.perform_turn()
+    finally:
+        MinimaxPlayer.OPENING_BOOK = None
+    entry = book.probe(get_start_state())
+    assert entry is not None
+    assert action == entry.action
+    assert player.book_hits == 1
+    book.close()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from math import inf as infinity
+from typing import TYPE_CHECKING
+
+import pytest
+import trio
+
+from checkers.state import Action, State, generate_pieces
+from checkers_computer_players.evaluation import MATERIAL_WEIGHTS, Evaluator
+from checkers_computer_players.minimax_ai import (
+    CheckersMinimax,
+    MinimaxPlayer,
+    SearchStats,
+)
+from checkers_computer_players.parallel_search import (
+    ParallelSearch,
+    init_worker,
+    search_action,
+)
+from checkers_computer_players.tablebase import Tablebase, build
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class FullWindowMinimax(CheckersMinimax):
+    """Checkers material minimax without aspiration windows."""
+
+    __slots__ = ()
+
+    USE_ASPIRATION = False
+    # Worker tables are kept between root actions, so deeper results
+    # can be reused. Material values are coarse enough that this does
+    # not change the value compared to a serial search.
+    EVALUATOR = Evaluator(MATERIAL_WEIGHTS)
+
+
+def random_position(seed: int, plies: int) -> State:
+    # No need for cryptographic secure random
+    rng = random.Random(seed)  # noqa: S311
+    state = State((8, 8), generate_pieces(8, 8))
+    for _ in range(plies):
+        actions = sorted(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(rng.choice(actions))
+    return state
+
+
+def test_search_action_value() -> None:
+    state = random_position(0, 12)
+    action = min(state.get_all_actions(state.get_turn()))
+    result = search_action(
+        FullWindowMinimax,
+        state.size,
+        dict(state.pieces),
+        state.turn,
+        state.rules,
+        state.history,
+        action,
+        3,
+        -infinity,
+        infinity,
+        None,
+    )
+    assert result.action == action
+    assert result.nodes > 0
+    child = state.perform_action(action)
+    assert result.value == (
+        FullWindowMinimax.alphabeta_transposition_table(child, 2).value
+    )
+
+
+def test_search_action_deadline_passed() -> None:
+    state = random_position(1, 12)
+    action = min(state.get_all_actions(state.get_turn()))
+    result = search_action(
+        FullWindowMinimax,
+        state.size,
+        dict(state.pieces),
+        state.turn,
+        state.rules,
+        state.history,
+        action,
+        40,
+        -infinity,
+        infinity,
+        0,
+    )
+    assert result.value is None
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_parallel_search_matches_serial(seed: int) -> None:
+    state = random_position(seed, 12 + seed)
+    stats = SearchStats()
+    with ParallelSearch(FullWindowMinimax, 2) as parallel:
+        result = parallel.search(state, 3, stats=stats)
+    serial = FullWindowMinimax.alphabeta_transposition_table(state, 3)
+    assert result.value == serial.value
+    assert result.action in set(state.get_all_actions(state.get_turn()))
+    assert stats.depth == 3
+    assert stats.nodes > 0
+
+
+def test_parallel_search_time_limit() -> None:
+    state = random_position(2, 12)
+    stats = SearchStats()
+    start = time.perf_counter_ns()
+    with ParallelSearch(workers=2) as parallel:
+        result = parallel.search(state, 40, 100_000_000, stats)
+    assert time.perf_counter_ns() - start < 5_000_000_000
+    assert result.action is not None
+    assert 1 <= stats.depth < 40
+
+
+def test_parallel_search_depth_matches_serial() -> None:
+    state = random_position(4, 12)
+    time_limit_ns = 1_000_000_000
+    serial_stats = SearchStats()
+    CheckersMinimax.iterative_deepening(
+        state,
+        1,
+        40,
+        time_limit_ns,
+        stats=serial_stats,
+    )
+    parallel_stats = SearchStats()
+    with ParallelSearch() as parallel:
+        # Start worker processes outside of the time limit
+        parallel.search(state, 1)
+        parallel.search(state, 40, time_limit_ns, parallel_stats)
+    # Every root action finishes a depth before the next one starts,
+    # so actions queued behind others are not cut short by the deadline
+    assert parallel_stats.depth >= serial_stats.depth
+
+
+class TablebaseMinimax(CheckersMinimax):
+    """Checkers minimax that probes tablebases."""
+
+    __slots__ = ()
+
+
+def get_tablebase_directory(minimax: type[CheckersMinimax]) -> Path | None:
+    if minimax.TABLEBASE is None:
+        return None
+    return minimax.TABLEBASE.directory
+
+
+def test_spawned_workers_load_tablebase(tmp_path: Path) -> None:
+    build(tmp_path, 2, 1)
+    # Spawned workers do not inherit class attributes like forked ones
+    with ProcessPoolExecutor(
+        1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker,
+        initargs=(TablebaseMinimax, tmp_path),
+    ) as executor:
+        future = executor.submit(get_tablebase_directory, TablebaseMinimax)
+        assert future.result() == tmp_path
+    assert TablebaseMinimax.TABLEBASE is None
+    # Already loaded tablebases are kept
+    loaded = Tablebase(tmp_path)
+    TablebaseMinimax.TABLEBASE = loaded
+    try:
+        init_worker(TablebaseMinimax, tmp_path)
+        assert TablebaseMinimax.TABLEBASE is loaded
+    finally:
+        TablebaseMinimax.TABLEBASE = None
+        loaded.close()
+
+
+@pytest.mark.trio
+async def test_perform_turn_does_not_block_event_loop() -> None:
+    player = MinimaxPlayer()
+    player.state = random_position(3, 12)
+    player.move_time_ns = 300_000_000
+    ticks = 0
+    action: Action | None = None
+
+    async def think() -> None:
+        nonlocal action
+        action = await player.perform_turn()
+
+    async with trio.open_nursery() as nursery:
+        nursery.start_soon(think)
+        while action is None:
+            ticks += 1
+            await trio.sleep(0.01)
+    assert action in set(player.state.get_all_actions(player.state.get_turn()))
+    assert ticks > 1
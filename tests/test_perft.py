@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import pytest
+
+from checkers.perft import get_start_state, perft, perft_divide
+from checkers.state import (
+    CANADIAN_RULES,
+    DEFAULT_RULES,
+    INTERNATIONAL_RULES,
+    Pos,
+    Rules,
+    State,
+)
+
+# Published English draughts counts agree through depth 5, below that
+# this engine also counts stopping part way through a multi-jump.
+# Published international counts agree through depth 3, below that the
+# maximum capture rule is not implemented.
+
+
+@pytest.mark.parametrize(
+    ("rules", "counts"),
+    [
+        (DEFAULT_RULES, (7, 49, 302, 1469, 7361, 37205)),
+        (INTERNATIONAL_RULES, (9, 81, 658, 4299)),
+        (CANADIAN_RULES, (11, 121, 1452)),
+    ],
+)
+def test_perft_start(rules: Rules, counts: tuple[int, ...]) -> None:
+    state = get_start_state(rules)
+    for depth, nodes in enumerate(counts, 1):
+        assert perft(state, depth) == nodes
+
+
+@pytest.mark.parametrize(
+    ("pieces", "counts"),
+    [
+        (
+            {
+                (1, 2): 3,
+                (2, 3): 0,
+                (4, 3): 0,
+                (4, 5): 0,
+                (2, 5): 0,
+                (7, 6): 2,
+                (6, 1): 1,
+            },
+            (4, 19, 82, 407, 1702),
+        ),
+        (
+            {
+                (0, 1): 3,
+                (1, 2): 0,
+                (3, 2): 0,
+                (5, 2): 0,
+                (1, 4): 0,
+                (3, 4): 0,
+                (5, 4): 0,
+                (6, 5): 0,
+                (7, 0): 1,
+            },
+            (5, 11, 29, 93, 317),
+        ),
+    ],
+)
+def test_perft_custom(pieces: dict[Pos, int], counts: tuple[int, ...]) -> None:
+    state = State((8, 8), pieces, True)
+    for depth, nodes in enumerate(counts, 1):
+        assert perft(state, depth) == nodes
+
+
+def test_perft_matches_perform_action() -> None:
+    def slow_perft(state: State, depth: int) -> int:
+        if depth == 0:
+            return 1
+        return sum(
+            slow_perft(state.perform_action(action), depth - 1)
+            for action in state.get_all_actions(state.get_turn())
+        )
+
+    state = get_start_state(INTERNATIONAL_RULES)
+    assert perft(state, 3) == slow_perft(state, 3)
+
+
+def test_perft_restores_state() -> None:
+    state = get_start_state(DEFAULT_RULES)
+    original = get_start_state(DEFAULT_RULES)
+    perft(state, 4)
+    assert state == original
+    assert state.zobrist_key == original.zobrist_key
+
+
+def test_perft_depth_zero() -> None:
+    assert perft(get_start_state(DEFAULT_RULES), 0) == 1
+
+
+def test_perft_divide_sums_to_perft() -> None:
+    state = get_start_state(DEFAULT_RULES)
+    divide = perft_divide(state, 4)
+    assert len(divide) == 7
+    assert sum(divide.values()) == perft(state, 4)
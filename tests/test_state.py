@@ -0,0 +1,453 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from checkers.state import (
+    DRAW,
+    INTERNATIONAL_RULES,
+    Action,
+    Pos,
+    Rules,
+    State,
+    generate_pieces,
+    get_geometry,
+    get_move_generator,
+)
+
+
+def test_geometry_shared_between_states() -> None:
+    first = State((8, 8), generate_pieces(8, 8))
+    second = State((8, 8), {})
+    assert first.geometry is second.geometry
+    assert first.geometry is get_geometry((8, 8))
+    assert State((10, 10), {}).geometry is not first.geometry
+
+
+def test_geometry_moves_edges() -> None:
+    geometry = get_geometry((8, 8))
+    # Red pawn on the left edge can only move up right
+    assert geometry.moves[0][0, 5] == ((1, 4),)
+    # Black pawn moves down
+    assert geometry.moves[1][1, 0] == ((0, 1), (2, 1))
+    # Kings move in every direction
+    assert geometry.moves[2][3, 4] == ((2, 3), (4, 3), (2, 5), (4, 5))
+    assert geometry.moves[3][7, 7] == ((6, 6),)
+
+
+def test_geometry_jumps() -> None:
+    geometry = get_geometry((8, 8))
+    assert geometry.forward_jumps[0][2, 5] == (
+        ((1, 4), (0, 3)),
+        ((3, 4), (4, 3)),
+    )
+    assert geometry.forward_jumps[1][0, 7] == ()
+    assert geometry.all_jumps[1][0, 7] == (((1, 6), (2, 5)),)
+    assert geometry.forward_jumps[3][1, 0] == (((2, 1), (3, 2)),)
+
+
+def test_geometry_king_tiles() -> None:
+    geometry = get_geometry((8, 8))
+    assert (3, 0) in geometry.king_tiles[0]
+    assert (4, 7) in geometry.king_tiles[1]
+    assert (4, 7) not in geometry.king_tiles[0]
+
+
+def test_geometry_tiles() -> None:
+    geometry = get_geometry((8, 8))
+    assert len(geometry.tiles) == 32
+    assert geometry.tiles[:2] == ((1, 0), (3, 0))
+    assert all(
+        geometry.tiles[index] == tile
+        for tile, index in geometry.tile_indices.items()
+    )
+
+
+def test_get_moves_uses_occupancy() -> None:
+    state = State((8, 8), {(3, 4): 2, (2, 3): 1})
+    assert state.get_moves((3, 4)) == ((4, 3), (2, 5), (4, 5))
+
+
+def test_get_jumps_long_king_chain() -> None:
+    pieces = {
+        (0, 1): 3,
+        (1, 2): 0,
+        (3, 2): 0,
+        (5, 2): 0,
+        (1, 4): 0,
+        (3, 4): 0,
+        (5, 4): 0,
+        (6, 5): 0,
+    }
+    state = State((8, 8), dict(pieces))
+    jumps = state.get_jumps((0, 1))
+    # Chains are no longer cut off at a fixed depth
+    assert jumps[0, 5] == [(1, 2), (3, 2), (5, 2), (5, 4), (3, 4), (1, 4)]
+    # Longest path to a tile is kept
+    assert jumps[2, 3] == [(1, 2), (3, 2), (5, 2), (5, 4), (3, 4)]
+    # Search does not touch the board
+    assert state.pieces == pieces
+
+
+def test_zobrist_key_order_independent() -> None:
+    pieces = generate_pieces(8, 8)
+    reversed_pieces = dict(reversed(pieces.items()))
+    assert hash(State((8, 8), pieces)) == hash(State((8, 8), reversed_pieces))
+    assert hash(State((8, 8), pieces, True)) != hash(
+        State((8, 8), pieces, False),
+    )
+
+
+def test_zobrist_key_transposition() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    first = (
+        state.perform_action(Action((1, 2), (0, 3)))
+        .perform_action(Action((0, 5), (1, 4)))
+        .perform_action(Action((3, 2), (2, 3)))
+        .perform_action(Action((2, 5), (3, 4)))
+    )
+    second = (
+        state.perform_action(Action((3, 2), (2, 3)))
+        .perform_action(Action((2, 5), (3, 4)))
+        .perform_action(Action((1, 2), (0, 3)))
+        .perform_action(Action((0, 5), (1, 4)))
+    )
+    assert first == second
+    assert list(first.pieces) != list(second.pieces)
+    assert hash(first) == hash(second)
+
+
+def test_zobrist_key_incremental_matches_full() -> None:
+    rng = random.Random(3)  # noqa: S311
+    for _ in range(5):
+        state = State((8, 8), generate_pieces(8, 8))
+        for _ in range(300):
+            assert state.zobrist_key == state.calculate_zobrist_key()
+            if state.check_for_win() is not None:
+                break
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            state = state.perform_action(rng.choice(actions))
+
+
+def test_has_action_matches_get_all_actions() -> None:
+    rng = random.Random(4)  # noqa: S311
+    for _ in range(5):
+        state = State((8, 8), generate_pieces(8, 8))
+        for _ in range(300):
+            for player in range(2):
+                assert state.has_action(player) == any(
+                    True for _ in state.get_all_actions(player)
+                )
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            if not actions:
+                break
+            state = state.perform_action(rng.choice(actions))
+
+
+def test_has_jump_matches_generate_action_list() -> None:
+    # No need for cryptographic secure random
+    rng = random.Random(9)  # noqa: S311
+    state = State((8, 8), generate_pieces(8, 8))
+    for _ in range(80):
+        if state.check_for_win() is not None:
+            break
+        for player in range(2):
+            assert state.has_jump(player) == any(
+                mask for _, _, mask in state.generate_action_list(player)
+            )
+        actions = sorted(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(rng.choice(actions))
+
+
+def test_check_for_win_blocked() -> None:
+    # Black pawn blocked by red pawns it cannot jump
+    state = State((8, 8), {(0, 5): 1, (1, 6): 0, (2, 7): 0}, True)
+    assert not state.has_action(1)
+    assert state.has_action(0)
+    assert state.check_for_win() == 0
+    assert State((8, 8), state.pieces, False).check_for_win() is None
+
+
+def test_check_for_win_cached() -> None:
+    state = State((8, 8), {(1, 2): 1})
+    assert state.check_for_win() is None
+    # Pieces must not be modified after check, result stays cached
+    state.pieces.clear()
+    assert state.check_for_win() is None
+    assert State((8, 8), {}).check_for_win() == 0
+
+
+# Kings moving back and forth, back where they started every 4 plies
+KING_SHUFFLE = (
+    Action((3, 4), (4, 5)),
+    Action((6, 1), (7, 0)),
+    Action((4, 5), (3, 4)),
+    Action((7, 0), (6, 1)),
+)
+
+
+def shuffle_kings(rules: Rules, plies: int) -> State:
+    state = State((8, 8), {(3, 4): 3, (6, 1): 2}, rules=rules)
+    for ply in range(plies):
+        state = state.perform_action(KING_SHUFFLE[ply % 4])
+    return state
+
+
+def test_repetition_draw() -> None:
+    state = shuffle_kings(Rules(), 4)
+    assert state.is_repetition()
+    assert len(state.history) == 4
+    assert state.check_for_win() is None
+    # Third time the position occurs
+    assert shuffle_kings(Rules(), 7).check_for_win() is None
+    assert shuffle_kings(Rules(), 8).check_for_win() == DRAW
+    assert shuffle_kings(Rules(repetition_limit=0), 8).check_for_win() is None
+
+
+def test_no_progress_draw() -> None:
+    rules = Rules(no_progress_limit=6, repetition_limit=0)
+    assert shuffle_kings(rules, 5).check_for_win() is None
+    assert shuffle_kings(rules, 6).check_for_win() == DRAW
+    no_limit = Rules(no_progress_limit=0, repetition_limit=0)
+    assert shuffle_kings(no_limit, 200).check_for_win() is None
+
+
+def test_pawn_move_and_capture_reset_history() -> None:
+    state = State((8, 8), {(3, 4): 3, (6, 1): 2, (0, 1): 0})
+    state = state.perform_action(Action((3, 4), (4, 5)))
+    history = state.history
+    assert len(history) == 1
+    pawn = state.perform_action(Action((0, 1), (1, 0)))
+    assert not pawn.history
+    state.push(Action((0, 1), (1, 0)))
+    assert not state.history
+    state.pop()
+    assert state.history == history
+    jump = State((8, 8), {(2, 5): 1, (3, 6): 2}, history=(1, 2))
+    assert not jump.perform_action(Action((2, 5), (4, 7))).history
+
+
+def test_push_pop_matches_perform_action() -> None:
+    rng = random.Random(5)  # noqa: S311
+    for _ in range(5):
+        state = State((8, 8), generate_pieces(8, 8))
+        in_place = State((8, 8), generate_pieces(8, 8))
+        history = []
+        for _ in range(300):
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            if not actions:
+                break
+            action = rng.choice(actions)
+            history.append(state)
+            state = state.perform_action(action)
+            in_place.push(action)
+            assert in_place == state
+            assert hash(in_place) == hash(state)
+            assert in_place.check_for_win() == state.check_for_win()
+            assert in_place.history == state.history
+        while history:
+            in_place.pop()
+            expect = history.pop()
+            assert in_place == expect
+            assert hash(in_place) == hash(expect)
+            assert in_place.history == expect.history
+
+
+def test_push_pop_jump_and_king() -> None:
+    state = State((8, 8), {(2, 5): 1, (3, 6): 0}, True)
+    original = State((8, 8), dict(state.pieces), True)
+    state.push(Action((2, 5), (4, 7)))
+    assert state.pieces == {(4, 7): 3}
+    assert state.pop() == Action((2, 5), (4, 7))
+    assert state == original
+    assert hash(state) == hash(original)
+
+
+def test_pop_empty() -> None:
+    state = State((8, 8), {})
+    with pytest.raises(IndexError, match="empty undo stack"):
+        state.pop()
+
+
+def test_action_sets_mandatory_capture() -> None:
+    state = State((8, 8), {(1, 2): 1, (2, 3): 0, (5, 2): 1}, True)
+    action_sets = state.get_action_sets(1)
+    # Only piece that can jump may act
+    assert set(action_sets) == {(1, 2)}
+    assert action_sets[1, 2].ends == {(3, 4)}
+    assert state.calculate_actions((5, 2)).ends == set()
+    # Red pieces get their own cached action sets
+    assert state.calculate_actions((2, 3)).ends == {(0, 1)}
+
+
+def test_calculate_actions_cached() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    first = state.calculate_actions((1, 2))
+    assert first.ends == {(0, 3), (2, 3)}
+    assert state.calculate_actions((1, 2)) is first
+    state.push(Action((1, 2), (0, 3)))
+    assert state.calculate_actions((0, 5)).ends == {(1, 4)}
+    state.pop()
+    assert state.calculate_actions((1, 2)) == first
+
+
+def test_move_generator_shared_per_rules() -> None:
+    rules = Rules(flying_kings=True)
+    first = State((8, 8), {}, rules=rules)
+    assert (
+        first.move_generator is State((8, 8), {}, rules=rules).move_generator
+    )
+    assert first.move_generator is get_move_generator((8, 8), rules)
+    assert first.move_generator is not State((8, 8), {}).move_generator
+    assert first.geometry is State((8, 8), {}).geometry
+
+
+def test_rules_carried_by_perform_action() -> None:
+    state = State((10, 10), generate_pieces(10, 10), rules=INTERNATIONAL_RULES)
+    action = next(state.get_all_actions(state.get_turn()))
+    assert state.perform_action(action).rules is INTERNATIONAL_RULES
+
+
+def test_pawn_backwards_capture() -> None:
+    pieces = {(3, 4): 1, (2, 3): 0}
+    forward_only = State((8, 8), pieces)
+    assert forward_only.get_jumps((3, 4)) == {}
+    backwards = State(
+        (8, 8),
+        pieces,
+        rules=Rules(pawn_jump_forward_only=False),
+    )
+    assert backwards.get_jumps((3, 4)) == {(1, 2): [(2, 3)]}
+
+
+def test_capture_not_mandatory() -> None:
+    pieces = {(1, 2): 1, (2, 3): 0, (5, 2): 1}
+    mandatory = State((8, 8), pieces)
+    assert set(mandatory.get_all_actions(1)) == {Action((1, 2), (3, 4))}
+    optional = State((8, 8), pieces, rules=Rules(mandatory_capture=False))
+    assert set(optional.get_all_actions(1)) == {
+        Action((1, 2), (3, 4)),
+        Action((1, 2), (0, 3)),
+        Action((5, 2), (4, 3)),
+        Action((5, 2), (6, 3)),
+    }
+    assert optional.calculate_actions((5, 2)).ends == {(4, 3), (6, 3)}
+
+
+def test_same_position_different_rules() -> None:
+    pieces = {(0, 7): 2, (5, 2): 1}
+    short = State((8, 8), pieces, False)
+    flying = State((8, 8), pieces, False, Rules(flying_kings=True))
+    assert short.get_moves((0, 7)) == ((1, 6),)
+    assert flying.get_moves((0, 7)) == ((1, 6), (2, 5), (3, 4), (4, 3))
+
+
+def test_flying_king_jump() -> None:
+    rules = Rules(flying_kings=True)
+    state = State((8, 8), {(0, 7): 2, (3, 4): 1, (6, 3): 1}, False, rules)
+    jumps = state.get_jumps((0, 7))
+    assert jumps == {
+        (4, 3): [(3, 4)],
+        (5, 2): [(3, 4)],
+        (6, 1): [(3, 4)],
+        (7, 0): [(3, 4)],
+        # Second jump over (6, 3) after landing on (5, 2)
+        (7, 4): [(3, 4), (6, 3)],
+    }
+
+
+class RecordingState(State):
+    """State that records piece moved events."""
+
+    __slots__ = ("moved",)
+
+    def __post_init__(self) -> None:
+        """Initialize moved list."""
+        super().__post_init__()
+        self.moved: list[tuple[Pos, Pos]] = []
+
+    def piece_moved(self, start_pos: Pos, end_pos: Pos) -> None:
+        """Record piece moved."""
+        self.moved.append((start_pos, end_pos))
+
+
+def test_flying_king_perform_action_landings() -> None:
+    rules = Rules(flying_kings=True)
+    pieces = {(0, 7): 2, (3, 4): 1, (6, 3): 1}
+    state = RecordingState((8, 8), pieces, False, rules)
+    new = state.perform_action(Action((0, 7), (7, 4)))
+    assert state.moved == [((0, 7), (5, 2)), ((5, 2), (7, 4))]
+    assert new.pieces == {(7, 4): 2}
+    assert new.zobrist_key == new.calculate_zobrist_key()
+
+    in_place = State((8, 8), dict(pieces), False, rules)
+    in_place.push(Action((0, 7), (7, 4)))
+    assert in_place == State((8, 8), {(7, 4): 2}, True, rules)
+    in_place.pop()
+    assert in_place.pieces == pieces
+
+
+def test_flying_king_captured_pieces_block() -> None:
+    rules = Rules(flying_kings=True)
+    # After jumping (2, 5) going up right, the king can not come back
+    # through the captured piece
+    state = State((8, 8), {(0, 7): 2, (2, 5): 1, (5, 2): 1}, False, rules)
+    for path in state.get_jumps((0, 7)).values():
+        assert len(path) == len(set(path))
+
+
+def test_international_random_games() -> None:
+    rng = random.Random(6)  # noqa: S311
+    size = INTERNATIONAL_RULES.board_size
+    for _ in range(3):
+        state = State(size, generate_pieces(*size), rules=INTERNATIONAL_RULES)
+        in_place = State(
+            size,
+            generate_pieces(*size),
+            rules=INTERNATIONAL_RULES,
+        )
+        for _ in range(300):
+            assert state.has_action(state.get_turn()) == bool(
+                state.get_action_sets(state.get_turn()),
+            )
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            if not actions:
+                break
+            action = rng.choice(actions)
+            state = state.perform_action(action)
+            in_place.push(action)
+            assert in_place == state
+            assert in_place.zobrist_key == state.zobrist_key
+            assert state.zobrist_key == state.calculate_zobrist_key()
+
+
+@pytest.mark.parametrize(
+    "rules",
+    [Rules(), Rules(mandatory_capture=False), INTERNATIONAL_RULES],
+)
+def test_generate_action_list_matches_get_all_actions(rules: Rules) -> None:
+    rng = random.Random(7)  # noqa: S311
+    size = rules.board_size
+    for _ in range(3):
+        state = State(size, generate_pieces(*size), rules=rules)
+        for _ in range(200):
+            records = state.generate_action_list()
+            actions = list(state.get_all_actions(state.get_turn()))
+            assert sorted(Action(*record[:2]) for record in records) == sorted(
+                actions,
+            )
+            for from_pos, to_pos, mask in records:
+                jumped = state.get_jumps(from_pos).get(to_pos, [])
+                assert sorted(state.geometry.get_mask_positions(mask)) == (
+                    sorted(jumped)
+                )
+            if not actions:
+                break
+            state = state.perform_action(rng.choice(sorted(actions)))
+
+
+def test_generate_action_list_player() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    assert len(state.generate_action_list()) == 7
+    assert {record[0][1] for record in state.generate_action_list(0)} == {5}
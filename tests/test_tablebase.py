@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import random
+from math import inf as infinity
+from typing import TYPE_CHECKING
+
+import pytest
+
+from checkers.state import State
+from checkers_computer_players.minimax_ai import CheckersMinimax, SearchContext
+from checkers_computer_players.tablebase import (
+    ENTRIES_OFFSET,
+    Outcome,
+    Signature,
+    Tablebase,
+    TablebaseResult,
+    build,
+    decode_result,
+    encode_result,
+    get_index,
+    get_position,
+    get_signatures,
+    rank_tiles,
+    unrank_tiles,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture(scope="module")
+def tablebase_directory(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    directory = tmp_path_factory.mktemp("tablebase")
+    build(directory, 2, 1)
+    return directory
+
+
+def solve(state: State, depth: int) -> int:
+    """Return 1 if player to move wins within depth, -1 if they lose, else 0."""
+    if state.check_for_win() is not None:
+        return -1
+    if not depth:
+        return 0
+    best = -1
+    for action in state.get_all_actions(state.get_turn()):
+        best = max(best, -solve(state.perform_action(action), depth - 1))
+        if best == 1:
+            break
+    return best
+
+
+def test_rank_round_trip() -> None:
+    for tiles in ([], [0], [3, 17], [0, 1, 31], [5, 9, 20, 30]):
+        assert unrank_tiles(rank_tiles(tiles), len(tiles)) == tiles
+
+
+def test_index_round_trip() -> None:
+    signature = Signature(1, 1, 0, 1)
+    # No need for cryptographic secure random
+    rng = random.Random(0)  # noqa: S311
+    positions = 0
+    while positions < 50:
+        index = rng.randrange(signature.position_count)
+        position = get_position(signature, index)
+        if position is None:
+            continue
+        positions += 1
+        assert get_index(signature, *position) == index
+
+
+def test_invalid_positions() -> None:
+    signature = Signature(1, 0, 0, 1)
+    valid = {(1, 2): 0, (3, 0): 3}
+    assert get_position(signature, get_index(signature, valid, True)) == (
+        valid,
+        True,
+    )
+    # Red pawn on row 0 would have been kinged
+    kinged = {(1, 0): 0, (3, 0): 3}
+    assert get_position(signature, get_index(signature, kinged, True)) is None
+
+
+def test_signature_order() -> None:
+    signatures = get_signatures(3)
+    assert Signature(0, 0, 1, 1) in signatures
+    # Every side has a piece
+    assert Signature(0, 0, 0, 2) not in signatures
+    # Pawns come after kings they promote into
+    assert signatures.index(Signature(0, 0, 1, 1)) < signatures.index(
+        Signature(0, 1, 1, 0),
+    )
+
+
+def test_encode_round_trip() -> None:
+    for result in (
+        TablebaseResult(Outcome.DRAW, 0),
+        TablebaseResult(Outcome.LOSS, 0),
+        TablebaseResult(Outcome.WIN, 1),
+        TablebaseResult(Outcome.LOSS, 252),
+        TablebaseResult(Outcome.WIN, 253),
+    ):
+        assert decode_result(encode_result(result)) == result
+    with pytest.raises(ValueError, match="too long"):
+        encode_result(TablebaseResult(Outcome.WIN, 255))
+
+
+def test_probe_matches_search(tablebase_directory: Path) -> None:
+    tablebase = Tablebase(tablebase_directory)
+    assert tablebase.max_pieces == 2
+    signature = Signature(1, 0, 0, 1)
+    table = tablebase.get_table(signature)
+    assert table is not None
+    outcomes = set()
+    for index in range(signature.position_count):
+        position = get_position(signature, index)
+        if position is None:
+            continue
+        state = State((8, 8), *position)
+        result = tablebase.probe(state)
+        assert result == decode_result(table[ENTRIES_OFFSET + index])
+        outcomes.add(result.outcome)
+        if result.outcome == Outcome.DRAW or result.distance > 5:
+            continue
+        expected = 1 if result.outcome == Outcome.WIN else -1
+        assert solve(state, result.distance) == expected
+        if result.distance:
+            assert solve(state, result.distance - 1) == 0
+    assert outcomes == set(Outcome)
+    tablebase.close()
+
+
+def test_probe_outside_tablebase(tablebase_directory: Path) -> None:
+    tablebase = Tablebase(tablebase_directory)
+    three = State((8, 8), {(1, 0): 2, (3, 0): 3, (5, 0): 3})
+    assert tablebase.probe(three) is None
+    small = State((6, 6), {(1, 0): 2, (3, 0): 3})
+    assert tablebase.probe(small) is None
+    assert Tablebase(tablebase_directory / "missing").max_pieces == 0
+
+
+def test_build_resumes(tablebase_directory: Path) -> None:
+    assert build(tablebase_directory, 2, 1) == []
+    path = tablebase_directory / Signature(0, 0, 1, 1).filename
+    complete = path.read_bytes()
+    # Interrupted write
+    path.write_bytes(complete[:100])
+    assert Signature(0, 0, 1, 1) not in Tablebase(tablebase_directory)
+    assert build(tablebase_directory, 2, 1) == [Signature(0, 0, 1, 1)]
+    assert path.read_bytes() == complete
+
+
+class TablebaseMinimax(CheckersMinimax):
+    """Checkers minimax that probes tablebases."""
+
+    __slots__ = ()
+
+
+def test_search_probes_tablebase(tablebase_directory: Path) -> None:
+    TablebaseMinimax.TABLEBASE = Tablebase(tablebase_directory)
+    # Black king against red pawn, black to move
+    state = State((8, 8), {(2, 3): 0, (5, 0): 3}, True)
+    result = TablebaseMinimax.TABLEBASE.probe(state)
+    assert result is not None
+    context = SearchContext()
+    best = TablebaseMinimax.search_root(
+        state,
+        2,
+        -infinity,
+        infinity,
+        context,
+    )
+    assert context.stats.tablebase_hits > 0
+    assert best.action is not None
+    child = TablebaseMinimax.TABLEBASE.probe(
+        state.perform_action(best.action),
+    )
+    assert child is not None
+    # Best action keeps the tablebase result
+    assert child.outcome == -result.outcome
+    TablebaseMinimax.TABLEBASE.close()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import pytest
+
+from checkers.state import State, generate_pieces
+from checkers_computer_players.time_management import (
+    MAX_CLOCK_FRACTION,
+    allocate_time,
+    get_game_phase,
+    get_phase_factor,
+)
+
+
+def test_game_phase() -> None:
+    assert get_game_phase(State((8, 8), generate_pieces(8, 8))) == 0.0
+    assert get_game_phase(State((8, 8), {(0, 1): 1, (7, 6): 0})) == 1 - 2 / 24
+    assert get_game_phase(State((8, 8), {})) == 1.0
+
+
+def test_phase_factor() -> None:
+    assert get_phase_factor(0.0) == 0.4
+    assert get_phase_factor(0.25) == pytest.approx(0.7)
+    assert get_phase_factor(0.5) == 1.0
+    assert get_phase_factor(1.0) == 0.7
+
+
+def test_middlegame_gets_most_time() -> None:
+    opening = State((8, 8), generate_pieces(8, 8))
+    pieces = dict(list(generate_pieces(8, 8).items())[6:18])
+    middlegame = State((8, 8), pieces)
+    assert allocate_time(opening, 1000) == 400
+    assert allocate_time(middlegame, 1000) == 1000
+
+
+def test_clock_limits_budget() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    # Clock shared over estimated 30 moves left
+    assert allocate_time(state, 10**9, 3 * 10**6) == 10**5
+    assert allocate_time(state, 10**9, 3 * 10**6, 10**4) == 11 * 10**4
+    # Plenty of clock, move time is the limit
+    assert allocate_time(state, 1000, 10**9) == 400
+
+
+def test_clock_fraction_cap() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    assert allocate_time(state, 10**9, 1000, 10**6) == 500
+
+
+def test_budget_never_exceeds_move_time_or_clock() -> None:
+    pieces = list(generate_pieces(8, 8).items())
+    for count in range(len(pieces) + 1):
+        state = State((8, 8), dict(pieces[:count]))
+        assert allocate_time(state, 5 * 10**9) <= 5 * 10**9
+        for clock in (10**3, 10**6, 10**9, 10**12):
+            for increment in (0, 10**9):
+                budget = allocate_time(state, 5 * 10**9, clock, increment)
+                assert budget <= min(5 * 10**9, clock * MAX_CLOCK_FRACTION)
+
+
+@pytest.mark.parametrize("clock", [0, -5])
+def test_no_clock_left(clock: int) -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    assert allocate_time(state, 10**9, clock) == 0
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING
+
+import pytest
+
+from checkers_computer_players.arena import GameResult, MatchStats
+from checkers_computer_players.example_ai import ComputerPlayer
+from checkers_computer_players.max_y_jumper_ai import MaxYJumperPlayer
+from checkers_computer_players.tournament import (
+    SPRT,
+    Mode,
+    Pairing,
+    ResultsFile,
+    SPRTDecision,
+    Tournament,
+    elo_interval,
+    elo_to_score,
+    score_to_elo,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_elo_score_round_trip() -> None:
+    for elo in (-400.0, -35.0, 0.0, 10.0, 200.0):
+        assert score_to_elo(elo_to_score(elo)) == pytest.approx(elo)
+    assert elo_to_score(0) == 0.5
+    assert score_to_elo(0) == -math.inf
+    assert score_to_elo(1) == math.inf
+
+
+def test_elo_interval() -> None:
+    elo, lower, upper = elo_interval(MatchStats(60, 40, 0))
+    assert lower < elo < upper
+    assert elo == pytest.approx(score_to_elo(0.6))
+    # More games, narrower interval
+    _, wide_lower, wide_upper = elo_interval(MatchStats(6, 4, 0))
+    assert wide_upper - wide_lower > upper - lower
+
+
+def test_sprt_decisions() -> None:
+    sprt = SPRT(0, 20)
+    assert sprt.decide(MatchStats(1, 1, 0)) is None
+    assert sprt.decide(MatchStats(700, 300, 0)) == SPRTDecision.H1
+    assert sprt.decide(MatchStats(300, 700, 0)) == SPRTDecision.H0
+    # One sided results still decide
+    assert sprt.decide(MatchStats(0, 40, 0)) == SPRTDecision.H0
+    assert sprt.decide(MatchStats(0, 0, 0)) is None
+
+
+def test_results_file_resume(tmp_path: Path) -> None:
+    path = tmp_path / "results.txt"
+    results = ResultsFile(path, "settings")
+    assert results.load() == {}
+    results.create()
+    results.append(Pairing("a", "b"), 0, GameResult(1, 40))
+    results.append(Pairing("a", "b"), 1, GameResult(None, 200))
+    # Interrupted while writing a line
+    with path.open("a", encoding="utf-8") as file:
+        file.write("a b 2 L")
+    assert results.load() == {
+        Pairing("a", "b"): {0: GameResult(1, 40), 1: GameResult(None, 200)},
+    }
+    results.append(Pairing("a", "b"), 2, GameResult(0, 30))
+    assert results.load()[Pairing("a", "b")][2] == GameResult(0, 30)
+    with pytest.raises(ValueError, match="other settings"):
+        ResultsFile(path, "other").load()
+
+
+def test_pairings(tmp_path: Path) -> None:
+    players = {
+        "a": ComputerPlayer,
+        "b": MaxYJumperPlayer,
+        "c": ComputerPlayer,
+    }
+    round_robin = Tournament(players, 2, tmp_path / "r.txt")
+    assert round_robin.pairings == [
+        Pairing("a", "b"),
+        Pairing("a", "c"),
+        Pairing("b", "c"),
+    ]
+    gauntlet = Tournament(players, 2, tmp_path / "g.txt", Mode.GAUNTLET)
+    assert gauntlet.pairings == [Pairing("a", "b"), Pairing("a", "c")]
+    with pytest.raises(ValueError, match="two players"):
+        Tournament({"a": ComputerPlayer}, 2, tmp_path / "x.txt")
+
+
+def test_tournament_resumes(tmp_path: Path) -> None:
+    path = tmp_path / "results.txt"
+    players = {"jumper": MaxYJumperPlayer, "random": ComputerPlayer}
+    tournament = Tournament(players, 4, path, workers=2)
+    states = tournament.run()
+    stats = states[Pairing("jumper", "random")].stats
+    assert stats.games == 4
+    assert len(path.read_text(encoding="utf-8").splitlines()) == 5
+
+    # Nothing left to play, results come from file
+    again = Tournament(players, 4, path, workers=2).run()
+    assert again[Pairing("jumper", "random")].stats == stats
+    more = Tournament(players, 6, path, workers=2).run()
+    assert more[Pairing("jumper", "random")].stats.games == 6
+    assert "jumper vs random: 6 games" in tournament.report(more)
+
+
+def test_tournament_sprt_stops_early(tmp_path: Path) -> None:
+    # Any result decides a test between such far apart hypotheses
+    tournament = Tournament(
+        {"jumper": MaxYJumperPlayer, "random": ComputerPlayer},
+        200,
+        tmp_path / "results.txt",
+        sprt=SPRT(-2000, 2000),
+        workers=1,
+    )
+    state = tournament.run()[Pairing("jumper", "random")]
+    assert state.decision is not None
+    assert state.stats.games < 200
+    assert "LLR" in tournament.report({Pairing("jumper", "random"): state})
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import pytest
+
+from checkers.state import Action, State, generate_pieces
+from checkers_computer_players.minimax_ai import CheckersMinimax
+from checkers_computer_players.transposition_table import (
+    TranspositionEntry,
+    TranspositionFlag,
+    TranspositionTable,
+)
+
+EXACT = TranspositionFlag.EXACT
+
+
+def test_buckets_power_of_two() -> None:
+    with pytest.raises(ValueError, match="power of two"):
+        TranspositionTable(3)
+
+
+def test_store_get() -> None:
+    table: TranspositionTable[str] = TranspositionTable(4)
+    assert table.get(5) is None
+    table.store(5, 3, 0.5, "action", EXACT)
+    assert table.get(5) == TranspositionEntry(3, 0.5, "action", EXACT)
+    assert len(table) == 1
+
+
+def test_negative_key() -> None:
+    table: TranspositionTable[str] = TranspositionTable(4)
+    table.store(-7, 1, 1, None, TranspositionFlag.LOWERBOUND)
+    entry = table.get(-7)
+    assert entry is not None
+    assert entry.flag == TranspositionFlag.LOWERBOUND
+
+
+def test_depth_preferred_kept() -> None:
+    table: TranspositionTable[str] = TranspositionTable(1)
+    table.store(1, 5, 0, "deep", EXACT)
+    table.store(2, 2, 0, "shallow", EXACT)
+    table.store(3, 1, 0, "shallower", EXACT)
+    # Deep entry survives, always-replace entry holds latest shallow one
+    assert table.get(1) == TranspositionEntry(5, 0, "deep", EXACT)
+    assert table.get(2) is None
+    assert table.get(3) == TranspositionEntry(1, 0, "shallower", EXACT)
+
+
+def test_deeper_entry_displaces() -> None:
+    table: TranspositionTable[str] = TranspositionTable(1)
+    table.store(1, 2, 0, "old", EXACT)
+    table.store(2, 4, 0, "new", EXACT)
+    # Displaced entry moves to always-replace entry
+    assert table.get(2) == TranspositionEntry(4, 0, "new", EXACT)
+    assert table.get(1) == TranspositionEntry(2, 0, "old", EXACT)
+
+
+def test_same_key_updates() -> None:
+    table: TranspositionTable[str] = TranspositionTable(1)
+    table.store(1, 5, 0, "deep", EXACT)
+    table.store(2, 1, 0, "shallow", EXACT)
+    table.store(2, 6, 1, "deeper", EXACT)
+    assert table.get(2) == TranspositionEntry(6, 1, "deeper", EXACT)
+    assert len(table) == 2
+
+
+def test_old_generation_replaced() -> None:
+    table: TranspositionTable[str] = TranspositionTable(1)
+    table.store(1, 5, 0, "deep", EXACT)
+    table.new_search()
+    table.store(2, 1, 0, "shallow", EXACT)
+    assert table.get(2) == TranspositionEntry(1, 0, "shallow", EXACT)
+
+
+def test_capacity_fixed() -> None:
+    table: TranspositionTable[int] = TranspositionTable(8)
+    for key in range(1000):
+        table.store(key, key % 7, key, key, EXACT)
+    assert table.capacity == 16
+    assert len(table) == 16
+    table.clear()
+    assert len(table) == 0
+    assert table.get(999) is None
+
+
+def test_iterative_deepening_uses_given_table() -> None:
+    state = State((8, 8), generate_pieces(8, 8))
+    table: TranspositionTable[Action] = TranspositionTable(1 << 10)
+    result = CheckersMinimax.iterative_deepening(state, 1, 3, table=table)
+    assert result.action is not None
+    assert 0 < len(table) <= table.capacity
+    assert table.generation == 1
@@ -0,0 +1,60 @@
+"""Benchmark static evaluation of checkers positions.
+
+Times scoring random positions one at a time with Evaluator.evaluate
+against scoring them all at once with Evaluator.evaluate_batch, which
+uses NumPy if it is installed.
+
+Run with `python tools/benchmark_evaluation.py [positions]`.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from checkers.state import State, generate_pieces
+from checkers_computer_players.evaluation import Evaluator
+
+PLIES = 30
+
+
+def random_positions(count: int) -> list[State]:
+    """Return random positions from the first PLIES plies of games."""
+    # No need for cryptographic secure random
+    rng = random.Random("benchmark evaluation")  # noqa: S311
+    positions = []
+    state = State((8, 8), generate_pieces(8, 8))
+    while len(positions) < count:
+        if state.check_for_win() is not None or len(positions) % PLIES == 0:
+            state = State((8, 8), generate_pieces(8, 8))
+        actions = sorted(state.get_all_actions(state.get_turn()))
+        state = state.perform_action(rng.choice(actions))
+        # Computed before timing, as search has it cached too
+        state.check_for_win()
+        positions.append(state)
+    return positions
+
+
+def run() -> None:
+    """Run benchmark."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    positions = random_positions(count)
+    evaluator = Evaluator()
+    # Build tables before timing
+    evaluator.evaluate_batch(positions[:1])
+
+    start = time.perf_counter_ns()
+    for state in positions:
+        evaluator.evaluate(state)
+    single = (time.perf_counter_ns() - start) / count
+    print(f"evaluate:       {single / 1000:7.2f} us per position")
+
+    start = time.perf_counter_ns()
+    evaluator.evaluate_batch(positions)
+    batch = (time.perf_counter_ns() - start) / count
+    print(f"evaluate_batch: {batch / 1000:7.2f} us per position")
+
+
+if __name__ == "__main__":
+    run()
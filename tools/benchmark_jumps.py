@@ -0,0 +1,133 @@
+"""Benchmark multi-jump exploration on crowded king endgames.
+
+Compares the backtracking search used by MoveGenerator.get_jumps
+against the previous strategy of copying the board for every jump,
+reporting time and peak memory allocated per call.
+
+Run with `python tools/benchmark_jumps.py`.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import tracemalloc
+from typing import TYPE_CHECKING
+
+from checkers.state import DEFAULT_RULES, MoveGenerator, get_move_generator
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from checkers.state import Pos
+
+SIZE = (8, 8)
+POSITIONS = 5
+REPEATS = 200
+
+
+def copying_get_jumps(
+    generator: MoveGenerator,
+    pieces: dict[Pos, int],
+    position: Pos,
+) -> dict[Pos, list[Pos]]:
+    """Return jumps piece at position can make, copying board every jump."""
+    piece_type = pieces[position]
+    enemy = (piece_type + 1) % 2
+    enemy_pieces = (enemy, enemy + 2)
+    king_tiles = generator.geometry.king_tiles
+    bits = generator.geometry.bits
+
+    stack: list[tuple[Pos, int, dict[Pos, int], list[Pos]]] = [
+        (position, piece_type, dict(pieces), []),
+    ]
+    valid: dict[Pos, list[Pos]] = {}
+    while stack:
+        current_pos, current_type, current_pieces, current_path = stack.pop()
+        captured = 0
+        for jumped in current_path:
+            captured |= bits[jumped]
+        for side, side_side in generator.jump_steps[current_type](
+            current_pieces,
+            current_pos,
+            current_type,
+            enemy_pieces,
+            captured,
+        ):
+            new_pieces = dict(current_pieces)
+            new_pieces.pop(side)
+            new_type = current_type
+            if new_type < 2 and side_side in king_tiles[new_type]:
+                new_type += 2
+            new_path = [*current_path, side]
+            valid[side_side] = new_path
+            stack.append((side_side, new_type, new_pieces, new_path))
+    return valid
+
+
+def crowded_king_endgames(count: int) -> list[dict[Pos, int]]:
+    """Return count random king endgames with the most jump paths."""
+    generator = get_move_generator(SIZE, DEFAULT_RULES)
+    w, h = SIZE
+    tiles = [(x, y) for y in range(h) for x in range(w) if (x + y) % 2]
+    # No need for cryptographic secure random
+    rng = random.Random("benchmark jumps")  # noqa: S311
+    scored: list[tuple[int, dict[Pos, int]]] = []
+    for _ in range(2000):
+        chosen = rng.sample(tiles, 14)
+        pieces = dict.fromkeys(chosen[:3], 3)
+        pieces.update((tile, 2) for tile in chosen[3:])
+        paths = sum(
+            len(generator.get_jumps(pieces, tile)) for tile in chosen[:3]
+        )
+        scored.append((paths, pieces))
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return [pieces for _paths, pieces in scored[:count]]
+
+
+def measure(
+    function: Callable[[MoveGenerator, dict[Pos, int], Pos], object],
+    generator: MoveGenerator,
+    positions: list[dict[Pos, int]],
+) -> tuple[float, int]:
+    """Return seconds per call and peak bytes allocated by one call."""
+    calls = [
+        (pieces, tile)
+        for pieces in positions
+        for tile, piece_type in pieces.items()
+        if piece_type == 3
+    ]
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        for pieces, tile in calls:
+            function(generator, pieces, tile)
+    elapsed = (time.perf_counter() - start) / (REPEATS * len(calls))
+
+    peak = 0
+    tracemalloc.start()
+    for pieces, tile in calls:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        function(generator, pieces, tile)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def run() -> None:
+    """Run benchmark."""
+    generator = get_move_generator(SIZE, DEFAULT_RULES)
+    positions = crowded_king_endgames(POSITIONS)
+    for name, function in (
+        ("copying", copying_get_jumps),
+        ("backtracking", MoveGenerator.get_jumps),
+    ):
+        elapsed, peak = measure(function, generator, positions)
+        print(
+            f"{name:>12}: {elapsed * 1e6:8.1f} us/call, "
+            f"peak {peak / 1024:6.1f} KiB/call",
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,81 @@
+"""Benchmark Monte Carlo tree search throughput against alpha-beta.
+
+Searches random midgame positions for the same time with minimax
+iterative deepening and with Monte Carlo tree search, with evaluator
+scored rollouts and with rollouts played to the end of the game, then
+prints nodes and playouts per second.
+
+Run with `python tools/benchmark_mcts.py [seconds per position]`.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+
+from checkers.state import State, generate_pieces
+from checkers_computer_players.evaluation import Evaluator
+from checkers_computer_players.mcts_ai import MonteCarloSearch, PlayoutStats
+from checkers_computer_players.minimax_ai import CheckersMinimax, SearchStats
+
+POSITIONS = 6
+PLIES = 12
+
+
+def random_positions() -> list[State]:
+    """Return random midgame positions."""
+    # No need for cryptographic secure random
+    rng = random.Random("benchmark mcts")  # noqa: S311
+    positions = []
+    while len(positions) < POSITIONS:
+        state = State((8, 8), generate_pieces(8, 8))
+        for _ in range(PLIES + len(positions) % 2):
+            if state.check_for_win() is not None:
+                break
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            state = state.perform_action(rng.choice(actions))
+        else:
+            positions.append(state)
+    return positions
+
+
+def run() -> None:
+    """Run benchmark."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    time_limit_ns = int(seconds * 1e9)
+    positions = random_positions()
+
+    stats = SearchStats()
+    start = time.perf_counter_ns()
+    for state in positions:
+        CheckersMinimax.iterative_deepening(
+            state,
+            1,
+            40,
+            time_limit_ns,
+            stats=stats,
+        )
+    # Iterative deepening can stop before time limit, so time it
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+    nodes_per_second = stats.nodes / elapsed
+    print(f"{'alpha-beta':>18}: {nodes_per_second:9.0f} nodes/s")
+
+    for name, evaluator in (
+        ("mcts evaluator", Evaluator()),
+        ("mcts full rollout", None),
+    ):
+        playout_stats = PlayoutStats()
+        for state in positions:
+            MonteCarloSearch(evaluator=evaluator, seed=0).search(
+                state,
+                time_limit_ns,
+                playout_stats,
+            )
+        print(
+            f"{name:>18}: {playout_stats.playouts_per_second:9.0f} playouts/s",
+        )
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,103 @@
+"""Benchmark search node counts of CheckersMinimax variants.
+
+Counts nodes searched by alphabeta_transposition_table at a fixed depth
+with and without principal variation search, and by iterative deepening
+to the same depth with and without aspiration windows, over random
+midgame positions.
+
+Run with `python tools/benchmark_search.py [depth]`.
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+
+from checkers.state import State, generate_pieces
+from checkers_computer_players.minimax_ai import CheckersMinimax, SearchStats
+
+POSITIONS = 12
+PLIES = 12
+
+
+class Plain(CheckersMinimax):
+    """Full window search."""
+
+    __slots__ = ()
+
+    USE_PVS = False
+    USE_ASPIRATION = False
+
+
+class PVS(CheckersMinimax):
+    """Principal variation search."""
+
+    __slots__ = ()
+
+    USE_PVS = True
+    USE_ASPIRATION = False
+
+
+class Aspiration(CheckersMinimax):
+    """Aspiration windows."""
+
+    __slots__ = ()
+
+    USE_PVS = False
+    USE_ASPIRATION = True
+
+
+class Both(CheckersMinimax):
+    """Principal variation search and aspiration windows."""
+
+    __slots__ = ()
+
+    USE_PVS = True
+    USE_ASPIRATION = True
+
+
+def random_positions() -> list[State]:
+    """Return random midgame positions."""
+    # No need for cryptographic secure random
+    rng = random.Random("benchmark search")  # noqa: S311
+    positions = []
+    while len(positions) < POSITIONS:
+        state = State((8, 8), generate_pieces(8, 8))
+        for _ in range(PLIES + len(positions) % 2):
+            if state.check_for_win() is not None:
+                break
+            actions = sorted(state.get_all_actions(state.get_turn()))
+            state = state.perform_action(rng.choice(actions))
+        else:
+            positions.append(state)
+    return positions
+
+
+def run() -> None:
+    """Run benchmark."""
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    positions = random_positions()
+
+    print(f"Fixed depth {depth} alphabeta_transposition_table:")
+    baseline = 0
+    for minimax in (Plain, PVS):
+        stats = SearchStats()
+        for state in positions:
+            minimax.alphabeta_transposition_table(state, depth, stats=stats)
+        baseline = baseline or stats.nodes
+        saved = 1 - stats.nodes / baseline
+        print(f"{minimax.__name__:>12}: {stats.nodes:9} nodes {saved:6.1%}")
+
+    print(f"Iterative deepening to depth {depth}:")
+    baseline = 0
+    for minimax in (Plain, PVS, Aspiration, Both):
+        stats = SearchStats()
+        for state in positions:
+            minimax.iterative_deepening(state, 1, depth, stats=stats)
+        baseline = baseline or stats.nodes
+        saved = 1 - stats.nodes / baseline
+        print(f"{minimax.__name__:>12}: {stats.nodes:9} nodes {saved:6.1%}")
+
+
+if __name__ == "__main__":
+    run()